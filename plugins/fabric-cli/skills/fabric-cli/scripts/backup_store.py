@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Content-addressed, deduplicating store for workspace backups.
+
+download_workspace.py --store DIR snapshots its output directory into this
+store after each run. Every file is stored once under the SHA-256 of its
+content, compressed with zstd, and each run writes a small manifest mapping
+relative paths to hashes. The same notebook, report or TMDL file backed up
+from dev, test and prod, night after night, costs one object; storage grows
+with real change rather than with the number of runs and environments.
+
+Layout:
+    <store>/objects/ab/abcdef....zst     blob (zstd; .gz without zstandard)
+    <store>/runs/<workspace>/<UTC timestamp>.json
+                                         {workspace, workspaceId, createdAt,
+                                          files: {path: {hash, size, mtime}}}
+
+Usage:
+    python3 backup_store.py runs ./store
+    python3 backup_store.py restore ./store "Sales.Workspace" ./restored
+    python3 backup_store.py restore ./store ./store/runs/Sales.Workspace/20260101T020000Z.json ./restored
+    python3 backup_store.py gc ./store --keep-days 30 --keep-last 7
+    python3 backup_store.py gc ./store --keep-days 30 --dry-run
+
+Garbage collection deletes run manifests that are both older than --keep-days
+and outside the newest --keep-last runs of their workspace, then deletes every
+object no remaining run references. Backups hold a shared lock on
+<store>/.lock from the first object written until the run manifest is in
+place, and GC holds it exclusively, so the two never interleave (on Windows
+backups also exclude each other). As a second line of defence, objects
+younger than GC_GRACE_SECONDS are never deleted, and every object a backup
+reuses has its modification time refreshed.
+
+Requirements:
+    - zstandard (optional; pip install zstandard). Without it blobs are gzip-compressed.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+#region Configuration
+
+ZSTD_LEVEL = 10
+
+# Unreferenced objects newer than this survive GC (a concurrent backup may own them)
+GC_GRACE_SECONDS = 6 * 3600
+
+RUN_TIME_FORMAT = "%Y%m%dT%H%M%SZ"
+
+# Transient files under a backup that must not be captured
+SKIPPED_SUFFIXES = (".part", ".tmp")
+
+#endregion
+
+
+#region Objects
+
+
+@contextmanager
+def store_lock(store: Path, exclusive: bool = False):
+    """
+    Hold the store's cross-process lock for the duration of the block.
+
+    Backups take it shared and GC exclusively. Windows has no shared file
+    locks, so there every holder is exclusive.
+    """
+    store.mkdir(parents=True, exist_ok=True)
+    with open(store / ".lock", "a+b") as handle:
+        if os.name == "nt":
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def object_path(store: Path, digest: str) -> Path:
+    """Return the existing blob for digest (zstd or gzip), or where a new one would go."""
+    base = store / "objects" / digest[:2] / digest
+    for suffix in (".zst", ".gz"):
+        if base.with_suffix(suffix).exists():
+            return base.with_suffix(suffix)
+    return base.with_suffix(".zst" if ZSTD_AVAILABLE else ".gz")
+
+
+def touch_object(blob: Path) -> bool:
+    """
+    Refresh a reused blob's modification time so GC treats it as new.
+
+    Returns:
+        False if the blob no longer exists
+    """
+    try:
+        os.utime(blob)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def put_object(store: Path, source: Path, digest: str) -> int:
+    """
+    Store source under digest unless an object with that content already exists.
+
+    The blob is compressed into a temporary file and renamed into place, so
+    readers never see a partial object.
+
+    An existing object is touched instead, so GC's grace period covers it
+    until the run that reuses it is written.
+
+    Returns:
+        Compressed bytes written (0 if the object was already stored)
+    """
+    target = object_path(store, digest)
+    if target.exists() and touch_object(target):
+        return 0
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.{id(source)}.tmp")
+    with open(source, "rb") as src:
+        if ZSTD_AVAILABLE:
+            with open(tmp, "wb") as dst:
+                zstandard.ZstdCompressor(level=ZSTD_LEVEL).copy_stream(src, dst)
+        else:
+            with gzip.open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+    os.replace(tmp, target)
+    return target.stat().st_size
+
+
+def read_object(store: Path, digest: str, target: Path, mtime: int = None):
+    """Decompress the blob for digest into target, optionally restoring its mtime (ns)."""
+    blob = object_path(store, digest)
+    if not blob.exists():
+        raise FileNotFoundError(f"object {digest} is missing from {store}")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "wb") as dst:
+        if blob.suffix == ".zst":
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is required to read .zst objects (pip install zstandard)")
+            with open(blob, "rb") as src:
+                zstandard.ZstdDecompressor().copy_stream(src, dst)
+        else:
+            with gzip.open(blob, "rb") as src:
+                shutil.copyfileobj(src, dst, 1 << 20)
+    if mtime:
+        os.utime(target, ns=(mtime, mtime))
+
+
+#endregion
+
+
+#region Runs
+
+
+def list_runs(store: Path, workspace: str = None) -> list:
+    """Run manifest paths, oldest first, optionally for one workspace directory."""
+    runs_dir = store / "runs"
+    if not runs_dir.is_dir():
+        return []
+    pattern = f"{workspace}/*.json" if workspace else "*/*.json"
+    return sorted(runs_dir.glob(pattern), key=lambda p: (p.parent.name, p.name))
+
+
+def load_run(run_path: Path) -> dict:
+    return json.loads(run_path.read_text(encoding="utf-8"))
+
+
+def ingest(store: Path, source_dir: Path, workspace: str, workspace_id: str = None,
+           jobs: int = 8, log=print) -> Path:
+    """
+    Snapshot every file under source_dir into the store as a new run.
+
+    Files whose size and modification time match the workspace's previous run
+    reuse that run's hash instead of being read again; everything else is
+    hashed, and only content not already in the store is compressed and written.
+
+    Args:
+        store: Store root directory
+        source_dir: Backup directory to capture (e.g. download_workspace.py output)
+        workspace: Workspace name; runs are grouped per workspace
+        workspace_id: Workspace GUID recorded in the run manifest
+        jobs: Concurrent hash/compress workers
+        log: Line sink for progress output (default: print)
+
+    Returns:
+        Path of the new run manifest
+    """
+    start = time.time()
+    previous_runs = list_runs(store, workspace)
+    previous = load_run(previous_runs[-1])["files"] if previous_runs else {}
+
+    files = [
+        p for p in source_dir.rglob("*")
+        if p.is_file() and not p.name.endswith(SKIPPED_SUFFIXES)
+    ]
+
+    def capture(path):
+        relative_path = path.relative_to(source_dir).as_posix()
+        stat = path.stat()
+        known = previous.get(relative_path)
+        if known and known["size"] == stat.st_size and known.get("mtime") == stat.st_mtime_ns:
+            digest = known["hash"]
+            if touch_object(object_path(store, digest)):
+                return relative_path, {"hash": digest, "size": stat.st_size, "mtime": stat.st_mtime_ns}, 0
+        digest = hash_file(path)
+        written = put_object(store, path, digest)
+        return relative_path, {"hash": digest, "size": stat.st_size, "mtime": stat.st_mtime_ns}, written
+
+    entries = {}
+    new_objects = 0
+    written_bytes = 0
+    # Objects are unreferenced until the manifest lands; keep GC out until then
+    with store_lock(store):
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for relative_path, entry, written in pool.map(capture, files):
+                entries[relative_path] = entry
+                if written:
+                    new_objects += 1
+                    written_bytes += written
+
+        # Run names sort chronologically; never reuse or precede the latest one
+        created = datetime.now(timezone.utc).replace(microsecond=0)
+        if previous_runs:
+            latest = datetime.strptime(previous_runs[-1].stem, RUN_TIME_FORMAT).replace(tzinfo=timezone.utc)
+            created = max(created, latest + timedelta(seconds=1))
+        run = {
+            "workspace": workspace,
+            "workspaceId": workspace_id,
+            "createdAt": created.isoformat(),
+            "files": dict(sorted(entries.items())),
+        }
+        run_path = store / "runs" / workspace / f"{created.strftime(RUN_TIME_FORMAT)}.json"
+        run_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = run_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(run, indent=1), encoding="utf-8")
+        os.replace(tmp, run_path)
+
+    total = sum(e["size"] for e in entries.values())
+    log(f"Stored run {run_path.relative_to(store)}: {len(entries)} files ({total / 1048576:.1f} MiB), "
+        f"{new_objects} new objects ({written_bytes / 1048576:.1f} MiB compressed), "
+        f"{len(entries) - new_objects} deduplicated, {time.time() - start:.1f}s")
+    return run_path
+
+
+def restore(store: Path, run_path: Path, target_dir: Path, jobs: int = 8) -> int:
+    """
+    Recreate a run's files under target_dir.
+
+    Returns:
+        Number of files restored
+    """
+    run = load_run(run_path)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(read_object, store, entry["hash"], target_dir / relative_path, entry.get("mtime"))
+            for relative_path, entry in run["files"].items()
+        ]
+        for future in futures:
+            future.result()
+    return len(futures)
+
+
+def collect_garbage(store: Path, keep_days: int, keep_last: int = 1, dry_run: bool = False) -> dict:
+    """
+    Expire old runs and delete objects no remaining run references.
+
+    Args:
+        store: Store root directory
+        keep_days: Runs newer than this many days are kept
+        keep_last: The newest N runs of each workspace are always kept
+        dry_run: Report what would be deleted without deleting
+
+    Returns:
+        Dict with expired runs, deleted objects and freed bytes
+    """
+    # Exclusive: no backup may hold unreferenced objects while liveness is decided
+    with store_lock(store, exclusive=True):
+        cutoff = datetime.now(timezone.utc) - timedelta(days=keep_days)
+        by_workspace = {}
+        for run_path in list_runs(store):
+            by_workspace.setdefault(run_path.parent.name, []).append(run_path)
+
+        expired = []
+        for runs in by_workspace.values():
+            for run_path in runs[:max(0, len(runs) - keep_last)]:
+                created = datetime.strptime(run_path.stem, RUN_TIME_FORMAT).replace(tzinfo=timezone.utc)
+                if created < cutoff:
+                    expired.append(run_path)
+
+        live = set()
+        expired_set = set(expired)
+        for run_path in list_runs(store):
+            if run_path not in expired_set:
+                live.update(entry["hash"] for entry in load_run(run_path)["files"].values())
+
+        deleted = 0
+        freed = 0
+        grace = time.time() - GC_GRACE_SECONDS
+        for blob in (store / "objects").glob("*/*"):
+            digest = blob.name.split(".", 1)[0]
+            stat = blob.stat()
+            if digest in live or stat.st_mtime > grace:
+                continue
+            deleted += 1
+            freed += stat.st_size
+            if not dry_run:
+                blob.unlink()
+
+        if not dry_run:
+            for run_path in expired:
+                run_path.unlink()
+
+    return {"expired": expired, "deleted": deleted, "freed": freed}
+
+
+#endregion
+
+
+#region Main
+
+
+def resolve_run(store: Path, run: str) -> Path:
+    """Accept a run manifest path or a workspace name (its newest run)."""
+    if run.endswith(".json") and Path(run).is_file():
+        return Path(run)
+    runs = list_runs(store, run) or list_runs(store, f"{run}.Workspace")
+    if not runs:
+        raise FileNotFoundError(f"no runs for {run} in {store}")
+    return runs[-1]
+
+
+def display_path(store: Path, path: Path) -> Path:
+    """Path relative to the store when it lies inside it, else as given."""
+    try:
+        return path.resolve().relative_to(store.resolve())
+    except ValueError:
+        return path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Content-addressed backup store for download_workspace.py",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python3 backup_store.py runs ./store
+    python3 backup_store.py restore ./store "Sales.Workspace" ./restored
+    python3 backup_store.py gc ./store --keep-days 30 --keep-last 7
+        """
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    runs_parser = sub.add_parser("runs", help="List runs and store size")
+    runs_parser.add_argument("store", type=Path)
+
+    restore_parser = sub.add_parser("restore", help="Restore a run to a directory")
+    restore_parser.add_argument("store", type=Path)
+    restore_parser.add_argument("run", help="Run manifest path, or workspace name for its newest run")
+    restore_parser.add_argument("target", type=Path)
+    restore_parser.add_argument("-j", "--jobs", type=int, default=8)
+
+    gc_parser = sub.add_parser("gc", help="Expire old runs and delete unreferenced objects")
+    gc_parser.add_argument("store", type=Path)
+    gc_parser.add_argument("--keep-days", type=int, required=True, help="Keep runs newer than this")
+    gc_parser.add_argument("--keep-last", type=int, default=1,
+                           help="Always keep the newest N runs per workspace (default: 1)")
+    gc_parser.add_argument("--dry-run", action="store_true", help="Report without deleting")
+
+    args = parser.parse_args()
+
+    if args.command == "runs":
+        for run_path in list_runs(args.store):
+            run = load_run(run_path)
+            size = sum(e["size"] for e in run["files"].values())
+            print(f"{run_path.relative_to(args.store)}  {len(run['files'])} files  {size / 1048576:.1f} MiB")
+        blobs = list((args.store / "objects").glob("*/*"))
+        stored = sum(b.stat().st_size for b in blobs)
+        print(f"Objects: {len(blobs)} ({stored / 1048576:.1f} MiB on disk)")
+
+    elif args.command == "restore":
+        try:
+            run_path = resolve_run(args.store, args.run)
+            count = restore(args.store, run_path, args.target, jobs=max(1, args.jobs))
+        except (OSError, RuntimeError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Restored {count} files from {display_path(args.store, run_path)} to {args.target}")
+
+    elif args.command == "gc":
+        result = collect_garbage(args.store, args.keep_days, max(1, args.keep_last), args.dry_run)
+        verb = "Would delete" if args.dry_run else "Deleted"
+        for run_path in result["expired"]:
+            print(f"{verb} run {run_path.relative_to(args.store)}")
+        print(f"{verb} {len(result['expired'])} runs and {result['deleted']} objects "
+              f"({result['freed'] / 1048576:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#endregion
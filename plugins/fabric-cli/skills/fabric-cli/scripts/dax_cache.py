@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Local result cache for DAX queries, keyed by model refresh state.
+
+execute_dax.py --cache looks each query up here before calling
+executeQueries. Entries are keyed on the SHA-256 of:
+
+    dataset ID
+    normalised query text (comments dropped, whitespace collapsed outside
+        string literals, quoted names and [column] references)
+    serializer settings
+    model state (end time of the last completed refresh, plus a hash of the
+        model definition from getDefinition)
+
+A refresh or a redeployed definition changes the model state, and entries
+under an older state are deleted the first time the new state is seen. The
+model state itself is memoised for STATE_TTL seconds, so a hit inside that
+window makes no API call at all, and results can be served up to STATE_TTL
+seconds after a refresh or redeploy completes. Models with no
+completed refresh (DirectQuery, push datasets) have no usable state and are
+never cached. When the state cannot be looked up the cache is bypassed and
+left as it is.
+
+Entries are zlib-compressed JSON in one SQLite file. When the file's entries
+exceed the size budget the least recently used are evicted first.
+
+Usage:
+    python3 dax_cache.py --status
+    python3 dax_cache.py --clear
+    python3 dax_cache.py --clear --dataset 00000000-0000-0000-0000-000000000000
+
+Environment:
+    DAX_CACHE_PATH       SQLite file (default: ~/.cache/fabric-cli-scripts/dax_cache.sqlite)
+    DAX_CACHE_MAX_MB     Size budget in MiB (default: 256)
+    DAX_CACHE=1          Enable --cache by default in execute_dax.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+
+
+#region Configuration
+
+DEFAULT_CACHE_PATH = Path(
+    os.environ.get("DAX_CACHE_PATH")
+    or Path.home() / ".cache" / "fabric-cli-scripts" / "dax_cache.sqlite"
+)
+DEFAULT_MAX_BYTES = int(float(os.environ.get("DAX_CACHE_MAX_MB", "256")) * 1048576)
+
+# Seconds a looked-up model state is trusted before the refresh history and
+# definition are re-read
+STATE_TTL = 60
+
+# Results larger than this share of the budget are not cached
+MAX_ENTRY_FRACTION = 0.25
+
+# Tokens of a DAX query, in the order they must be tried
+DAX_TOKEN = re.compile(
+    r'"(?:[^"]|"")*"'             # string literal
+    r"|'(?:[^']|'')*'"            # quoted table name
+    r"|\[(?:[^\]]|\]\])*\]"       # [column] / [measure]
+    r"|//[^\n]*|--[^\n]*|/\*.*?\*/"  # comments
+    r"|\s+"
+    r"|[^\s\"'\[/-]+|.",
+    re.DOTALL,
+)
+
+#endregion
+
+
+#region Keys
+
+
+def normalise_query(query: str) -> str:
+    """
+    Canonical form of a DAX query for cache keys.
+
+    Comments are dropped and runs of whitespace collapse to one space, except
+    inside string literals, quoted table names and bracketed references.
+    """
+    parts = []
+    for match in DAX_TOKEN.finditer(query):
+        token = match.group()
+        if token.isspace() or token.startswith(("//", "--", "/*")):
+            if parts and parts[-1] != " ":
+                parts.append(" ")
+        else:
+            parts.append(token)
+    return "".join(parts).strip()
+
+
+def cache_key(dataset_id: str, query: str, settings: dict, state: str) -> str:
+    """SHA-256 hex digest identifying one query result under one model state."""
+    material = json.dumps(
+        [dataset_id.lower(), normalise_query(query), settings, state],
+        sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+#endregion
+
+
+#region Store
+
+
+class ResultCache:
+    """
+    SQLite-backed result store, safe to share between worker threads.
+
+    Args:
+        path: SQLite file (created with its parent directory if missing)
+        max_bytes: Size budget for stored results; LRU entries are evicted past it
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                dataset_id TEXT NOT NULL,
+                state TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                body BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_by_dataset ON entries (dataset_id);
+            CREATE INDEX IF NOT EXISTS entries_by_last_used ON entries (last_used);
+            CREATE TABLE IF NOT EXISTS models (
+                dataset_id TEXT PRIMARY KEY,
+                state TEXT,
+                checked_at REAL NOT NULL
+            );
+        """)
+
+    def close(self):
+        self._conn.close()
+
+    def model_state(self, dataset_id: str, lookup) -> str | None:
+        """
+        Current state of a model, from the memo if fresh, else from lookup().
+
+        A changed state deletes every entry stored under the previous one.
+
+        Args:
+            dataset_id: Semantic model GUID
+            lookup: Callable returning the state string, or None if the model
+                cannot be cached; raises LookupError if the service could not
+                be asked
+
+        Returns:
+            State string, or None when results for this model must not be
+            cached or its state is unknown right now (nothing is memoised or
+            deleted then)
+        """
+        dataset_id = dataset_id.lower()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, checked_at FROM models WHERE dataset_id = ?", (dataset_id,)
+            ).fetchone()
+        if row and time.time() - row[1] < STATE_TTL:
+            return row[0]
+
+        try:
+            state = lookup()
+        except LookupError:
+            return None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO models (dataset_id, state, checked_at) VALUES (?, ?, ?)",
+                (dataset_id, state, time.time()),
+            )
+            self._conn.execute(
+                "DELETE FROM entries WHERE dataset_id = ? AND state IS NOT ?", (dataset_id, state)
+            )
+        return state
+
+    def get(self, key: str) -> dict | None:
+        """Return a cached response and mark it used, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE entries SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key)
+            )
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, dataset_id: str, state: str, results: dict) -> bool:
+        """
+        Store a response, then evict least recently used entries over the budget.
+
+        Returns:
+            False if the response is too large to cache
+        """
+        body = zlib.compress(json.dumps(results, separators=(",", ":")).encode("utf-8"), 6)
+        if len(body) > self.max_bytes * MAX_ENTRY_FRACTION:
+            return False
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, dataset_id, state, size, created_at, last_used, hits, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0, ?)",
+                (key, dataset_id.lower(), state, len(body), now, now, body),
+            )
+            self._evict()
+        return True
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def clear(self, dataset_id: str | None = None) -> int:
+        """Delete all entries, or those of one dataset; returns the number deleted."""
+        with self._lock:
+            if dataset_id:
+                cursor = self._conn.execute("DELETE FROM entries WHERE dataset_id = ?", (dataset_id.lower(),))
+                self._conn.execute("DELETE FROM models WHERE dataset_id = ?", (dataset_id.lower(),))
+            else:
+                cursor = self._conn.execute("DELETE FROM entries")
+                self._conn.execute("DELETE FROM models")
+        return cursor.rowcount
+
+    def stats(self) -> list[dict]:
+        """Per-dataset entry count, stored bytes and hits."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dataset_id, COUNT(*), SUM(size), SUM(hits), MAX(last_used) "
+                "FROM entries GROUP BY dataset_id ORDER BY SUM(size) DESC"
+            ).fetchall()
+        return [
+            {"datasetId": dataset_id, "entries": entries, "bytes": size, "hits": hits, "lastUsed": last_used}
+            for dataset_id, entries, size, hits, last_used in rows
+        ]
+
+
+#endregion
+
+
+#region Main
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the local DAX result cache")
+    parser.add_argument("--status", action="store_true", help="Show entries, size and hits per dataset")
+    parser.add_argument("--clear", action="store_true", help="Delete cached results")
+    parser.add_argument("--dataset", help="With --clear: only this dataset ID")
+    parser.add_argument("--cache-path", type=Path, default=DEFAULT_CACHE_PATH,
+                        help=f"SQLite cache file (default: {DEFAULT_CACHE_PATH})")
+    args = parser.parse_args()
+
+    cache = ResultCache(args.cache_path)
+    if args.clear:
+        print(f"Deleted {cache.clear(args.dataset)} cached result(s) from {cache.path}")
+        return 0
+
+    stats = cache.stats()
+    total = sum(s["bytes"] for s in stats)
+    print(f"{cache.path}: {sum(s['entries'] for s in stats)} result(s), "
+          f"{total / 1048576:.1f} of {cache.max_bytes / 1048576:.0f} MiB")
+    for s in stats:
+        last_used = time.strftime("%Y-%m-%d %H:%M", time.localtime(s["lastUsed"]))
+        print(f"  {s['datasetId']}  {s['entries']:>5} entries  {s['bytes'] / 1048576:8.1f} MiB  "
+              f"{s['hits']:>6} hits  last used {last_used}")
+    return 0
+
+
+#endregion
+
+
+if __name__ == "__main__":
+    sys.exit(main())
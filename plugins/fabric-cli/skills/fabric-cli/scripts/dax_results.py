@@ -0,0 +1,335 @@
+"""
+Streaming readers and writers for DAX query results.
+
+executeQueries returns every row of a query in one JSON document:
+
+    {"results": [{"tables": [{"rows": [{"'Sales'[Amount]": 1.5, ...}, ...]}]}]}
+
+Parsing that with json.loads and formatting it in memory costs several times
+the response size for large extracts. RowStream instead scans the response
+bytes as they arrive and yields one row dict at a time, keeping only the
+current chunk and the small envelope around the rows in memory. The writers
+below consume that iterator and write straight to disk:
+
+    csv      header from the first row, one line per row
+    ndjson   one JSON object per line
+    parquet  typed columns (pyarrow), written in row groups
+    arrow    typed columns as an Arrow IPC file (pyarrow)
+
+Column types for parquet and arrow are inferred from every row: rows are
+spooled to a temporary NDJSON file next to the target while the types are
+tracked, then read back in batches and written with the final schema. Memory
+stays bounded by ROW_BATCH regardless of result size.
+
+Usage:
+    from dax_results import RowStream, write_rows
+
+    stream = RowStream(response.iter_content(65536))
+    count = write_rows(stream, "parquet", Path("sales.parquet"))
+    if stream.document is not None:
+        ...  # envelope with rows removed; inspect for errors
+"""
+
+import codecs
+import csv
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+#region Configuration
+
+# Bytes read from the response per chunk
+READ_CHUNK_BYTES = 1 << 16
+
+# Rows per Parquet row group / Arrow record batch
+ROW_BATCH = 65536
+
+STREAM_FORMATS = ("csv", "ndjson", "parquet", "arrow")
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+ROWS_KEY = re.compile(r'"rows"\s*:\s*\[')
+
+# DAX serializes DateTime columns as ISO 8601 strings without an offset
+ISO_DATETIME = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?")
+
+#endregion
+
+
+#region Streaming Parser
+
+
+class RowStream:
+    """
+    Iterate the rows of an executeQueries response without parsing it whole.
+
+    Accepts the raw response body, or `fab api` output wrapping it, as an
+    iterable of byte chunks. Rows of every table are yielded in document
+    order. Everything outside the rows arrays is kept and, once the stream is
+    exhausted, parsed into `document` with each rows array emptied, so error
+    bodies and result-level errors can still be inspected.
+
+    Attributes:
+        rows: Rows yielded so far
+        tables: Rows arrays seen so far
+        document: Parsed envelope after exhaustion, or None if it is not JSON
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.rows = 0
+        self.tables = 0
+        self.document = None
+
+    def _read(self) -> str | None:
+        """Return the next decoded chunk, or None at end of input."""
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                return text
+        return None
+
+    def __iter__(self) -> Iterator[dict]:
+        buf = ""
+        pos = 0
+        outside = []
+        in_rows = False
+        eof = False
+
+        while True:
+            if in_rows:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buf) and buf[pos] == "]":
+                    outside.append("]")
+                    pos += 1
+                    in_rows = False
+                    self.tables += 1
+                    continue
+                if pos < len(buf):
+                    try:
+                        row, end = self._json.raw_decode(buf, pos)
+                    except json.JSONDecodeError:
+                        # A row split across chunks; anything else is malformed
+                        if eof:
+                            raise
+                    else:
+                        pos = end
+                        self.rows += 1
+                        yield row
+                        continue
+            else:
+                match = ROWS_KEY.search(buf, pos)
+                if match:
+                    outside.append(buf[pos:match.end()])
+                    pos = match.end()
+                    in_rows = True
+                    continue
+                # Keep a tail in case the key straddles the next chunk
+                keep = len(buf) if eof else max(pos, len(buf) - 64)
+                outside.append(buf[pos:keep])
+                pos = keep
+
+            if eof:
+                break
+            text = self._read()
+            if text is None:
+                eof = True
+                text = self._decoder.decode(b"", final=True)
+            buf = buf[pos:] + text
+            pos = 0
+
+        if in_rows:
+            raise ValueError("Response ended inside a rows array")
+        try:
+            self.document = json.loads("".join(outside))
+        except ValueError:
+            self.document = None
+
+
+#endregion
+
+
+#region Writers
+
+
+def write_csv(rows: Iterable[dict], out) -> int:
+    """
+    Write rows as CSV with a header taken from the first row.
+
+    Rows must carry every column (request includeNulls), since columns missing
+    from the first row cannot be added later. Missing values are written empty.
+
+    Returns:
+        Number of rows written
+    """
+    writer = None
+    count = 0
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(out, fieldnames=list(row.keys()), restval="", extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_ndjson(rows: Iterable[dict], out) -> int:
+    """Write rows as newline-delimited JSON; returns the number of rows written."""
+    count = 0
+    for row in rows:
+        out.write(json.dumps(row, ensure_ascii=False))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def value_kind(value) -> str | None:
+    """Classify a JSON value for type inference; None for nulls."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str) and ISO_DATETIME.fullmatch(value):
+        return "datetime"
+    return "string"
+
+
+def arrow_type(kinds: set):
+    """
+    Choose the narrowest Arrow type that holds every kind seen in a column.
+
+    Integers mixed with floats widen to float64; any other mix, and columns
+    that were null throughout, become strings.
+    """
+    if kinds == {"bool"}:
+        return pa.bool_()
+    if kinds == {"int"}:
+        return pa.int64()
+    if kinds and kinds <= {"int", "float"}:
+        return pa.float64()
+    if kinds == {"datetime"}:
+        return pa.timestamp("ms")
+    return pa.string()
+
+
+def column_array(values: list, kinds: set, arrow_dtype):
+    """Build one Arrow column, converting values to the inferred type."""
+    if pa.types.is_timestamp(arrow_dtype):
+        return pa.array(values, type=pa.string()).cast(arrow_dtype)
+    if pa.types.is_string(arrow_dtype) and kinds - {"string", "datetime"}:
+        values = [v if v is None or isinstance(v, str) else json.dumps(v) for v in values]
+    return pa.array(values, type=arrow_dtype)
+
+
+def write_columnar(rows: Iterable[dict], path: Path, fmt: str = "parquet") -> int:
+    """
+    Write rows as Parquet or an Arrow IPC file with inferred column types.
+
+    Rows are spooled to a temporary NDJSON file beside path while column
+    types are collected, then converted in ROW_BATCH batches, so memory use
+    does not grow with the number of rows.
+
+    Args:
+        rows: Row dicts, e.g. a RowStream
+        path: Target file
+        fmt: "parquet" or "arrow"
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        RuntimeError if pyarrow is not installed
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError(f"{fmt} output requires pyarrow (pip install pyarrow)")
+
+    columns = {}
+    count = 0
+    fd, spool = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".ndjson", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for row in rows:
+                for name, value in row.items():
+                    kind = value_kind(value)
+                    kinds = columns.setdefault(name, set())
+                    if kind:
+                        kinds.add(kind)
+                f.write(json.dumps(row, ensure_ascii=False))
+                f.write("\n")
+                count += 1
+
+        names = list(columns)
+        schema = pa.schema([(name, arrow_type(columns[name])) for name in names])
+
+        def batches():
+            batch = []
+            with open(spool, encoding="utf-8") as f:
+                for line in f:
+                    batch.append(json.loads(line))
+                    if len(batch) == ROW_BATCH:
+                        yield batch
+                        batch = []
+            if batch:
+                yield batch
+
+        def record_batch(batch):
+            return pa.record_batch(
+                [column_array([row.get(name) for row in batch], columns[name], schema.field(name).type)
+                 for name in names],
+                schema=schema,
+            )
+
+        if fmt == "parquet":
+            with pq.ParquetWriter(path, schema) as writer:
+                for batch in batches():
+                    writer.write_batch(record_batch(batch))
+        else:
+            with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+                for batch in batches():
+                    writer.write_batch(record_batch(batch))
+    finally:
+        os.unlink(spool)
+
+    return count
+
+
+def write_rows(rows: Iterable[dict], fmt: str, path: Path | None = None, out=None) -> int:
+    """
+    Write rows in one of STREAM_FORMATS.
+
+    Text formats go to path, or to the open text stream out when no path is
+    given. Columnar formats need a path.
+
+    Returns:
+        Number of rows written
+    """
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    if fmt in COLUMNAR_FORMATS:
+        if path is None:
+            raise ValueError(f"{fmt} output needs an output file")
+        return write_columnar(rows, path, fmt)
+    if path is None:
+        return write_csv(rows, out) if fmt == "csv" else write_ndjson(rows, out)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        return write_csv(rows, f) if fmt == "csv" else write_ndjson(rows, f)
+
+
+#endregion
@@ -41,7 +41,8 @@ Exit codes: 0 deployed; 1 operational error (auth, path, HTTP, LRO failure/timeo
 
 Requirements
 ------------
-    - Azure CLI logged in (`az login`); the token is read from the az cache, never persisted
+    - Azure CLI logged in (`az login`); tokens come from the shared token broker
+      (token_broker.py), which caches them owner-only on disk until shortly before expiry
     - fab CLI installed and authenticated (`fab auth login`); used only to resolve the
       workspace id and check item existence
     Both identities must point at the same tenant/account.
@@ -49,16 +50,22 @@ Requirements
 
 import argparse
 import base64
+import gzip
+import http.client
 import json
 import os
 import subprocess
 import sys
 import time
-import urllib.error
+import urllib.parse
 import urllib.request
 
+from token_broker import FABRIC_RESOURCE, TokenError, get_access_token
+
 FABRIC_API = "https://api.fabric.microsoft.com/v1"
-FABRIC_RESOURCE = "https://api.fabric.microsoft.com"
+
+# One kept-alive HTTPS connection per host (this script is single-threaded)
+_CONNECTIONS: dict[str, http.client.HTTPSConnection] = {}
 
 
 #region Shell + auth helpers
@@ -76,62 +83,81 @@ def run_fab(args: list[str], check: bool = True) -> subprocess.CompletedProcess:
         sys.exit(1)
 
 
-def fabric_token() -> str:
-    """Get a Fabric-audience bearer token from the current az login. Never logged."""
+def current_token(force: bool = False) -> str:
+    """Return a Fabric token from the shared token broker; force=True fetches a new one (after a 401)."""
     try:
-        res = subprocess.run(
-            ["az", "account", "get-access-token", "--resource", FABRIC_RESOURCE],
-            capture_output=True, text=True, check=True,
-        )
-    except subprocess.CalledProcessError:
-        print("az could not get a token. Run 'az login' first.", file=sys.stderr)
+        return get_access_token(FABRIC_RESOURCE, force_refresh=force)
+    except TokenError as e:
+        print(str(e), file=sys.stderr)
         sys.exit(1)
-    except FileNotFoundError:
-        print("Azure CLI (az) not found. Install it and run 'az login'.", file=sys.stderr)
-        sys.exit(1)
-    return json.loads(res.stdout)["accessToken"]
-
 
-_TOKEN = {"value": None, "at": 0.0}
 
+def _send(method: str, url: str, data: bytes | None, headers: dict, timeout: float = 60) -> tuple[int, dict, bytes]:
+    """Send over a kept-alive HTTPS connection per host, so LRO polls skip the TCP + TLS handshake.
 
-def current_token(force: bool = False) -> str:
-    """Return a cached Fabric token, re-fetching after 40 min (well before ~60 min expiry)."""
-    now = time.monotonic()
-    if force or _TOKEN["value"] is None or now - _TOKEN["at"] > 2400:
-        _TOKEN["value"] = fabric_token()
-        _TOKEN["at"] = now
-    return _TOKEN["value"]
+    A pooled connection the server has since closed is reopened once; other network
+    errors drop the connection and propagate to api(), which retries with backoff.
+    """
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    for reused in (True, False):
+        conn = _CONNECTIONS.get(parts.netloc)
+        fresh = conn is None
+        if fresh:
+            proxy = urllib.request.getproxies().get("https")
+            if proxy and not urllib.request.proxy_bypass(parts.hostname):
+                p = urllib.parse.urlsplit(proxy)
+                conn = http.client.HTTPSConnection(p.hostname, p.port or 8080, timeout=timeout)
+                conn.set_tunnel(parts.netloc)
+            else:
+                conn = http.client.HTTPSConnection(parts.netloc, timeout=timeout)
+            _CONNECTIONS[parts.netloc] = conn
+        try:
+            conn.request(method, path, body=data, headers=headers)
+            resp = conn.getresponse()
+            raw = resp.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            _CONNECTIONS.pop(parts.netloc).close()
+            if fresh or not reused:
+                raise
+            continue
+        except (OSError, http.client.HTTPException):
+            _CONNECTIONS.pop(parts.netloc).close()
+            raise
+        if resp.getheader("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        return resp.status, {k: v for k, v in resp.getheaders()}, raw
 
 
 def api(method: str, url: str, body: dict | None = None, retries: int = 4) -> tuple[int, dict, dict]:
     """Call a Fabric REST URL; return (status, headers, json). Refresh token on 401, back off on 429/5xx."""
     data = json.dumps(body).encode() if body is not None else None
     for attempt in range(retries + 1):
-        req = urllib.request.Request(
-            url, data=data, method=method,
-            headers={"Authorization": f"Bearer {current_token()}", "Content-Type": "application/json"},
-        )
+        headers = {
+            "Authorization": f"Bearer {current_token()}",
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip",
+        }
         try:
-            resp = urllib.request.urlopen(req, timeout=60)
-            raw = resp.read().decode()
-            return resp.status, {k: v for k, v in resp.getheaders()}, (json.loads(raw) if raw.strip() else {})
-        except urllib.error.HTTPError as e:
-            if e.code == 401 and attempt < retries:
-                current_token(force=True)
-                continue
-            if e.code in (429, 500, 502, 503, 504) and attempt < retries:
-                ra = e.headers.get("Retry-After") if e.headers else None
-                time.sleep(min(int(ra) if ra and ra.isdigit() else 2 ** attempt, 30))
-                continue
-            print(f"HTTP {e.code} on {method} {url}: {e.read().decode()[:400]}", file=sys.stderr)
-            sys.exit(1)
-        except (urllib.error.URLError, TimeoutError) as e:
+            status, resp_headers, raw = _send(method, url, data, headers)
+        except (OSError, http.client.HTTPException) as e:
             if attempt < retries:
                 time.sleep(2 ** attempt)
                 continue
             print(f"Request to {url} failed: {e}", file=sys.stderr)
             sys.exit(1)
+        if status < 400:
+            text = raw.decode()
+            return status, resp_headers, (json.loads(text) if text.strip() else {})
+        if status == 401 and attempt < retries:
+            current_token(force=True)
+            continue
+        if status in (429, 500, 502, 503, 504) and attempt < retries:
+            ra = resp_headers.get("Retry-After")
+            time.sleep(min(int(ra) if ra and ra.isdigit() else 2 ** attempt, 30))
+            continue
+        print(f"HTTP {status} on {method} {url}: {raw.decode(errors='replace')[:400]}", file=sys.stderr)
+        sys.exit(1)
 
 
 #endregion
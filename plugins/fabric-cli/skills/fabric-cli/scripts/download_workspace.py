@@ -8,31 +8,180 @@ Usage:
     python3 download_workspace.py "Workspace.Workspace" [output_dir]
     python3 download_workspace.py "Sales.Workspace" ./backup
     python3 download_workspace.py "Production.Workspace" --no-lakehouse-files
+    python3 download_workspace.py "Sales.Workspace" ./backup --jobs 16
+
+Discovery uses the Fabric REST API (fabric_discovery.py): workspace items and
+lakehouse tables come from paginated JSON listings, and item definitions from
+getDefinition calls whose LROs are polled concurrently, one per worker. Without
+requests installed, or if the API is unreachable, it falls back to parsing
+`fab ls` output and `fab export`; items whose definition cannot be fetched over
+REST are exported with `fab export` as well.
+
+Items, lakehouse file downloads and table schemas are exported on a bounded
+worker pool (--jobs, default: CPU count capped at 8). Lakehouse tasks list and
+download on pools of their own, but every request in the run, from any pool,
+holds one of --jobs shared slots, so --jobs caps the requests in flight. Each
+task buffers its own output; progress is printed per task in discovery order,
+so logs read the same as a serial run regardless of completion order.
+
+Lakehouse files are listed one directory per request and streamed to disk in
+8 MiB chunks; files of 64 MiB or more are fetched as up to 4 parallel ranged
+reads. Listings, downloads and ranged reads all count against --jobs. An interrupted download is kept as a hidden .part file
+and resumed on the next run if the remote ETag is unchanged. Every file is
+size-checked before it replaces the local copy (--verify-md5 adds Content-MD5).
+
+Table data snapshots (--table-data):
+    Each table's _delta_log is replayed (from the newest checkpoint when pyarrow
+    is installed) to find the data files active at the chosen version; removed
+    files are skipped. Only those files are downloaded, in parallel, into
+    Tables/<table>/ with a new single-commit log, giving a self-contained Delta
+    table that DuckDB's delta_scan can read.
+
+    python3 download_workspace.py "Sales.Workspace" ./backup --table-data
+    python3 download_workspace.py "Sales.Workspace" ./backup --table-data --table-version orders=42
+
+Incremental backups (--incremental):
+    A manifest (backup_manifest.json in the output directory) records each
+    item's ID and a content hash of its export, each lakehouse file's ETag and
+    size, and each table's latest Delta commit. Later runs skip lakehouse files
+    with a matching ETag and size, and re-export a table schema only when the
+    table has a new Delta commit. The items API reports no last-modified date,
+    so every item definition is still fetched; the content hash tells which
+    ones changed. Items removed from the workspace are tombstoned in the
+    manifest (files kept) or, with --prune, deleted.
+
+    python3 download_workspace.py "Sales.Workspace" ./backup --incremental
+    python3 download_workspace.py "Sales.Workspace" ./backup --incremental --prune
+
+Deduplicating store (--store DIR):
+    After the download, the output directory is snapshotted into a
+    content-addressed store shared by every workspace (see backup_store.py):
+    files are stored once per distinct content, zstd-compressed, and each run
+    adds a manifest of hashes. Expire old runs with `backup_store.py gc`.
+
+    python3 download_workspace.py "Sales.Workspace" ./backup --incremental --store ./store
 
 Requirements:
     - fab CLI installed and authenticated
     - azure-storage-file-datalake (for lakehouse files)
     - azure-identity
+    - requests (optional; REST discovery, otherwise fab CLI parsing)
+    - pyarrow >= 13 (optional; to read Delta checkpoints for --table-data)
+    - zstandard (optional; --store compresses with gzip without it)
 """
 
 import subprocess
 import json
+import os
 import sys
 import argparse
+import threading
+import time
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from urllib.parse import unquote
+import glob
+import hashlib
+import io
+import re
+import shutil
 
 try:
+    from azure.core import MatchConditions
     from azure.storage.filedatalake import DataLakeServiceClient
     from azure.identity import DefaultAzureCredential
     AZURE_AVAILABLE = True
 except ImportError:
     AZURE_AVAILABLE = False
 
+from backup_store import ingest as ingest_into_store
+
+# REST discovery needs requests (via http_session); without it, fall back to fab CLI parsing
+try:
+    from fabric_discovery import (
+        DiscoveryError, get_definition, list_items, list_tables, resolve_workspace_id, write_definition
+    )
+    from token_broker import TokenError
+    REST_AVAILABLE = True
+except ImportError:
+    REST_AVAILABLE = False
+
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Concurrent fab exports / downloads; each export is an I/O-bound subprocess
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)
+
+ONELAKE_URL = "https://onelake.dfs.fabric.microsoft.com"
+
+# OneLake downloads stream in CHUNK_BYTES pieces; files of LARGE_FILE_BYTES or
+# more are split into RANGE_CONCURRENCY parallel ranged reads
+CHUNK_BYTES = 8 * 1024 * 1024
+LARGE_FILE_BYTES = 64 * 1024 * 1024
+RANGE_CONCURRENCY = 4
+
+# _delta_log entries: JSON commits and (single or multi-part) parquet checkpoints
+DELTA_COMMIT = re.compile(r"\d{20}\.json")
+DELTA_CHECKPOINT = re.compile(r"(?P<version>\d{20})\.checkpoint(?:\.(?P<part>\d{10})\.(?P<parts>\d{10}))?\.parquet")
+Z85_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ.-:+=^!/*?&<>()[]{}@%$#"
+
+MANIFEST_NAME = "backup_manifest.json"
+MANIFEST_VERSION = 1
+
 
 #region Helper Functions
 
 
+class TransferSlots:
+    """
+    Cap on concurrent requests shared by every pool of a run.
+
+    Pools nest (a lakehouse task lists and downloads on its own pool while item
+    exports run beside it), so pool sizes alone do not bound the total. Each
+    unit of work that talks to Fabric or OneLake holds a slot while it runs;
+    tasks that only wait on other tasks must not, or they could deadlock.
+
+    Args:
+        limit: Maximum slots held at once (--jobs)
+    """
+
+    def __init__(self, limit: int):
+        self._semaphore = threading.BoundedSemaphore(max(1, limit))
+
+    @contextmanager
+    def hold(self, wanted: int = 1):
+        """
+        Hold one slot, plus up to wanted - 1 more if they are free right now.
+
+        Only the first slot is waited for, so a large transfer fans out when
+        the run is quiet and degrades to a single stream when it is busy.
+        Yields the number of slots held.
+        """
+        self._semaphore.acquire()
+        held = 1
+        while held < wanted and self._semaphore.acquire(blocking=False):
+            held += 1
+        try:
+            yield held
+        finally:
+            for _ in range(held):
+                self._semaphore.release()
+
+    def wrap(self, fn):
+        """Return fn running under one slot."""
+        def run(*args, **kwargs):
+            with self.hold():
+                return fn(*args, **kwargs)
+        return run
+
+
 def run_fab_command(args: list) -> str:
     """
     Execute fab CLI command and return output.
@@ -108,7 +257,7 @@ def get_workspace_items(workspace_path: str) -> list:
     return items
 
 
-def export_item(workspace_path: str, item_name: str, item_type: str, output_path: Path) -> bool:
+def export_item(workspace_path: str, item_name: str, item_type: str, output_path: Path, log=print) -> bool:
     """
     Export item using fab export.
 
@@ -117,6 +266,7 @@ def export_item(workspace_path: str, item_name: str, item_type: str, output_path
         item_name: Item display name
         item_type: Item type
         output_path: Output directory
+        log: Line sink for progress output (default: print)
 
     Returns:
         True if successful
@@ -133,76 +283,428 @@ def export_item(workspace_path: str, item_name: str, item_type: str, output_path
         )
         return True
     except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-        print(f"  Failed to export {item_name}: {e}")
+        log(f"  Failed to export {item_name}: {e}")
         return False
 
 
-#endregion
+def discover_workspace(workspace_path: str) -> tuple:
+    """
+    Resolve the workspace ID and list its items.
 
+    Uses the Fabric REST API (fabric_discovery.py): a few paginated JSON calls
+    that return exact names. Falls back to
+    `fab get` / `fab ls -l` parsing when requests is not installed or the API
+    cannot be reached.
 
-#region Lakehouse Operations
+    Args:
+        workspace_path: Full workspace path (e.g., "Sales.Workspace")
+
+    Returns:
+        (workspace_id, items, via) where items carry displayName, type and id,
+        and via is "rest" or "fab"
+    """
+    if REST_AVAILABLE:
+        try:
+            workspace_id = resolve_workspace_id(workspace_path.removesuffix(".Workspace"))
+            return workspace_id, list_items(workspace_id), "rest"
+        except (DiscoveryError, TokenError) as e:
+            print(f"REST discovery unavailable ({e}); falling back to fab CLI")
 
+    workspace_id = run_fab_command(["get", workspace_path, "-q", "id"])
+    return workspace_id, get_workspace_items(workspace_path), "fab"
 
-def download_lakehouse_files(workspace_id: str, lakehouse_id: str, lakehouse_name: str, output_dir: Path):
+
+def export_item_rest(workspace_path: str, workspace_id: str, item: dict, output_path: Path, log=print) -> bool:
     """
-    Download all files from lakehouse using OneLake Storage API.
+    Export an item's definition through getDefinition, falling back to fab export.
+
+    Parts are written to a temporary folder that replaces the previous export
+    only once complete, so files dropped from the definition do not linger.
 
     Args:
-        workspace_id: Workspace GUID
-        lakehouse_id: Lakehouse GUID
-        lakehouse_name: Lakehouse display name
-        output_dir: Output directory for files
+        workspace_path: Workspace path
+        workspace_id: Workspace GUID, or None to go straight to fab export
+        item: Item dict (displayName, type, id)
+        output_path: Output directory
+        log: Line sink for progress output (default: print)
+
+    Returns:
+        True if successful
     """
-    if not AZURE_AVAILABLE:
-        print(f"  Skipping lakehouse files (azure-storage-file-datalake not installed)")
-        return
+    if REST_AVAILABLE and workspace_id:
+        export_dir = output_path / f"{item['displayName']}.{item['type']}"
+        staging = output_path / f".{export_dir.name}.tmp"
+        try:
+            parts = get_definition(workspace_id, item)
+            if parts:
+                shutil.rmtree(staging, ignore_errors=True)
+                write_definition(parts, staging)
+                shutil.rmtree(export_dir, ignore_errors=True)
+                os.replace(staging, export_dir)
+                return True
+        except (DiscoveryError, TokenError, OSError, ValueError) as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            log(f"  getDefinition failed for {item['displayName']} ({e}); using fab export")
+    return export_item(workspace_path, item["displayName"], item["type"], output_path, log=log)
+
+
+def discover_tables(workspace_path: str, workspace_id: str, lakehouse_id: str, lakehouse_name: str) -> list:
+    """
+    List lakehouse tables through the REST API, falling back to `fab ls`.
+
+    The tables API rejects lakehouses with schemas enabled; those (and any
+    other REST failure) use list_lakehouse_tables(). Pass workspace_id=None
+    to skip the REST call.
+    """
+    if REST_AVAILABLE and workspace_id:
+        try:
+            return list_tables(workspace_id, lakehouse_id)
+        except (DiscoveryError, TokenError):
+            pass
+    return list_lakehouse_tables(workspace_path, lakehouse_name)
 
-    print(f"\n  Downloading lakehouse files from {lakehouse_name}...")
 
+#endregion
+
+
+#region Manifest
+
+
+def load_manifest(output_dir: Path) -> dict:
+    """
+    Load the backup manifest from output_dir, or return an empty one.
+
+    Layout:
+        items:          item ID -> displayName, type, path, hash,
+                        exportedAt, deletedAt (tombstone)
+        lakehouseFiles: lakehouse ID -> relative path -> {etag, size}
+        tables:         lakehouse ID -> table -> latest Delta commit file
+        snapshots:      lakehouse ID -> table -> {version, files, bytes} of the
+                        last table data snapshot (--table-data)
+    """
     try:
-        account_url = "https://onelake.dfs.fabric.microsoft.com"
-        credential = DefaultAzureCredential()
-        service_client = DataLakeServiceClient(account_url=account_url, credential=credential)
+        manifest = json.loads((output_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+        if manifest.get("version") == MANIFEST_VERSION:
+            manifest.setdefault("snapshots", {})
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "items": {}, "lakehouseFiles": {}, "tables": {}, "snapshots": {}}
+
+
+def save_manifest(output_dir: Path, manifest: dict):
+    """Write the manifest atomically so an interrupted run never leaves it half-written."""
+    manifest["updatedAt"] = datetime.now(timezone.utc).isoformat()
+    tmp = output_dir / f".{MANIFEST_NAME}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, output_dir / MANIFEST_NAME)
+
+
+def hash_path(path: Path) -> str:
+    """SHA-256 over every file under path (relative names and contents, in sorted order)."""
+    digest = hashlib.sha256()
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+    for file in files:
+        if not file.exists():
+            continue
+        digest.update(str(file.relative_to(path) if path.is_dir() else file.name).encode())
+        with open(file, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def export_item_tracked(workspace_path: str, workspace_id: str, item: dict, type_dir: Path, entry: dict,
+                        log=print):
+    """
+    Export an item and describe the result for the manifest.
+
+    Returns the new manifest entry (with a content hash of the export and
+    "changed" saying whether it differs from the previous export), or False
+    if the export failed.
+    """
+    if not export_item_rest(workspace_path, workspace_id, item, type_dir, log=log):
+        return False
+    export_dir = type_dir / f"{item['displayName']}.{item['type']}"
+    content_hash = hash_path(export_dir)
+    changed = content_hash != entry.get("hash")
+    if not changed:
+        log(f"  Content unchanged: {item['displayName']}")
+    return {
+        "displayName": item["displayName"],
+        "type": item["type"],
+        "path": str(export_dir.relative_to(type_dir.parent)),
+        "hash": content_hash,
+        "exportedAt": datetime.now(timezone.utc).isoformat(),
+        "changed": changed,
+    }
+
+
+#endregion
+
+
+#region Lakehouse Operations
 
-        fs_client = service_client.get_file_system_client(file_system=workspace_id)
-        base_path = f"{lakehouse_id}/Files"
 
+def onelake_file_system(workspace_id: str):
+    """Return a OneLake file system client for the workspace (requires azure packages)."""
+    credential = DefaultAzureCredential()
+    service_client = DataLakeServiceClient(
+        account_url=ONELAKE_URL,
+        credential=credential,
+        # Bound memory per transfer: first request and each ranged chunk
+        max_single_get_size=CHUNK_BYTES,
+        max_chunk_get_size=CHUNK_BYTES,
+    )
+    return service_client.get_file_system_client(file_system=workspace_id)
+
+
+def get_table_versions(workspace_id: str, lakehouse_id: str, tables: list, slots: TransferSlots = None) -> dict:
+    """
+    Map each table to its latest Delta commit file (e.g. 00000000000000000012.json).
+
+    One listing of Tables/<table>/_delta_log per table: an HTTP call, much
+    cheaper than a `fab table schema` subprocess. Tables whose log cannot be
+    read are omitted, so they are always re-exported.
+    """
+    if not AZURE_AVAILABLE:
+        return {}
+    versions = {}
+    slots = slots or TransferSlots(1)
+    fs_client = onelake_file_system(workspace_id)
+    for table in tables:
         try:
-            paths = fs_client.get_paths(path=base_path, recursive=True)
+            with slots.hold():
+                commits = [
+                    p.name.rsplit("/", 1)[-1]
+                    for p in fs_client.get_paths(path=f"{lakehouse_id}/Tables/{table}/_delta_log", recursive=False)
+                    if p.name.endswith(".json")
+                ]
+        except Exception:
+            continue
+        if commits:
+            versions[table] = max(commits)
+    return versions
+
+
+def list_lakehouse_paths(fs_client, base_path: str, workers: int = DEFAULT_JOBS,
+                         slots: TransferSlots = None) -> tuple:
+    """
+    List every file and directory under base_path by sharding the tree.
 
-            file_count = 0
-            dir_count = 0
+    Instead of one sequential recursive get_paths() iterator, each directory is
+    listed non-recursively on a worker pool and its subdirectories are queued
+    as soon as they are seen, so wide trees are listed `workers` directories
+    at a time (fewer if slots shared with other work are taken).
 
-            for path in paths:
-                relative_path = path.name[len(base_path)+1:] if len(path.name) > len(base_path) else path.name
+    Returns:
+        (files, directories): PathProperties for files, names of directories
+    """
+    slots = slots or TransferSlots(workers)
+
+    def list_directory(directory):
+        with slots.hold():
+            return list(fs_client.get_paths(path=directory, recursive=False))
+
+    files = []
+    directories = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(list_directory, base_path)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for path in future.result():
+                    if path.is_directory:
+                        directories.append(path.name)
+                        pending.add(pool.submit(list_directory, path.name))
+                    else:
+                        files.append(path)
+    return files, directories
+
+
+def download_file_resumable(fs_client, path, local_file: Path, verify_md5: bool = False,
+                            slots: TransferSlots = None) -> int:
+    """
+    Stream one OneLake file to disk in chunks, resuming a previous partial download.
 
-                if path.is_directory:
-                    local_dir = output_dir / relative_path
-                    local_dir.mkdir(parents=True, exist_ok=True)
-                    dir_count += 1
-                else:
-                    local_file = output_dir / relative_path
-                    local_file.parent.mkdir(parents=True, exist_ok=True)
+    Data goes to a hidden .part file named after the remote ETag, so a partial
+    download is only resumed against the same file version; the ranged request
+    is also conditioned on that ETag. Files of LARGE_FILE_BYTES or more are
+    fetched as up to RANGE_CONCURRENCY parallel ranged reads, one per slot
+    free in slots at the time. Memory stays bounded
+    by the chunk size regardless of file size. The .part file replaces the
+    target only after its size (and MD5, when requested and published) matches.
 
-                    file_client = fs_client.get_file_client(path.name)
+    Returns:
+        Bytes transferred in this call (0 if the file was already complete)
 
-                    with open(local_file, 'wb') as f:
-                        download = file_client.download_file()
-                        f.write(download.readall())
+    Raises:
+        ValueError: the downloaded file failed verification (the .part is removed)
+    """
+    size = path.content_length or 0
+    tag = hashlib.sha1((path.etag or "").encode()).hexdigest()[:12]
+    part = local_file.with_name(f".{local_file.name}.{tag}.part")
+    local_file.parent.mkdir(parents=True, exist_ok=True)
+
+    # Partials from an older version of the file can never be resumed
+    for stale in local_file.parent.glob(f".{glob.escape(local_file.name)}.*.part"):
+        if stale != part:
+            stale.unlink(missing_ok=True)
+
+    offset = part.stat().st_size if part.exists() else 0
+    if offset > size:
+        part.unlink()
+        offset = 0
+
+    slots = slots or TransferSlots(RANGE_CONCURRENCY)
+    file_client = fs_client.get_file_client(path.name)
+    if offset < size:
+        remaining = size - offset
+        wanted = RANGE_CONCURRENCY if remaining >= LARGE_FILE_BYTES else 1
+        with slots.hold(wanted) as concurrency, open(part, "r+b" if offset else "wb") as f:
+            f.seek(offset)
+            downloader = file_client.download_file(
+                offset=offset,
+                length=remaining,
+                max_concurrency=concurrency,
+                etag=path.etag,
+                match_condition=MatchConditions.IfNotModified,
+            )
+            downloader.readinto(f)
+    elif not part.exists():
+        part.touch()
+
+    actual = part.stat().st_size
+    if actual != size:
+        part.unlink()
+        raise ValueError(f"size mismatch ({actual} != {size} bytes)")
+    if verify_md5:
+        with slots.hold():
+            expected = file_client.get_file_properties().content_settings.content_md5
+        if expected:
+            digest = hashlib.md5()
+            with open(part, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+                    digest.update(chunk)
+            if digest.digest() != bytes(expected):
+                part.unlink()
+                raise ValueError("MD5 mismatch")
+
+    os.replace(part, local_file)
+    return size - offset
+
+
+def download_lakehouse_files(workspace_id: str, lakehouse_id: str, lakehouse_name: str, output_dir: Path,
+                             previous: dict = None, prune: bool = False, workers: int = DEFAULT_JOBS,
+                             verify_md5: bool = False, slots: TransferSlots = None, log=print):
+    """
+    Download all files from lakehouse using OneLake Storage API.
 
-                    file_count += 1
-                    print(f"    {relative_path}")
+    Listing is sharded by directory and files are downloaded `workers` at a
+    time with download_file_resumable(): streamed in chunks, large files as
+    parallel ranges, interrupted downloads resumed on the next run. Every
+    listing and transfer holds a slot, so passing the run's shared slots
+    keeps the whole run within its request budget.
 
-            print(f"  Downloaded {file_count} files, {dir_count} directories")
+    Args:
+        workspace_id: Workspace GUID
+        lakehouse_id: Lakehouse GUID
+        lakehouse_name: Lakehouse display name
+        output_dir: Output directory for files
+        previous: Manifest state from the last run (relative path -> {etag, size});
+            files with the same ETag and size that are still on disk are skipped
+        prune: Delete local files that no longer exist in the lakehouse
+        workers: Concurrent directory listings and file downloads
+        verify_md5: Also check each file against its published Content-MD5
+        slots: Request slots shared with the rest of the run (default: `workers` of its own)
+        log: Line sink for progress output (default: print)
 
+    Returns:
+        Dict with "files" (manifest state: relative path -> {etag, size}) and
+        "failed" (relative paths that could not be downloaded), or False if
+        the lakehouse could not be listed
+    """
+    if not AZURE_AVAILABLE:
+        log(f"  Skipping lakehouse files (azure-storage-file-datalake not installed)")
+        return {"files": previous or {}, "failed": []}
+
+    log(f"\n  Downloading lakehouse files from {lakehouse_name}...")
+
+    previous = previous or {}
+    slots = slots or TransferSlots(workers)
+    state = {}
+    failed = []
+
+    try:
+        fs_client = onelake_file_system(workspace_id)
+        base_path = f"{lakehouse_id}/Files"
+
+        try:
+            paths, directories = list_lakehouse_paths(fs_client, base_path, workers, slots)
         except Exception as e:
             if "404" in str(e) or "PathNotFound" in str(e):
-                print(f"  No files found in lakehouse")
-            else:
-                raise
+                log(f"  No files found in lakehouse")
+                return {"files": {}, "failed": []}
+            raise
+
+        def relative(name):
+            return name[len(base_path)+1:] if len(name) > len(base_path) else name
+
+        for directory in directories:
+            (output_dir / relative(directory)).mkdir(parents=True, exist_ok=True)
+
+        to_download = []
+        skipped = 0
+        for path in paths:
+            relative_path = relative(path.name)
+            local_file = output_dir / relative_path
+            current = {"etag": path.etag, "size": path.content_length}
+
+            if (previous.get(relative_path) == current and local_file.is_file()
+                    and local_file.stat().st_size == current["size"]):
+                state[relative_path] = current
+                skipped += 1
+                continue
+            to_download.append((path, relative_path, local_file, current))
+
+        file_count = 0
+        transferred = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(download_file_resumable, fs_client, path, local_file, verify_md5, slots):
+                    (relative_path, current)
+                for path, relative_path, local_file, current in to_download
+            }
+            for future in as_completed(futures):
+                relative_path, current = futures[future]
+                try:
+                    transferred += future.result()
+                except Exception as e:
+                    log(f"    Failed: {relative_path}: {e}")
+                    failed.append(relative_path)
+                    # The old local copy (if any) is untouched; keep its entry
+                    if relative_path in previous:
+                        state[relative_path] = previous[relative_path]
+                    continue
+                state[relative_path] = current
+                file_count += 1
+                log(f"    {relative_path}")
+
+        removed = previous.keys() - {relative(p.name) for p in paths}
+        if prune:
+            for relative_path in removed:
+                (output_dir / relative_path).unlink(missing_ok=True)
+
+        log(f"  Downloaded {file_count} files ({transferred / 1048576:.1f} MiB), skipped {skipped} unchanged, "
+            f"{len(directories)} directories"
+            + (f", {'pruned' if prune else 'kept'} {len(removed)} removed" if removed else "")
+            + (f", {len(failed)} failed (rerun to resume)" if failed else ""))
 
     except Exception as e:
-        print(f"  Error downloading lakehouse files: {e}")
+        log(f"  Error downloading lakehouse files: {e}")
+        return False
+
+    return {"files": state, "failed": failed}
 
 
 def list_lakehouse_tables(workspace_path: str, lakehouse_name: str) -> list:
@@ -228,7 +730,8 @@ def list_lakehouse_tables(workspace_path: str, lakehouse_name: str) -> list:
         return []
 
 
-def export_table_schema(workspace_path: str, lakehouse_name: str, table_name: str, output_file: Path) -> bool:
+def export_table_schema(workspace_path: str, lakehouse_name: str, table_name: str, output_file: Path,
+                        log=print) -> bool:
     """
     Export table schema.
 
@@ -237,6 +740,7 @@ def export_table_schema(workspace_path: str, lakehouse_name: str, table_name: st
         lakehouse_name: Lakehouse name
         table_name: Table name
         output_file: Output JSON file
+        log: Line sink for progress output (default: print)
 
     Returns:
         True if successful
@@ -250,7 +754,247 @@ def export_table_schema(workspace_path: str, lakehouse_name: str, table_name: st
 
         return True
     except subprocess.CalledProcessError as e:
-        print(f"    Failed to export schema for {table_name}: {e}")
+        log(f"    Failed to export schema for {table_name}: {e}")
+        return False
+
+
+#endregion
+
+
+#region Delta Snapshots
+
+
+def z85_decode(text: str) -> bytes:
+    """Decode Z85 (ZeroMQ base85), the encoding of deletion vector UUIDs."""
+    value_of = {c: i for i, c in enumerate(Z85_ALPHABET)}
+    out = bytearray()
+    for i in range(0, len(text), 5):
+        value = 0
+        for c in text[i:i+5]:
+            value = value * 85 + value_of[c]
+        out += value.to_bytes(4, "big")
+    return bytes(out)
+
+
+def deletion_vector_path(dv: dict):
+    """
+    Relative path of a deletion vector file, or None for inline vectors.
+
+    Raises:
+        ValueError: for absolute-path vectors, which live outside the table
+    """
+    if dv["storageType"] == "i":
+        return None
+    if dv["storageType"] != "u":
+        raise ValueError(f"deletion vector storage type {dv['storageType']!r} is not supported")
+    encoded = dv["pathOrInlineDv"]
+    prefix, uuid = encoded[:-20], z85_decode(encoded[-20:]).hex()
+    name = f"deletion_vector_{uuid[:8]}-{uuid[8:12]}-{uuid[12:16]}-{uuid[16:20]}-{uuid[20:]}.bin"
+    return f"{prefix}/{name}" if prefix else name
+
+
+def checkpoint_rows(data: bytes) -> list:
+    """Read the actions of one checkpoint part as JSON-shaped dicts (requires pyarrow >= 13)."""
+    def plain(value):
+        if isinstance(value, dict):
+            return {k: plain(v) for k, v in value.items() if v is not None}
+        if isinstance(value, list):
+            return [plain(v) for v in value]
+        return value
+
+    table = pq.read_table(io.BytesIO(data))
+    wanted = [c for c in ("protocol", "metaData", "add", "domainMetadata") if c in table.column_names]
+    rows = []
+    for row in table.select(wanted).to_pylist(maps_as_pydicts="strict"):
+        for action, value in row.items():
+            if value is not None:
+                value.pop("stats_parsed", None)
+                value.pop("partitionValues_parsed", None)
+                rows.append({action: plain(value)})
+    return rows
+
+
+def read_delta_snapshot(fs_client, table_root: str, version: int = None, workers: int = DEFAULT_JOBS,
+                        slots: TransferSlots = None) -> dict:
+    """
+    Reconstruct the active state of a Delta table at a version from its _delta_log.
+
+    Starts from the newest complete checkpoint at or before the version (when
+    pyarrow is installed) or from commit 0, then replays the JSON commits up to
+    the version. Files removed along the way (tombstones) are dropped.
+
+    Args:
+        fs_client: OneLake file system client for the workspace
+        table_root: Table path in the file system (<lakehouse id>/Tables/<table>)
+        version: Table version to read (default: latest)
+        workers: Concurrent commit file reads
+        slots: Request slots shared with the rest of the run (default: `workers` of its own)
+
+    Returns:
+        Dict with version, protocol, metaData, domainMetadata (list) and
+        add (relative path -> add action)
+
+    Raises:
+        ValueError: if the version cannot be reconstructed from the log
+    """
+    slots = slots or TransferSlots(workers)
+    log_dir = f"{table_root}/_delta_log"
+    commits = {}
+    checkpoints = defaultdict(list)
+    with slots.hold():
+        log_paths = list(fs_client.get_paths(path=log_dir, recursive=False))
+    for path in log_paths:
+        name = path.name.rsplit("/", 1)[-1]
+        if DELTA_COMMIT.fullmatch(name):
+            commits[int(name[:20])] = path.name
+        elif match := DELTA_CHECKPOINT.fullmatch(name):
+            checkpoints[int(match["version"])].append((path.name, int(match["parts"] or 1)))
+
+    if not commits:
+        raise ValueError("no Delta commits found")
+    latest = max(commits)
+    if version is None:
+        version = latest
+    elif version > latest:
+        raise ValueError(f"version {version} does not exist (latest is {latest})")
+
+    def read(path):
+        with slots.hold():
+            return fs_client.get_file_client(path).download_file().readall()
+
+    start = 0
+    actions = []
+    complete = [v for v, parts in checkpoints.items() if v <= version and len(parts) == parts[0][1]]
+    if complete and PYARROW_AVAILABLE:
+        start = max(complete) + 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for data in pool.map(read, [name for name, _ in sorted(checkpoints[start - 1])]):
+                actions.extend(checkpoint_rows(data))
+    missing = [v for v in range(start, version + 1) if v not in commits]
+    if missing:
+        needs = " (install pyarrow to read checkpoints)" if complete and not PYARROW_AVAILABLE else ""
+        raise ValueError(f"version {version} cannot be rebuilt: commit {missing[0]} is no longer in the log{needs}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for data in pool.map(read, [commits[v] for v in range(start, version + 1)]):
+            actions.extend(json.loads(line) for line in data.decode("utf-8").splitlines() if line.strip())
+
+    state = {"version": version, "protocol": None, "metaData": None, "domainMetadata": {}, "add": {}}
+    for action in actions:
+        if "add" in action:
+            state["add"][unquote(action["add"]["path"])] = action["add"]
+        elif "remove" in action:
+            state["add"].pop(unquote(action["remove"]["path"]), None)
+        elif "protocol" in action or "metaData" in action:
+            key = "protocol" if "protocol" in action else "metaData"
+            state[key] = action[key]
+        elif "domainMetadata" in action:
+            domain = action["domainMetadata"]
+            if domain.get("removed"):
+                state["domainMetadata"].pop(domain["domain"], None)
+            else:
+                state["domainMetadata"][domain["domain"]] = domain
+    if not state["protocol"] or not state["metaData"]:
+        raise ValueError(f"no protocol or metadata found at version {version}")
+    state["domainMetadata"] = list(state["domainMetadata"].values())
+    return state
+
+
+def export_table_snapshot(workspace_id: str, lakehouse_id: str, table_name: str, output_dir: Path,
+                          version: int = None, workers: int = DEFAULT_JOBS, slots: TransferSlots = None,
+                          log=print):
+    """
+    Export a consistent copy of a Delta table's data at one version.
+
+    Only the data files (and deletion vector files) active at that version are
+    downloaded, in parallel; files already on disk with the right size are
+    kept, since Delta data files are immutable. The table's log is replaced by
+    a single commit 0 holding the protocol, metadata and add actions, so the
+    snapshot is a self-contained Delta table that DuckDB (delta_scan) or Spark
+    can read directly. The new log is written only after every file arrived.
+
+    Args:
+        workspace_id: Workspace GUID
+        lakehouse_id: Lakehouse GUID
+        table_name: Table name (folder under Tables)
+        output_dir: Snapshot directory for this table
+        version: Table version to export (default: latest)
+        workers: Concurrent file downloads
+        slots: Request slots shared with the rest of the run (default: `workers` of its own)
+        log: Line sink for progress output (default: print)
+
+    Returns:
+        Dict with version, files and bytes, or False on failure
+    """
+    if not AZURE_AVAILABLE:
+        log(f"    Skipping data for {table_name} (azure-storage-file-datalake not installed)")
+        return False
+
+    table_root = f"{lakehouse_id}/Tables/{table_name}"
+    slots = slots or TransferSlots(workers)
+    try:
+        fs_client = onelake_file_system(workspace_id)
+        state = read_delta_snapshot(fs_client, table_root, version, workers, slots)
+
+        needed = set()
+        for relative_path, add in state["add"].items():
+            if "://" in relative_path:
+                raise ValueError(f"data file outside the table is not supported: {relative_path}")
+            needed.add(relative_path)
+            if add.get("deletionVector"):
+                dv_path = deletion_vector_path(add["deletionVector"])
+                if dv_path:
+                    needed.add(dv_path)
+
+        paths, _ = list_lakehouse_paths(fs_client, table_root, workers, slots)
+        by_name = {p.name[len(table_root)+1:]: p for p in paths}
+        missing = needed - by_name.keys()
+        if missing:
+            raise ValueError(f"{len(missing)} files referenced by version {state['version']} are missing, "
+                             f"e.g. {sorted(missing)[0]}")
+
+        to_download = []
+        for relative_path in sorted(needed):
+            local_file = output_dir / relative_path
+            if local_file.is_file() and local_file.stat().st_size == by_name[relative_path].content_length:
+                continue
+            to_download.append((by_name[relative_path], local_file))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(download_file_resumable, fs_client, p, f, slots=slots) for p, f in to_download]:
+                future.result()
+
+        # Swap in the new log; the old one may reference files about to be removed
+        log_dir = output_dir / "_delta_log"
+        log_dir.mkdir(parents=True, exist_ok=True)
+        for old in log_dir.iterdir():
+            if old.is_file():
+                old.unlink()
+        commit_info = {
+            "timestamp": int(time.time() * 1000),
+            "operation": "SNAPSHOT EXPORT",
+            "operationParameters": {"sourceVersion": state["version"], "sourceTable": table_root},
+        }
+        lines = [{"commitInfo": commit_info}, {"protocol": state["protocol"]}, {"metaData": state["metaData"]}]
+        lines += [{"domainMetadata": d} for d in state["domainMetadata"]]
+        lines += [{"add": {**add, "dataChange": True}} for add in state["add"].values()]
+        tmp = log_dir / ".commit.tmp"
+        tmp.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+        os.replace(tmp, log_dir / f"{0:020d}.json")
+
+        # Files from an earlier snapshot that are not part of this version
+        for local_file in output_dir.rglob("*"):
+            relative_path = local_file.relative_to(output_dir).as_posix()
+            if local_file.is_file() and relative_path not in needed and not relative_path.startswith("_delta_log/"):
+                local_file.unlink()
+
+        size = sum(by_name[p].content_length for p in needed)
+        log(f"    {table_name}: version {state['version']}, {len(needed)} files ({size / 1048576:.1f} MiB), "
+            f"{len(to_download)} downloaded")
+        return {"version": state["version"], "files": len(needed), "bytes": size}
+
+    except Exception as e:
+        log(f"    Failed to export data for {table_name}: {e}")
         return False
 
 
@@ -260,35 +1004,104 @@ def export_table_schema(workspace_path: str, lakehouse_name: str, table_name: st
 #region Main Download
 
 
-def download_workspace(workspace_path: str, output_dir: Path, download_lakehouse_files_flag: bool = True):
+def submit_logged(pool: ThreadPoolExecutor, label: str, fn, *args, **kwargs) -> dict:
+    """
+    Submit fn to the pool with a private log buffer.
+
+    fn must accept a `log` keyword; its lines are held back so that concurrent
+    tasks never interleave output. Returns a task dict for drain_in_order().
+    """
+    lines = []
+
+    def run():
+        start = time.time()
+        try:
+            return fn(*args, log=lines.append, **kwargs)
+        finally:
+            task["seconds"] = time.time() - start
+
+    task = {"label": label, "lines": lines, "seconds": 0.0}
+    task["future"] = pool.submit(run)
+    return task
+
+
+def drain_in_order(tasks: list, indent: str = "  ", is_failure=None) -> list:
+    """
+    Wait for tasks in submission order, printing each one's buffered output.
+
+    Work keeps running in parallel; only the printing is ordered, so the log of
+    a parallel run reads like a serial one. Returns the task results in order;
+    a task that raised, returned False, or matches is_failure counts as failed.
+    """
+    results = []
+    width = len(str(len(tasks)))
+    for n, task in enumerate(tasks, 1):
+        try:
+            result = task["future"].result()
+        except Exception as e:
+            task["lines"].append(f"{indent}  Error: {e}")
+            result = False
+        for line in task["lines"]:
+            print(line)
+        status = "Failed" if result is False or (is_failure and is_failure(result)) else "Done"
+        print(f"{indent}[{n:>{width}}/{len(tasks)}] {status}: {task['label']} ({task['seconds']:.1f}s)")
+        results.append(result)
+    return results
+
+
+def download_workspace(workspace_path: str, output_dir: Path, download_lakehouse_files_flag: bool = True,
+                       jobs: int = DEFAULT_JOBS, incremental: bool = False, prune: bool = False,
+                       verify_md5: bool = False, table_data: bool = False, table_versions: dict = None,
+                       store: Path = None):
     """
     Download complete workspace contents.
 
+    Item exports, lakehouse file downloads and table schema exports are tasks
+    on a pool of `jobs` workers, and each lakehouse task lists and downloads on
+    a pool of its own. Every request, ranged reads included, holds one of
+    `jobs` TransferSlots shared by all of these pools, so no more than `jobs`
+    are in flight at once. Counts in the summary are tallied from task results
+    on the main thread, so they are exact under concurrency.
+
     Args:
         workspace_path: Workspace path (e.g., "Sales.Workspace")
         output_dir: Output directory
         download_lakehouse_files_flag: Whether to download lakehouse files
+        jobs: Maximum concurrent requests (exports, listings and downloads)
+        incremental: Use the manifest in output_dir to skip unchanged lakehouse
+            files and table schemas (items are always exported and compared
+            by content hash)
+        prune: With incremental, delete exports and files removed from the
+            workspace instead of tombstoning them in the manifest
+        verify_md5: Check downloaded lakehouse files against their Content-MD5
+        table_data: Also export a Delta snapshot of each table's data
+        table_versions: Table name -> version to snapshot (default: latest)
+        store: Content-addressed store (backup_store.py) to snapshot output_dir
+            into after the download
     """
     print(f"Downloading workspace: {workspace_path}")
     print(f"Output directory: {output_dir}")
+    print(f"Parallel jobs: {jobs}")
     print()
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Get workspace ID
-    print("Getting workspace ID...")
-    workspace_id = run_fab_command(["get", workspace_path, "-q", "id"])
+    print("Discovering workspace items...")
+    discovery_start = time.time()
+    workspace_id, items, via = discover_workspace(workspace_path)
     print(f"Workspace ID: {workspace_id}")
+    print(f"Discovered via {'REST API' if via == 'rest' else 'fab CLI'} in {time.time() - discovery_start:.1f}s")
     print()
 
-    # Get all items
-    print("Discovering workspace items...")
-    items = get_workspace_items(workspace_path)
-
     if not items:
         print("No items found")
         return
 
+    # The manifest is always written, so the first full run seeds incremental ones
+    manifest = load_manifest(output_dir)
+    # Definitions and table listings follow discovery: REST if it worked, else fab
+    rest_workspace_id = workspace_id if via == "rest" else None
+
     # Group by type
     items_by_type = defaultdict(list)
     for item in items:
@@ -299,83 +1112,191 @@ def download_workspace(workspace_path: str, output_dir: Path, download_lakehouse
         print(f"   {item_type}: {len(type_items)}")
     print()
 
-    # Track statistics
-    total_success = 0
-    total_failed = 0
+    start = time.time()
+    slots = TransferSlots(jobs)
     lakehouses = []
-
-    # Download items by type
-    for item_type, type_items in sorted(items_by_type.items()):
-        print(f"Downloading {item_type} items ({len(type_items)})...")
-
-        type_dir = output_dir / item_type
-        type_dir.mkdir(parents=True, exist_ok=True)
-
-        for item in type_items:
-            item_name = item["displayName"]
-            item_id = item["id"]
-
-            print(f"  {item_name}...")
-
-            if item_type == "Lakehouse" and download_lakehouse_files_flag:
-                lakehouses.append({
-                    "name": item_name,
-                    "id": item_id,
-                    "output_dir": type_dir / f"{item_name}.Lakehouse"
-                })
-
-            success = export_item(workspace_path, item_name, item_type, type_dir)
-
-            if success:
-                total_success += 1
-                print(f"  Done: {item_name}")
-            else:
-                total_failed += 1
-
-        print()
-
-    # Download lakehouse files
-    if lakehouses and download_lakehouse_files_flag:
-        print(f"Downloading lakehouse files ({len(lakehouses)} lakehouses)...")
-
+    export_tasks = []
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # Queue every item export first so they start before lakehouse work
+        for item_type, type_items in sorted(items_by_type.items()):
+            type_dir = output_dir / item_type
+            type_dir.mkdir(parents=True, exist_ok=True)
+
+            for item in type_items:
+                item_name = item["displayName"]
+                entry = manifest["items"].get(item["id"], {})
+
+                if item_type == "Lakehouse" and download_lakehouse_files_flag:
+                    lakehouses.append({
+                        "name": item_name,
+                        "id": item["id"],
+                        "output_dir": type_dir / f"{item_name}.Lakehouse"
+                    })
+
+                # The items API has no last-modified date, so every item is
+                # exported; its content hash says whether it changed
+                export_tasks.append(submit_logged(
+                    pool, f"{item_name}.{item_type}",
+                    slots.wrap(export_item_tracked), workspace_path, rest_workspace_id, item, type_dir, entry
+                ))
+                export_tasks[-1]["item"] = item
+
+        # Lakehouse files and table listings run alongside the exports
+        file_tasks = []
+        table_lists = []
         for lh in lakehouses:
             lh_files_dir = lh["output_dir"] / "Files"
             lh_files_dir.mkdir(parents=True, exist_ok=True)
+            file_tasks.append(submit_logged(
+                pool, f"{lh['name']}.Lakehouse/Files",
+                download_lakehouse_files, workspace_id, lh["id"], lh["name"], lh_files_dir,
+                previous=manifest["lakehouseFiles"].get(lh["id"]) if incremental else None,
+                prune=incremental and prune,
+                workers=jobs,
+                verify_md5=verify_md5,
+                slots=slots
+            ))
+            table_lists.append(pool.submit(slots.wrap(discover_tables), workspace_path, rest_workspace_id, lh["id"], lh["name"]))
+
+        print(f"Exporting {len(export_tasks)} items...")
+        results = drain_in_order(export_tasks)
+        changed = 0
+        for task, result in zip(export_tasks, results):
+            if result is False:
+                failed.append(task["label"])
+                continue
+            item = task["item"]
+            previous_path = manifest["items"].get(item["id"], {}).get("path")
+            if previous_path and previous_path != result["path"]:
+                # Renamed: drop the export under the old name
+                shutil.rmtree(output_dir / previous_path, ignore_errors=True)
+            changed += result.pop("changed")
+            manifest["items"][item["id"]] = result
+        total_success = len(export_tasks) - len(failed)
+        print()
 
-            download_lakehouse_files(
-                workspace_id=workspace_id,
-                lakehouse_id=lh["id"],
-                lakehouse_name=lh["name"],
-                output_dir=lh_files_dir
-            )
-
-            # Export table schemas
-            print(f"\n  Exporting table schemas from {lh['name']}...")
-            tables = list_lakehouse_tables(workspace_path, lh["name"])
-
-            if tables:
+        if lakehouses:
+            print(f"Downloading lakehouse files ({len(lakehouses)} lakehouses)...")
+            results = drain_in_order(file_tasks, is_failure=lambda r: r is False or bool(r["failed"]))
+            for lh, task, result in zip(lakehouses, file_tasks, results):
+                if result is False:
+                    failed.append(task["label"])
+                    continue
+                manifest["lakehouseFiles"][lh["id"]] = result["files"]
+                failed.extend(f"{task['label']}/{path}" for path in result["failed"])
+            print()
+
+            schema_tasks = []
+            snapshot_tasks = []
+            skipped_schemas = 0
+            skipped_snapshots = 0
+            for lh, tables_future in zip(lakehouses, table_lists):
+                tables = tables_future.result()
+                if not tables:
+                    continue
                 tables_dir = lh["output_dir"] / "Tables"
                 tables_dir.mkdir(parents=True, exist_ok=True)
-
+                known = manifest["tables"].get(lh["id"], {})
+                versions = get_table_versions(workspace_id, lh["id"], tables, slots) if incremental else {}
+                snapshots = manifest["snapshots"].get(lh["id"], {})
                 for table in tables:
-                    schema_file = tables_dir / f"{table}_schema.json"
-                    if export_table_schema(workspace_path, lh["name"], table, schema_file):
-                        print(f"    {table}")
-
-                print(f"  Exported {len(tables)} table schemas")
-            else:
-                print(f"  No tables found")
+                    if table_data:
+                        version = (table_versions or {}).get(table)
+                        latest = int(versions[table][:20]) if versions.get(table) else None
+                        if (incremental and version is None and latest is not None
+                                and snapshots.get(table, {}).get("version") == latest
+                                and (tables_dir / table / "_delta_log").is_dir()):
+                            skipped_snapshots += 1
+                        else:
+                            snapshot_tasks.append(submit_logged(
+                                pool, f"{lh['name']}.Lakehouse/Tables/{table} (data)",
+                                export_table_snapshot, workspace_id, lh["id"], table, tables_dir / table,
+                                version=version, workers=jobs, slots=slots
+                            ))
+                            snapshot_tasks[-1]["table"] = (lh["id"], table)
 
-        print()
+                    schema_file = tables_dir / f"{table}_schema.json"
+                    if versions.get(table) and known.get(table) == versions[table] and schema_file.exists():
+                        skipped_schemas += 1
+                        continue
+                    schema_tasks.append(submit_logged(
+                        pool, f"{lh['name']}.Lakehouse/Tables/{table}",
+                        slots.wrap(export_table_schema), workspace_path, lh["name"], table, schema_file
+                    ))
+                    schema_tasks[-1]["table"] = (lh["id"], table, versions.get(table))
+
+            if skipped_schemas:
+                print(f"Skipping {skipped_schemas} table schemas with no new Delta commits")
+            if schema_tasks:
+                print(f"Exporting table schemas ({len(schema_tasks)} tables)...")
+                results = drain_in_order(schema_tasks)
+                for task, result in zip(schema_tasks, results):
+                    if result is False:
+                        failed.append(task["label"])
+                        continue
+                    lakehouse_id, table, version = task["table"]
+                    if version:
+                        manifest["tables"].setdefault(lakehouse_id, {})[table] = version
+            elif not skipped_schemas:
+                print("No tables found")
+            print()
+
+            if skipped_snapshots:
+                print(f"Skipping {skipped_snapshots} table snapshots with no new Delta commits")
+            if snapshot_tasks:
+                print(f"Exporting table data snapshots ({len(snapshot_tasks)} tables)...")
+                results = drain_in_order(snapshot_tasks)
+                for task, result in zip(snapshot_tasks, results):
+                    if result is False:
+                        failed.append(task["label"])
+                        continue
+                    lakehouse_id, table = task["table"]
+                    manifest["snapshots"].setdefault(lakehouse_id, {})[table] = result
+                print()
+
+    # Items gone from the workspace: tombstone, or delete with --prune
+    removed = 0
+    current_ids = {item["id"] for item in items}
+    for item_id, entry in list(manifest["items"].items()):
+        if item_id in current_ids or entry.get("deletedAt"):
+            continue
+        removed += 1
+        if incremental and prune:
+            shutil.rmtree(output_dir / entry["path"], ignore_errors=True)
+            del manifest["items"][item_id]
+            manifest["lakehouseFiles"].pop(item_id, None)
+            manifest["tables"].pop(item_id, None)
+            manifest["snapshots"].pop(item_id, None)
+        else:
+            entry["deletedAt"] = datetime.now(timezone.utc).isoformat()
+    for item_id in current_ids:
+        manifest["items"].get(item_id, {}).pop("deletedAt", None)
+
+    manifest["workspace"] = workspace_path
+    manifest["workspaceId"] = workspace_id
+    save_manifest(output_dir, manifest)
 
     # Summary
     print("=" * 60)
     print("Download Summary")
     print("=" * 60)
     print(f"Successfully downloaded: {total_success}")
-    print(f"Failed: {total_failed}")
+    if incremental:
+        print(f"  with changed content: {changed}")
+    if removed:
+        print(f"Removed from workspace: {removed} ({'deleted' if incremental and prune else 'tombstoned'})")
+    print(f"Failed: {len(failed)}")
+    for label in failed:
+        print(f"  {label}")
+    print(f"Elapsed: {time.time() - start:.1f}s with {jobs} jobs")
     print(f"Output directory: {output_dir.absolute()}")
 
+    if store:
+        print()
+        ingest_into_store(store, output_dir, workspace_path, workspace_id, jobs=jobs)
+
 
 #endregion
 
@@ -392,6 +1313,10 @@ Examples:
     python3 download_workspace.py "Sales.Workspace"
     python3 download_workspace.py "Production.Workspace" ./backup
     python3 download_workspace.py "dev.Workspace" --no-lakehouse-files
+    python3 download_workspace.py "Sales.Workspace" --jobs 16
+    python3 download_workspace.py "Sales.Workspace" ./backup --incremental --prune
+    python3 download_workspace.py "Sales.Workspace" ./backup --table-data --table-version orders=42
+    python3 download_workspace.py "Sales.Workspace" ./backup --incremental --store ./store
         """
     )
 
@@ -400,9 +1325,38 @@ Examples:
                         help="Output directory (default: ./workspace_downloads/<name>)")
     parser.add_argument("--no-lakehouse-files", action="store_true",
                         help="Skip downloading lakehouse files")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Concurrent exports and downloads (default: {DEFAULT_JOBS})")
+    parser.add_argument("--verify-md5", action="store_true",
+                        help="Verify lakehouse files against their Content-MD5 (size is always checked)")
+    parser.add_argument("--table-data", action="store_true",
+                        help="Also export each table's data as a self-contained Delta snapshot")
+    parser.add_argument("--table-version", action="append", default=[], metavar="TABLE=VERSION",
+                        help="With --table-data, snapshot TABLE at VERSION instead of the latest (repeatable)")
+    parser.add_argument("--store", type=Path, default=None,
+                        help="Also snapshot the backup into a deduplicating content-addressed store (backup_store.py)")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"Skip lakehouse files and table schemas unchanged since the last run ({MANIFEST_NAME}); "
+                             "items are always exported, changes detected by content hash")
+    parser.add_argument("--prune", action="store_true",
+                        help="With --incremental, delete backups of removed items and files instead of tombstoning")
 
     args = parser.parse_args()
 
+    if args.prune and not args.incremental:
+        parser.error("--prune requires --incremental")
+    if args.table_version and not args.table_data:
+        parser.error("--table-version requires --table-data")
+    if args.table_data and args.no_lakehouse_files:
+        parser.error("--table-data cannot be combined with --no-lakehouse-files")
+
+    table_versions = {}
+    for spec in args.table_version:
+        table, _, version = spec.rpartition("=")
+        if not table or not version.isdigit():
+            parser.error(f"--table-version must be TABLE=VERSION, got {spec!r}")
+        table_versions[table] = int(version)
+
     workspace_path = parse_workspace_path(args.workspace)
 
     # Extract name for default output dir
@@ -417,7 +1371,14 @@ Examples:
         download_workspace(
             workspace_path=workspace_path,
             output_dir=output_dir,
-            download_lakehouse_files_flag=not args.no_lakehouse_files
+            download_lakehouse_files_flag=not args.no_lakehouse_files,
+            jobs=max(1, args.jobs),
+            incremental=args.incremental,
+            prune=args.prune,
+            verify_md5=args.verify_md5,
+            table_data=args.table_data,
+            table_versions=table_versions,
+            store=args.store
         )
     except KeyboardInterrupt:
         print("\n\nDownload interrupted by user")
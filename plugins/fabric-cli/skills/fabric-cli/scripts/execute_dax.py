@@ -7,16 +7,107 @@ Uses the same path syntax as fab CLI commands.
 Usage:
     python3 execute_dax.py "Workspace.Workspace/Model.SemanticModel" -q "EVALUATE VALUES(Date[Year])"
     python3 execute_dax.py "Sales.Workspace/Sales Model.SemanticModel" -q "EVALUATE TOPN(5, 'Orders')"
+    python3 execute_dax.py "Sales.Workspace/Sales Model.SemanticModel" --batch ./queries -o results.json
+    python3 execute_dax.py "Sales.Workspace/Sales Model.SemanticModel" -q "EVALUATE 'Orders'" --paginate --format parquet -o orders.parquet
+    python3 execute_dax.py "Dev.Workspace/Sales.SemanticModel" "Prod.Workspace/Sales.SemanticModel" --batch ./queries --benchmark 20
+
+Batch mode (--batch):
+    Runs every query in a directory of .dax files, a single .dax file, or a
+    JSON file ([{"name", "query"}] or {"name": "query"}) against one or more
+    models. IDs are resolved once per model and queries run on a bounded
+    worker pool (--concurrency). Per-query wall time, row count and error go
+    to one structured JSON result file.
+
+Streamed output (--format csv, ndjson, parquet, arrow):
+    Rows are parsed as the response arrives (dax_results.py) and written
+    straight to the output, so large extracts use bounded memory. parquet
+    and arrow need -o and pyarrow; column types are inferred from the data.
+
+Pagination (--paginate):
+    executeQueries caps a result at 100k rows or 1M values and truncates
+    silently. With --paginate a result that reaches a cap is rewritten into
+    WINDOW pages (or FILTER key ranges with --page-key), run concurrently
+    and stitched back in order, dropping rows repeated at the chunk
+    boundaries.
+
+Result cache (--cache, or DAX_CACHE=1):
+    Successful results are kept in a local SQLite cache (dax_cache.py) keyed
+    on the dataset, normalised query, serializer settings and the model's
+    state (its last completed refresh and a hash of its definition), so
+    repeated queries against an unchanged model return in milliseconds
+    without touching capacity. A refresh or a redeployed definition
+    invalidates the model's entries once the state is re-read (at most a
+    minute later). Reading the definition needs requests; without it, or
+    without permission to read it, results are not cached.
+
+Benchmark (--benchmark N):
+    Runs each query N times after --warmup discarded runs, sequentially and
+    interleaved across variants, and reports cold time plus min, p50, p90,
+    max and standard deviation of wall time, split into server time and
+    client overhead over HTTP. With two model paths or --compare-query the
+    variants are compared side by side; a significantly slower p50 (seeded
+    permutation test) is flagged as a regression and exits 1.
+
+Transport:
+    With requests installed, executeQueries is posted directly over the
+    pooled session (http_session.py) with a cached token (token_broker.py);
+    otherwise each query runs through `fab api -A powerbi`, one process each.
 
 Requirements:
     - fab CLI installed and authenticated
+    - requests and az CLI (optional; direct HTTP instead of one fab process per query)
+    - pyarrow (optional; --format parquet / arrow)
 """
 
 import argparse
+import hashlib
 import json
+import os
+import random
 import subprocess
 import sys
 import re
+import statistics
+import tempfile
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+from dax_cache import ResultCache, cache_key
+from dax_results import COLUMNAR_FORMATS, READ_CHUNK_BYTES, STREAM_FORMATS, RowStream, write_csv, write_rows
+
+try:
+    from fabric_discovery import DiscoveryError, fabric_request, get_definition
+    from http_session import TIMEOUT_ERRORS, get_session
+    from token_broker import POWERBI_RESOURCE, TokenError, get_access_token
+    HTTP_AVAILABLE = True
+except ImportError:
+    HTTP_AVAILABLE = False
+
+
+POWERBI_API = "https://api.powerbi.com/v1.0/myorg"
+
+# executeQueries is throttled per user (120 queries/minute); keep batches modest
+DEFAULT_CONCURRENCY = 4
+MAX_RETRIES = 4
+
+# executeQueries caps each result; --paginate pages anything that reaches a cap
+MAX_RESULT_ROWS = 100_000
+MAX_RESULT_VALUES = 1_000_000
+
+# Pages fill this share of the cap, plus OVERLAP_ROWS re-read at each boundary
+PAGE_FILL = 0.9
+OVERLAP_ROWS = 100
+
+# Benchmark: resamples for the permutation test and default regression criteria
+PERMUTATION_RESAMPLES = 10_000
+DEFAULT_ALPHA = 0.05
+DEFAULT_REGRESSION_THRESHOLD = 0.05
+
+DAX_KEYWORD = re.compile(r"(DEFINE|EVALUATE|ORDER\s+BY|START\s+AT)\b", re.IGNORECASE)
 
 
 #region Helper Functions
@@ -94,13 +185,36 @@ def get_id(path: str) -> str:
     return output.strip('"')
 
 
+def resolve_model(path: str, workspace_ids: dict = None) -> dict:
+    """
+    Resolve a model path to workspace and model IDs.
+
+    Args:
+        path: Model path like "Workspace.Workspace/Model.SemanticModel"
+        workspace_ids: Cache of workspace path -> ID shared across calls
+
+    Returns:
+        Dict with path, workspaceId and datasetId
+    """
+    workspace, model = parse_path(path)
+    workspace_ids = {} if workspace_ids is None else workspace_ids
+    if workspace not in workspace_ids:
+        print(f"Resolving: {workspace}...", file=sys.stderr)
+        workspace_ids[workspace] = get_id(workspace)
+
+    full_path = f"{workspace}/{model}"
+    print(f"Resolving: {full_path}...", file=sys.stderr)
+    return {"path": full_path, "workspaceId": workspace_ids[workspace], "datasetId": get_id(full_path)}
+
+
 #endregion
 
 
 #region DAX Execution
 
 
-def execute_dax_query(workspace_id: str, dataset_id: str, query: str, include_nulls: bool = False) -> dict:
+def execute_dax_query(workspace_id: str, dataset_id: str, query: str, include_nulls: bool = False,
+                      timings: dict | None = None) -> dict:
     """
     Execute DAX query against semantic model using Fabric CLI.
 
@@ -111,6 +225,8 @@ def execute_dax_query(workspace_id: str, dataset_id: str, query: str, include_nu
         dataset_id: Semantic model GUID
         query: DAX query string
         include_nulls: Whether to include null values in results
+        timings: If given, receives "server": seconds from sending the request
+            to the response (HTTP transport only)
 
     Returns:
         Query results as dict
@@ -122,6 +238,12 @@ def execute_dax_query(workspace_id: str, dataset_id: str, query: str, include_nu
 
     endpoint = f"groups/{workspace_id}/datasets/{dataset_id}/executeQueries"
 
+    if HTTP_AVAILABLE:
+        try:
+            return post_power_bi(endpoint, payload, timings)
+        except TokenError:
+            pass
+
     output = run_fab_command([
         "api",
         "-A", "powerbi",
@@ -133,12 +255,963 @@ def execute_dax_query(workspace_id: str, dataset_id: str, query: str, include_nu
     return json.loads(output)
 
 
+def post_power_bi(endpoint: str, payload: dict, timings: dict | None = None) -> dict:
+    """
+    POST to the Power BI REST API over the pooled session.
+
+    Refreshes the token once on 401 and retries 429/5xx after Retry-After.
+
+    Args:
+        endpoint: Path below /v1.0/myorg
+        payload: JSON body
+        timings: If given, receives "server": the final response's elapsed time
+
+    Returns:
+        Dict in the same shape as `fab api` output: {"status_code", "text"}
+
+    Raises:
+        TokenError if no token can be obtained
+    """
+    try:
+        response = request_power_bi(endpoint, payload)
+    except TIMEOUT_ERRORS:
+        return {"status_code": 408, "text": {"error": {"message": "Request timed out"}}}
+    if timings is not None and getattr(response, "elapsed", None) is not None:
+        timings["server"] = response.elapsed.total_seconds()
+    try:
+        body = response.json()
+    except ValueError:
+        body = {"error": {"message": response.text[:500]}}
+    return {"status_code": response.status_code, "text": body}
+
+
+def request_power_bi(endpoint: str, payload: dict | None, stream: bool = False, method: str = "POST"):
+    """
+    Call the Power BI REST API, retrying throttling and auth failures.
+
+    Args:
+        endpoint: Path below /v1.0/myorg
+        payload: JSON body (None for GET)
+        stream: Return before the body is read; the caller iterates and closes it
+        method: HTTP method
+
+    Returns:
+        The final response (any status)
+
+    Raises:
+        TokenError if no token can be obtained
+        TIMEOUT_ERRORS when every attempt timed out
+    """
+    session = get_session()
+    url = f"{POWERBI_API}/{endpoint}"
+    force_refresh = False
+    for attempt in range(MAX_RETRIES + 1):
+        headers = {"Authorization": f"Bearer {get_access_token(POWERBI_RESOURCE, force_refresh)}"}
+        try:
+            if not stream:
+                response = session.request(method, url, headers=headers, json=payload, timeout=300)
+            elif hasattr(session, "build_request"):
+                # httpx.Client (FABRIC_HTTP2=1) streams through send() rather than a request() flag
+                request = session.build_request(method, url, headers=headers, json=payload, timeout=300)
+                response = session.send(request, stream=True)
+            else:
+                response = session.request(method, url, headers=headers, json=payload, timeout=300, stream=True)
+        except TIMEOUT_ERRORS:
+            if attempt < MAX_RETRIES:
+                continue
+            raise
+        retry = attempt < MAX_RETRIES and (
+            (response.status_code == 401 and not force_refresh)
+            or response.status_code in (429, 500, 502, 503, 504))
+        if not retry:
+            return response
+        response.close()
+        if response.status_code == 401 and not force_refresh:
+            force_refresh = True
+            continue
+        retry_after = response.headers.get("Retry-After", "")
+        time.sleep(min(int(retry_after) if retry_after.isdigit() else 2 ** attempt, 60))
+
+
+def export_dax_query(workspace_id: str, dataset_id: str, query: str, fmt: str,
+                     output: Path | None = None, include_nulls: bool = False) -> tuple[int, dict]:
+    """
+    Execute a DAX query and stream its rows to a file or stdout.
+
+    The response is never held in memory whole: rows are parsed as the body
+    arrives (RowStream) and written straight out by the writer for fmt.
+
+    Args:
+        workspace_id: Workspace GUID
+        dataset_id: Semantic model GUID
+        query: DAX query string
+        fmt: One of dax_results.STREAM_FORMATS
+        output: Target file; None writes csv/ndjson to stdout
+        include_nulls: Whether to include null values in results (always on
+            for csv, parquet and arrow, which need every column in every row)
+
+    Returns:
+        Tuple of (rows written, response envelope with the rows removed);
+        pass the envelope to query_error()
+    """
+    payload = {
+        "queries": [{"query": query}],
+        "serializerSettings": {"includeNulls": include_nulls or fmt != "ndjson"}
+    }
+    endpoint = f"groups/{workspace_id}/datasets/{dataset_id}/executeQueries"
+
+    # Rows go to a hidden partial file that replaces output only on success,
+    # so a failed or interrupted query leaves any previous output untouched
+    partial = output.with_name(f".{output.name}.part") if output else None
+
+    def write(stream):
+        return write_rows(stream, fmt, path=partial, out=sys.stdout)
+
+    try:
+        count, envelope = stream_dax_response(endpoint, payload, write)
+    except BaseException:
+        if partial:
+            partial.unlink(missing_ok=True)
+        raise
+
+    if partial:
+        if query_error(envelope):
+            partial.unlink(missing_ok=True)
+        else:
+            partial.replace(output)
+    return count, envelope
+
+
+def stream_dax_response(endpoint: str, payload: dict, write) -> tuple[int, dict]:
+    """
+    POST executeQueries and hand a RowStream over the response body to write.
+
+    Uses the pooled HTTP session when available, otherwise streams the stdout
+    of `fab api`.
+
+    Returns:
+        Tuple of (write's return value, response envelope with the rows removed)
+    """
+    count = None
+    if HTTP_AVAILABLE:
+        try:
+            response = request_power_bi(endpoint, payload, stream=True)
+        except TokenError:
+            response = None
+        except TIMEOUT_ERRORS:
+            return 0, {"status_code": 408, "text": {"error": {"message": "Request timed out"}}}
+        if response is not None:
+            try:
+                chunks = (response.iter_content(READ_CHUNK_BYTES) if hasattr(response, "iter_content")
+                          else response.iter_bytes())
+                stream = RowStream(chunks)
+                count = write(stream)
+            finally:
+                response.close()
+            envelope = {"status_code": response.status_code, "text": stream.document}
+            if stream.document is None:
+                envelope = None
+
+    if count is None:
+        try:
+            with tempfile.TemporaryFile() as stderr:
+                process = subprocess.Popen(
+                    ["fab", "api", "-A", "powerbi", "-X", "post", endpoint, "-i", json.dumps(payload)],
+                    stdout=subprocess.PIPE, stderr=stderr
+                )
+                try:
+                    stream = RowStream(iter(lambda: process.stdout.read(READ_CHUNK_BYTES), b""))
+                    count = write(stream)
+                finally:
+                    process.stdout.close()
+                    process.wait()
+                if process.returncode != 0:
+                    stderr.seek(0)
+                    print(f"Error running fab command: {stderr.read().decode(errors='replace')}", file=sys.stderr)
+                    sys.exit(1)
+        except FileNotFoundError:
+            print("Error: fab CLI not found. Install from: https://microsoft.github.io/fabric-cli/", file=sys.stderr)
+            sys.exit(1)
+        envelope = stream.document
+
+    if envelope is None:
+        envelope = {"status_code": 500, "text": {"error": {"message": "Response is not valid JSON"}}}
+    return count, envelope
+
+
+def query_error(results: dict) -> str | None:
+    """
+    Return the DAX or API error message in a response, or None if it succeeded.
+
+    Args:
+        results: Response from execute_dax_query()
+    """
+    data = results.get("text", results)
+    if not isinstance(data, dict):
+        return str(data) if results.get("status_code", 200) >= 400 else None
+    if "error" not in data and results.get("status_code", 200) < 400:
+        for result_set in data.get("results", []):
+            if "error" in result_set:
+                return result_set["error"].get("message", "Unknown error")
+        return None
+    err = data.get("error", {})
+    pbi_err = err.get("pbi.error", err)
+    details = pbi_err.get("details", [])
+    msg = err.get("message", "Unknown error")
+    for d in details:
+        if d.get("code") == "DetailsMessage":
+            msg = d.get("detail", {}).get("value", msg)
+            break
+    return msg
+
+
+def count_rows(results: dict) -> int:
+    """Total rows across all tables in a response."""
+    data = results.get("text", results)
+    return sum(
+        len(table.get("rows", []))
+        for result_set in data.get("results", [])
+        for table in result_set.get("tables", [])
+    )
+
+
+#endregion
+
+
+#region Result Cache
+
+
+def get_api_json(endpoint: str, powerbi: bool = True) -> dict:
+    """
+    GET a Power BI (or Fabric) REST endpoint for metadata lookups.
+
+    Returns:
+        Parsed body, or None on any failure
+    """
+    if HTTP_AVAILABLE:
+        try:
+            if powerbi:
+                response = request_power_bi(endpoint, None, method="GET")
+            else:
+                response = fabric_request("GET", endpoint)
+            return response.json() if response.status_code < 400 else None
+        except TokenError:
+            pass
+        except (DiscoveryError, ValueError, OSError, *TIMEOUT_ERRORS):
+            return None
+
+    command = ["fab", "api"] + (["-A", "powerbi"] if powerbi else []) + [endpoint]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+        envelope = json.loads(result.stdout) if result.returncode == 0 else {}
+    except (OSError, ValueError):
+        return None
+    body = envelope.get("text", envelope) if isinstance(envelope, dict) else None
+    return body if isinstance(body, dict) and envelope.get("status_code", 200) < 400 else None
+
+
+def model_state(workspace_id: str, dataset_id: str) -> str | None:
+    """
+    Identify the data and definition a model's query results depend on.
+
+    Returns:
+        End time of the last completed refresh joined with definition_hash(),
+        so a redeployed measure changes the state without a refresh; None
+        when the model has no completed refresh (DirectQuery, push) and must
+        not be cached
+
+    Raises:
+        LookupError: if the refresh history or the definition could not be read
+    """
+    body = get_api_json(f"groups/{workspace_id}/datasets/{dataset_id}/refreshes?$top=10")
+    if body is None:
+        raise LookupError(f"Refresh history of {dataset_id} is unavailable")
+    refreshes = body.get("value", [])
+    refreshed = next((r["endTime"] for r in refreshes if r.get("status") == "Completed" and r.get("endTime")), None)
+    if refreshed is None:
+        return None
+    return f"{refreshed}|{definition_hash(workspace_id, dataset_id)}"
+
+
+def definition_hash(workspace_id: str, dataset_id: str) -> str:
+    """
+    SHA-256 over a model's definition parts (getDefinition), in path order.
+
+    Raises:
+        LookupError: if the definition could not be read (no requests, no
+            permission, or the request failed)
+    """
+    if not HTTP_AVAILABLE:
+        raise LookupError("Reading the model definition requires requests")
+    try:
+        parts = get_definition(workspace_id, {"id": dataset_id, "type": "SemanticModel"})
+    except (DiscoveryError, TokenError, ValueError, OSError, *TIMEOUT_ERRORS) as e:
+        raise LookupError(f"Definition of {dataset_id} is unavailable: {e}")
+    digest = hashlib.sha256()
+    for part in sorted(parts, key=lambda p: p["path"]):
+        digest.update(part["path"].encode("utf-8") + b"\0" + part["payload"].encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+def execute_dax_query_cached(workspace_id: str, dataset_id: str, query: str, include_nulls: bool = False,
+                             cache: ResultCache | None = None) -> tuple[dict, bool]:
+    """
+    Execute a DAX query through the local result cache (dax_cache.py).
+
+    Successful results are stored under the model's current state; failed
+    queries and models without a cacheable state always go to the service.
+
+    Returns:
+        Tuple of (query results as from execute_dax_query(), whether they came from the cache)
+    """
+    if cache is None:
+        return execute_dax_query(workspace_id, dataset_id, query, include_nulls), False
+
+    state = cache.model_state(dataset_id, lambda: model_state(workspace_id, dataset_id))
+    if state is None:
+        return execute_dax_query(workspace_id, dataset_id, query, include_nulls), False
+
+    key = cache_key(dataset_id, query, {"includeNulls": include_nulls}, state)
+    results = cache.get(key)
+    if results is not None:
+        return results, True
+
+    results = execute_dax_query(workspace_id, dataset_id, query, include_nulls)
+    if not query_error(results):
+        cache.put(key, dataset_id, state, results)
+    return results, False
+
+
+#endregion
+
+
+#region Chunked Pagination
+
+
+def result_rows(results: dict) -> list[dict]:
+    """Rows of the first table in a response (executeQueries returns one per query)."""
+    data = results.get("text", results)
+    for result_set in data.get("results", []):
+        for table in result_set.get("tables", []):
+            return table.get("rows", [])
+    return []
+
+
+def result_columns(rows: list[dict]) -> list[str]:
+    """Column names in first-seen order; without includeNulls a row omits its null columns."""
+    return list(dict.fromkeys(name for row in rows for name in row))
+
+
+def is_truncated(rows: list[dict]) -> bool:
+    """
+    Whether a result stopped at an executeQueries cap.
+
+    The API does not flag truncation, so a result is treated as truncated when
+    it reaches MAX_RESULT_ROWS rows or MAX_RESULT_VALUES values. A result that
+    lands on a cap exactly is paged needlessly but still returned correctly.
+    """
+    if not rows:
+        return False
+    # Rows that are all null carry no columns when includeNulls is off
+    return len(rows) >= min(MAX_RESULT_ROWS, MAX_RESULT_VALUES // max(len(result_columns(rows)), 1))
+
+
+def dax_clauses(query: str) -> dict:
+    """
+    Split a single-EVALUATE DAX query into its top-level clauses.
+
+    Keywords inside strings, quoted table names, [column] references,
+    comments and parentheses are ignored.
+
+    Returns:
+        Dict with "define" (text before EVALUATE, may be empty), "table" (the
+        EVALUATE expression) and "order_by" (list of (expression, "ASC"|"DESC"))
+
+    Raises:
+        ValueError for queries with no or several EVALUATE statements, or START AT
+    """
+    keywords = []
+    commas = []
+    depth = 0
+    i = 0
+    length = len(query)
+    while i < length:
+        char = query[i]
+        pair = query[i:i + 2]
+        if char in "\"'[":
+            close = "]" if char == "[" else char
+            i += 1
+            while i < length:
+                if query[i] == close:
+                    # Doubled closers ("", '', ]]) are escapes
+                    if query[i + 1:i + 2] != close:
+                        break
+                    i += 1
+                i += 1
+        elif pair in ("//", "--"):
+            newline = query.find("\n", i)
+            i = length if newline < 0 else newline
+        elif pair == "/*":
+            end = query.find("*/", i + 2)
+            i = length if end < 0 else end + 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and char == ",":
+            commas.append(i)
+        elif depth == 0 and char.isalpha() and (i == 0 or not (query[i - 1].isalnum() or query[i - 1] == "_")):
+            match = DAX_KEYWORD.match(query, i)
+            if match:
+                keywords.append((match.group(1).split()[0].upper(), match.start(), match.end()))
+                i = match.end()
+                continue
+        i += 1
+
+    names = [name for name, _, _ in keywords]
+    if names.count("EVALUATE") != 1:
+        raise ValueError("Pagination needs a query with exactly one EVALUATE")
+    if "START" in names:
+        raise ValueError("Pagination does not support START AT")
+
+    _, evaluate_start, evaluate_end = keywords[names.index("EVALUATE")]
+    order = keywords[names.index("ORDER")] if "ORDER" in names else None
+
+    order_by = []
+    if order:
+        bounds = [order[2]] + [c + 1 for c in commas if c > order[2]] + [length + 1]
+        for start, end in zip(bounds, bounds[1:]):
+            item = query[start:end - 1].strip()
+            direction = re.search(r"\s(ASC|DESC)$", item, re.IGNORECASE)
+            if direction:
+                item = item[:direction.start()].strip()
+            order_by.append((item, direction.group(1).upper() if direction else "ASC"))
+
+    return {
+        "define": query[:evaluate_start].strip(),
+        "table": query[evaluate_end:order[1] if order else length].strip(),
+        "order_by": order_by,
+    }
+
+
+def column_reference(name: str) -> str:
+    """Turn a result column name ("Sales[Amount]" or "[Total]") into a DAX reference."""
+    bracket = name.find("[")
+    if bracket < 0 or not name.endswith("]"):
+        return "[" + name.replace("]", "]]") + "]"
+    table = name[:bracket]
+    reference = "[" + name[bracket + 1:-1].replace("]", "]]") + "]"
+    return "'" + table.replace("'", "''") + "'" + reference if table else reference
+
+
+def dax_literal(value) -> str:
+    """Format a key boundary as a DAX literal."""
+    if isinstance(value, datetime):
+        return (f"(DATE({value.year}, {value.month}, {value.day}) + "
+                f"TIME({value.hour}, {value.minute}, {value.second}))")
+    return repr(value)
+
+
+def key_value(value):
+    """Parse a MINX/MAXX result into a number or datetime."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).replace(tzinfo=None)
+        except ValueError:
+            pass
+    raise ValueError(f"--page-key must be a numeric or date/time column (got {value!r})")
+
+
+def key_ranges(low, high, count: int) -> list[tuple]:
+    """
+    Split [low, high] into up to count contiguous ranges.
+
+    Returns:
+        List of (start, end, last) tuples; a range holds start <= key < end, or
+        start <= key <= end when last is True
+    """
+    if isinstance(low, int) and isinstance(high, int):
+        edges = {low + (high - low) * n // count for n in range(count)}
+    elif isinstance(low, datetime):
+        edges = {(low + (high - low) * n / count).replace(microsecond=0) for n in range(count)}
+    else:
+        edges = {low + (high - low) * n / count for n in range(count)}
+    edges = sorted(edges - {high}) + [high]
+    if len(edges) == 1:
+        return [(low, high, True)]
+    return [(start, end, n == len(edges) - 2) for n, (start, end) in enumerate(zip(edges, edges[1:]))]
+
+
+def iter_paged_rows(workspace_id: str, dataset_id: str, query: str, columns: list[str],
+                    include_nulls: bool = False, page_key: str | None = None,
+                    concurrency: int = DEFAULT_CONCURRENCY) -> Iterator[dict]:
+    """
+    Yield every row of a query whose result exceeds the executeQueries caps.
+
+    The query is rewritten into chunks that each stay under the caps, the
+    chunks run concurrently, and rows are yielded in chunk order:
+
+    - Window (default): WINDOW pages over the EVALUATE expression by absolute
+      position, ordered by the query's ORDER BY and then every result column.
+      That order identifies every row, so pages are deterministic; a result
+      with fully duplicate rows is rejected by the engine and needs page_key.
+      Each page re-reads the previous page's last OVERLAP_ROWS rows.
+    - Key range (page_key): FILTER on contiguous ranges of a numeric or
+      date/time result column, split between its MINX and MAXX. A range that
+      still hits a cap is halved and rerun.
+
+    Leading rows of a page that repeat the last OVERLAP_ROWS rows of the
+    previous page are dropped, so no row is emitted twice at a boundary.
+
+    Args:
+        workspace_id: Workspace GUID
+        dataset_id: Semantic model GUID
+        query: Single-EVALUATE DAX query
+        columns: Result column names, from the truncated first response
+        include_nulls: Whether to include null values in results
+        page_key: DAX column reference to split on, e.g. 'Sales'[Order Date]
+        concurrency: Chunks in flight or waiting to be yielded at once
+
+    Raises:
+        ValueError if the query cannot be paged or a chunk fails
+    """
+    clauses = dax_clauses(query)
+    define = f"{clauses['define']}\n" if clauses["define"] else ""
+    table = clauses["table"]
+    page_rows = int(min(MAX_RESULT_ROWS, MAX_RESULT_VALUES // max(len(columns), 1)) * PAGE_FILL) - OVERLAP_ROWS
+
+    def run(chunk_query):
+        results = execute_dax_query(workspace_id, dataset_id, chunk_query, include_nulls)
+        msg = query_error(results)
+        if msg:
+            hint = "" if page_key else " (results with fully duplicate rows need --page-key)"
+            raise ValueError(f"Chunk query failed: {msg}{hint}")
+        return result_rows(results)
+
+    if page_key:
+        stats = run(f"{define}EVALUATE ROW(\"Rows\", COUNTROWS({table}), "
+                    f"\"Low\", MINX({table}, {page_key}), \"High\", MAXX({table}, {page_key}))")[0]
+        # Twice the minimum chunk count leaves headroom for skewed keys
+        chunks = key_ranges(key_value(stats["[Low]"]), key_value(stats["[High]"]),
+                            2 * -(-stats["[Rows]"] // page_rows))
+        order_by = ", ".join(f"{e} {d}" for e, d in clauses["order_by"]) or page_key
+
+        def chunk_query(chunk):
+            start, end, last = chunk
+            return (f"{define}EVALUATE FILTER({table}, {page_key} >= {dax_literal(start)} && "
+                    f"{page_key} {'<=' if last else '<'} {dax_literal(end)})\nORDER BY {order_by}")
+    else:
+        total = run(f"{define}EVALUATE ROW(\"Rows\", COUNTROWS({table}))")[0]["[Rows]"]
+        chunks = list(range(0, total, page_rows))
+        order = list(clauses["order_by"])
+        seen = {re.sub(r"[\s']", "", e).lower() for e, _ in order}
+        order += [(ref, "ASC") for ref in map(column_reference, columns)
+                  if re.sub(r"[\s']", "", ref).lower() not in seen]
+        window_order = ", ".join(f"{e}, {d}" for e, d in order)
+        order_by = ", ".join(f"{e} {d}" for e, d in order)
+
+        def chunk_query(skip):
+            # WINDOW positions are 1-based and inclusive
+            first = skip - min(skip, OVERLAP_ROWS) + 1
+            return (f"{define}EVALUATE WINDOW({first}, ABS, {skip + page_rows}, ABS, {table}, "
+                    f"ORDERBY({window_order}))\nORDER BY {order_by}")
+
+        # The table expression is spliced in verbatim; make sure it stayed one
+        check = dax_clauses(chunk_query(0)) if chunks else None
+        if check and (len(check["order_by"]) != len(order) or not check["table"].startswith("WINDOW(")):
+            raise ValueError("Could not build window queries for this EVALUATE expression; use --page-key")
+
+    print(f"Paging {len(chunks)} chunk(s), concurrency {concurrency}...", file=sys.stderr)
+    previous = Counter()
+    done = 0
+    # [chunk, future] in output order; futures are started lazily so that at
+    # most `concurrency` chunks are running or holding rows at any time
+    pending = deque([chunk, None] for chunk in chunks)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+
+        def fill():
+            started = 0
+            for entry in pending:
+                if started == concurrency:
+                    break
+                if entry[1] is None:
+                    entry[1] = pool.submit(run, chunk_query(entry[0]))
+                started += 1
+
+        while pending:
+            fill()
+            chunk, future = pending.popleft()
+            rows = future.result()
+            if page_key and is_truncated(rows):
+                halves = key_ranges(chunk[0], chunk[1], 2)
+                if len(halves) < 2:
+                    raise ValueError(f"Key range {chunk[0]}..{chunk[1]} alone exceeds the result caps; "
+                                     f"choose a more selective --page-key")
+                halves[-1] = (*halves[-1][:2], chunk[2])
+                pending.extendleft(reversed([[half, None] for half in halves]))
+                continue
+
+            # Drop rows already emitted at the end of the previous chunk
+            start = 0
+            while start < len(rows):
+                key = json.dumps(rows[start], sort_keys=True)
+                if not previous[key]:
+                    break
+                previous[key] -= 1
+                start += 1
+            done += 1
+            print(f"  chunk {done}: {len(rows) - start} rows", file=sys.stderr)
+            yield from rows[start:]
+            if not page_key:
+                previous = Counter(json.dumps(row, sort_keys=True) for row in rows[-OVERLAP_ROWS:])
+
+
+def execute_dax_query_paged(workspace_id: str, dataset_id: str, query: str, include_nulls: bool = False,
+                            page_key: str | None = None, concurrency: int = DEFAULT_CONCURRENCY) -> dict:
+    """
+    Execute a DAX query, paging it with iter_paged_rows() if the result was truncated.
+
+    Returns:
+        Query results as dict, in the same shape as execute_dax_query()
+    """
+    results = execute_dax_query(workspace_id, dataset_id, query, include_nulls)
+    rows = result_rows(results)
+    if query_error(results) or not is_truncated(rows):
+        return results
+    print(f"Result truncated at {len(rows)} rows; paging...", file=sys.stderr)
+    rows = list(iter_paged_rows(workspace_id, dataset_id, query, result_columns(rows), include_nulls,
+                                page_key, concurrency))
+    return {"status_code": 200, "text": {"results": [{"tables": [{"rows": rows}]}]}}
+
+
+#endregion
+
+
+#region Batch Mode
+
+
+def load_queries(path: Path) -> list[dict]:
+    """
+    Load named queries for batch mode.
+
+    Args:
+        path: Directory of .dax files (searched recursively), a .dax file, or a
+            JSON file holding [{"name", "query"}] or {"name": "query"}
+
+    Returns:
+        List of {"name", "query"} dicts in a stable order
+
+    Raises:
+        ValueError if no queries are found or the file format is not recognised
+    """
+    if path.is_dir():
+        queries = [
+            {"name": file.relative_to(path).with_suffix("").as_posix(), "query": file.read_text(encoding="utf-8")}
+            for file in sorted(path.rglob("*.dax"))
+        ]
+    elif path.suffix.lower() == ".json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(data, dict):
+            queries = [{"name": name, "query": query} for name, query in data.items()]
+        else:
+            queries = [{"name": q.get("name", f"query_{n}"), "query": q["query"]} for n, q in enumerate(data, 1)]
+    elif path.suffix.lower() == ".dax":
+        queries = [{"name": path.stem, "query": path.read_text(encoding="utf-8")}]
+    else:
+        raise ValueError(f"Unsupported batch input: {path} (expected a directory, .dax or .json file)")
+
+    queries = [q for q in queries if q["query"].strip()]
+    if not queries:
+        raise ValueError(f"No queries found in {path}")
+    return queries
+
+
+def run_batch(models: list[dict], queries: list[dict], concurrency: int = DEFAULT_CONCURRENCY,
+              include_nulls: bool = False, cache: ResultCache | None = None) -> dict:
+    """
+    Run every query against every model on a bounded worker pool.
+
+    Args:
+        models: Resolved models from resolve_model()
+        queries: Named queries from load_queries()
+        concurrency: Queries in flight at once
+        include_nulls: Whether to include null values in results
+        cache: Result cache to read and fill, or None
+
+    Returns:
+        Structured result: run metadata, a summary and one entry per
+        (model, query) with status, seconds, rows, cached and error
+    """
+    started = datetime.now(timezone.utc)
+    jobs = [(model, query) for model in models for query in queries]
+    width = len(str(len(jobs)))
+
+    def run(job):
+        model, query = job
+        start = time.perf_counter()
+        cached = False
+        try:
+            results, cached = execute_dax_query_cached(model["workspaceId"], model["datasetId"], query["query"],
+                                                       include_nulls, cache)
+            error = query_error(results)
+            rows = None if error else count_rows(results)
+        except (SystemExit, OSError, ValueError) as e:
+            error = f"{type(e).__name__}: {e}"
+            rows = None
+        return {
+            "model": model["path"],
+            "query": query["name"],
+            "status": "failed" if error else "ok",
+            "seconds": round(time.perf_counter() - start, 3),
+            "rows": rows,
+            "cached": cached,
+            "error": error,
+        }
+
+    entries = []
+    batch_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for n, entry in enumerate(pool.map(run, jobs), 1):
+            entries.append(entry)
+            detail = f"{entry['rows']} rows" if entry["status"] == "ok" else entry["error"]
+            if entry["cached"]:
+                detail += " (cached)"
+            print(f"[{n:>{width}}/{len(jobs)}] {entry['status']:6s} {entry['seconds']:7.2f}s  "
+                  f"{entry['query']} @ {entry['model']}: {detail}", file=sys.stderr)
+
+    seconds = [e["seconds"] for e in entries]
+    return {
+        "startedAt": started.isoformat(),
+        "elapsedSeconds": round(time.perf_counter() - batch_start, 3),
+        "concurrency": concurrency,
+        "transport": "http" if HTTP_AVAILABLE else "fab",
+        "models": models,
+        "summary": {
+            "total": len(entries),
+            "ok": sum(e["status"] == "ok" for e in entries),
+            "failed": sum(e["status"] == "failed" for e in entries),
+            "cached": sum(e["cached"] for e in entries),
+            "querySeconds": round(sum(seconds), 3),
+            "slowest": max(entries, key=lambda e: e["seconds"])["query"] if entries else None,
+        },
+        "queries": entries,
+    }
+
+
+#endregion
+
+
+#region Benchmark
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Linearly interpolated percentile of values (fraction 0..1)."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def summarize(values: list[float]) -> dict | None:
+    """min, p50, p90, max, mean and standard deviation of a sample, in seconds."""
+    if not values:
+        return None
+    return {
+        "min": round(min(values), 4),
+        "p50": round(percentile(values, 0.5), 4),
+        "p90": round(percentile(values, 0.9), 4),
+        "max": round(max(values), 4),
+        "mean": round(statistics.fmean(values), 4),
+        "stdev": round(statistics.stdev(values), 4) if len(values) > 1 else 0.0,
+    }
+
+
+def permutation_test(baseline: list[float], candidate: list[float], resamples: int = PERMUTATION_RESAMPLES) -> float:
+    """
+    Two-sided p-value for a difference in median wall time.
+
+    A permutation test makes no assumption about the shape of the timing
+    distribution (query times are skewed and often bimodal) and needs nothing
+    outside the standard library. Seeded, so reruns on the same samples agree.
+    """
+    observed = abs(statistics.median(candidate) - statistics.median(baseline))
+    pooled = baseline + candidate
+    rng = random.Random(0)
+    extreme = 0
+    for _ in range(resamples):
+        rng.shuffle(pooled)
+        left, right = pooled[:len(baseline)], pooled[len(baseline):]
+        if abs(statistics.median(right) - statistics.median(left)) >= observed:
+            extreme += 1
+    return (extreme + 1) / (resamples + 1)
+
+
+def run_benchmark(variants: list[dict], pairs: list[tuple[int, int]], runs: int, warmup: int = 1,
+                  alpha: float = 0.05, threshold: float = 0.05) -> dict:
+    """
+    Time every variant `runs` times after `warmup` discarded runs.
+
+    Runs are sequential so variants never compete for capacity, and
+    interleaved (A, B, A, B, ...) so drift in capacity load or caches hits
+    every variant alike. The first warm-up run is reported as the cold time.
+    Server time is the HTTP response's elapsed time (request sent to
+    response headers, including the network round trip); client overhead is
+    wall time minus server time. Both are None over the fab transport.
+
+    Args:
+        variants: Dicts with "label", "model" (from resolve_model()) and "query"
+        pairs: (baseline index, candidate index) pairs to compare
+        runs: Measured runs per variant
+        warmup: Discarded runs per variant before measuring
+        alpha: Significance level for the permutation test
+        threshold: Minimum relative slowdown in p50 that counts as a regression
+
+    Returns:
+        Structured result with per-variant statistics and comparisons
+    """
+    started = datetime.now(timezone.utc)
+    samples = [{"wall": [], "server": [], "client": [], "cold": None, "rows": None, "error": None} for _ in variants]
+
+    for round_number in range(warmup + runs):
+        measured = round_number >= warmup
+        for variant, sample in zip(variants, samples):
+            if sample["error"]:
+                continue
+            timings = {}
+            start = time.perf_counter()
+            results = execute_dax_query(variant["model"]["workspaceId"], variant["model"]["datasetId"],
+                                        variant["query"], timings=timings)
+            wall = time.perf_counter() - start
+            error = query_error(results)
+            if error:
+                sample["error"] = error
+                print(f"  {variant['label']}: {error}", file=sys.stderr)
+                continue
+            if sample["cold"] is None:
+                sample["cold"] = round(wall, 4)
+                sample["rows"] = count_rows(results)
+            if measured:
+                sample["wall"].append(wall)
+                if "server" in timings:
+                    sample["server"].append(timings["server"])
+                    sample["client"].append(max(wall - timings["server"], 0.0))
+        phase = "measured" if measured else "warm-up"
+        print(f"  round {round_number + 1}/{warmup + runs} ({phase})", file=sys.stderr)
+
+    entries = [
+        {
+            "label": variant["label"],
+            "model": variant["model"]["path"],
+            "rows": sample["rows"],
+            "error": sample["error"],
+            "cold": sample["cold"],
+            "wall": summarize(sample["wall"]),
+            "server": summarize(sample["server"]),
+            "clientOverhead": summarize(sample["client"]),
+            "samples": [round(v, 4) for v in sample["wall"]],
+        }
+        for variant, sample in zip(variants, samples)
+    ]
+
+    comparisons = []
+    for baseline, candidate in pairs:
+        a, b = samples[baseline]["wall"], samples[candidate]["wall"]
+        comparison = {
+            "baseline": variants[baseline]["label"],
+            "candidate": variants[candidate]["label"],
+            "rowsMatch": samples[baseline]["rows"] == samples[candidate]["rows"],
+        }
+        if len(a) < 2 or len(b) < 2:
+            comparisons.append({**comparison, "regression": None, "error": "not enough successful runs"})
+            continue
+        change = statistics.median(b) / statistics.median(a) - 1
+        p_value = permutation_test(a, b)
+        comparisons.append({
+            **comparison,
+            "p50Change": round(change, 4),
+            "pValue": round(p_value, 4),
+            "significant": p_value < alpha,
+            "regression": p_value < alpha and change >= threshold,
+            "improvement": p_value < alpha and change <= -threshold,
+        })
+
+    return {
+        "startedAt": started.isoformat(),
+        "transport": "http" if HTTP_AVAILABLE else "fab",
+        "runs": runs,
+        "warmup": warmup,
+        "alpha": alpha,
+        "threshold": threshold,
+        "variants": entries,
+        "comparisons": comparisons,
+    }
+
+
+def format_benchmark(result: dict) -> str:
+    """Side-by-side table of benchmark statistics and comparisons."""
+    def cell(stats, key):
+        return f"{stats[key] * 1000:.0f}" if stats else "-"
+
+    width = max([len(v["label"]) for v in result["variants"]] + [7])
+    lines = [
+        f"{'variant':<{width}}  {'cold':>7}  {'min':>7}  {'p50':>7}  {'p90':>7}  {'max':>7}  "
+        f"{'stdev':>7}  {'server':>7}  {'client':>7}   (ms)",
+    ]
+    lines.append("-" * len(lines[0]))
+    for v in result["variants"]:
+        if v["error"]:
+            lines.append(f"{v['label']:<{width}}  failed: {v['error']}")
+            continue
+        cold = f"{v['cold'] * 1000:.0f}" if v["cold"] is not None else "-"
+        lines.append(
+            f"{v['label']:<{width}}  {cold:>7}  {cell(v['wall'], 'min'):>7}  {cell(v['wall'], 'p50'):>7}  "
+            f"{cell(v['wall'], 'p90'):>7}  {cell(v['wall'], 'max'):>7}  {cell(v['wall'], 'stdev'):>7}  "
+            f"{cell(v['server'], 'p50'):>7}  {cell(v['clientOverhead'], 'p50'):>7}"
+        )
+    for c in result["comparisons"]:
+        if c["regression"] is None:
+            lines.append(f"\n{c['candidate']} vs {c['baseline']}: {c['error']}")
+            continue
+        verdict = "REGRESSION" if c["regression"] else "improvement" if c["improvement"] else (
+            "significant, below threshold" if c["significant"] else "no significant difference")
+        lines.append(f"\n{c['candidate']} vs {c['baseline']}: p50 {c['p50Change']:+.1%} "
+                     f"(p={c['pValue']:.3f}) {verdict}")
+        if not c["rowsMatch"]:
+            lines.append("  (row counts differ; the variants do not return the same result)")
+    return "\n".join(lines)
+
+
 #endregion
 
 
 #region Output Formatting
 
 
+def write_output(rows, fmt: str, output: Path | None) -> int:
+    """
+    Write rows in a streamed format to output, or to stdout when output is None.
+
+    A file is written under a hidden .part name and renamed into place only
+    once every row is written, so a failed chunk never leaves a partial file.
+
+    Returns:
+        Number of rows written
+    """
+    if output is None:
+        return write_rows(rows, fmt, out=sys.stdout)
+    partial = output.with_name(f".{output.name}.part")
+    try:
+        count = write_rows(rows, fmt, path=partial)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    partial.replace(output)
+    return count
+
+
 def format_results_as_table(results: dict) -> str:
     """Format query results as ASCII table."""
     output_lines = []
@@ -160,19 +1233,16 @@ def format_results_as_table(results: dict) -> str:
 
             columns = list(rows[0].keys())
 
-            widths = {col: len(col) for col in columns}
-            for row in rows:
-                for col in columns:
-                    value_str = str(row.get(col, ""))
-                    widths[col] = max(widths[col], len(value_str))
+            # Render every cell once; widths and output both use the strings
+            cells = [[str(row.get(col, "")) for col in columns] for row in rows]
+            widths = [max(len(col), *(len(line[i]) for line in cells)) for i, col in enumerate(columns)]
 
-            header = " | ".join(col.ljust(widths[col]) for col in columns)
+            header = " | ".join(col.ljust(width) for col, width in zip(columns, widths))
             output_lines.append(header)
             output_lines.append("-" * len(header))
 
-            for row in rows:
-                row_str = " | ".join(str(row.get(col, "")).ljust(widths[col]) for col in columns)
-                output_lines.append(row_str)
+            for line in cells:
+                output_lines.append(" | ".join(cell.ljust(width) for cell, width in zip(line, widths)))
 
             output_lines.append("")
             output_lines.append(f"({len(rows)} row(s) returned)")
@@ -181,8 +1251,12 @@ def format_results_as_table(results: dict) -> str:
 
 
 def format_results_as_csv(results: dict) -> str:
-    """Format query results as CSV."""
-    import csv
+    """
+    Format query results as CSV.
+
+    For parsed responses already in memory; main() streams CSV output with
+    export_dax_query() instead.
+    """
     import io
 
     output = io.StringIO()
@@ -193,17 +1267,8 @@ def format_results_as_csv(results: dict) -> str:
         data = results
 
     for result_set in data.get("results", []):
-        tables = result_set.get("tables", [])
-
-        for table in tables:
-            rows = table.get("rows", [])
-
-            if rows:
-                columns = list(rows[0].keys())
-
-                writer = csv.DictWriter(output, fieldnames=columns)
-                writer.writeheader()
-                writer.writerows(rows)
+        for table in result_set.get("tables", []):
+            write_csv(table.get("rows", []), output)
 
     return output.getvalue()
 
@@ -223,6 +1288,8 @@ Examples:
     python3 execute_dax.py "Sales.Workspace/Sales Model.SemanticModel" -q "EVALUATE VALUES('Date'[Year])"
     python3 execute_dax.py "Production.Workspace/Sales.SemanticModel" -q "EVALUATE TOPN(10, 'Sales')" --format csv
     python3 execute_dax.py "ws.Workspace/Model.SemanticModel" -q "EVALUATE ROW(\\"Total\\", SUM('Sales'[Amount]))"
+    python3 execute_dax.py "ws.Workspace/Model.SemanticModel" --batch ./tests/dax -o results.json
+    python3 execute_dax.py "dev.Workspace/Model.SemanticModel" "prod.Workspace/Model.SemanticModel" --batch suite.json
 
 DAX Requirements:
     - EVALUATE is mandatory; all queries must start with EVALUATE
@@ -233,46 +1300,196 @@ DAX Requirements:
         """
     )
 
-    parser.add_argument("path", help="Model path: Workspace.Workspace/Model.SemanticModel")
-    parser.add_argument("-q", "--query", required=True, help="DAX query to execute")
-    parser.add_argument("-o", "--output", help="Output file path")
-    parser.add_argument("--format", choices=["json", "csv", "table"], default="table",
-                        help="Output format (default: table)")
+    parser.add_argument("paths", nargs="+", metavar="path",
+                        help="Model path: Workspace.Workspace/Model.SemanticModel (several allowed with --batch)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("-q", "--query", help="DAX query to execute")
+    source.add_argument("--batch", type=Path,
+                        help="Run all queries in a directory of .dax files, a .dax file or a .json file")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Queries in flight at once in batch mode (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("-o", "--output", help="Output file path (batch mode: JSON result file)")
+    parser.add_argument("--format", choices=["json", "table", *STREAM_FORMATS], default="table",
+                        help="Output format (default: table); csv, ndjson, parquet and arrow are "
+                             "streamed to the output with bounded memory")
     parser.add_argument("--include-nulls", action="store_true",
                         help="Include null values in results")
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, default=os.environ.get("DAX_CACHE") == "1",
+                        help="Serve repeated queries from the local result cache until the model refreshes "
+                             "(default: on when DAX_CACHE=1; see dax_cache.py)")
+    bench = parser.add_argument_group("benchmark")
+    bench.add_argument("--benchmark", type=int, metavar="N",
+                       help="Time each query N times (after --warmup) and report percentiles; with two model "
+                            "paths or --compare-query, compare side by side")
+    bench.add_argument("--warmup", type=int, default=1,
+                       help="Discarded runs per variant before measuring (default: 1; the first is reported as cold)")
+    bench.add_argument("--compare-query", metavar="QUERY",
+                       help="Second version of the -q query to compare against it on the same model")
+    bench.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                       help=f"Significance level for regressions (default: {DEFAULT_ALPHA})")
+    bench.add_argument("--regression-threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD * 100,
+                       metavar="PERCENT",
+                       help=f"Minimum p50 slowdown that counts as a regression "
+                            f"(default: {DEFAULT_REGRESSION_THRESHOLD * 100:.0f})")
+    parser.add_argument("--paginate", action="store_true",
+                        help="Page results truncated at the executeQueries caps (100k rows / 1M values) "
+                             "into concurrent chunks")
+    parser.add_argument("--page-key", metavar="COLUMN",
+                        help="With --paginate: numeric or date/time result column to split into key ranges, "
+                             "e.g. \"'Sales'[Order Date]\" (default: WINDOW pages)")
 
     args = parser.parse_args()
 
-    # Parse path
+    if args.benchmark is not None:
+        if args.benchmark < 2:
+            parser.error("--benchmark needs at least 2 runs")
+        if len(args.paths) > 2 or (len(args.paths) > 1 and args.compare_query):
+            parser.error("--benchmark compares two model paths, or one model with --compare-query")
+        if args.compare_query and not args.query:
+            parser.error("--compare-query requires -q")
+        if args.paginate or args.cache:
+            parser.error("--benchmark times the service directly; drop --paginate and --cache")
+    elif args.compare_query:
+        parser.error("--compare-query requires --benchmark")
+    elif len(args.paths) > 1 and not args.batch:
+        parser.error("several model paths require --batch")
+    if args.format in COLUMNAR_FORMATS and not args.batch and not args.output:
+        parser.error(f"--format {args.format} requires -o/--output")
+    if args.paginate and args.batch:
+        parser.error("--paginate applies to a single -q query")
+    if args.page_key and not args.paginate:
+        parser.error("--page-key requires --paginate")
+    if args.cache and args.paginate:
+        print("Note: --paginate results are not cached", file=sys.stderr)
+
+    # Parse paths and load queries before any fab call
     try:
-        workspace, model = parse_path(args.path)
-    except ValueError as e:
+        for path in args.paths:
+            parse_path(path)
+        queries = load_queries(args.batch) if args.batch else None
+    except (ValueError, OSError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Get IDs
-    print(f"Resolving: {workspace}...", file=sys.stderr)
-    workspace_id = get_id(workspace)
-
-    full_path = f"{workspace}/{model}"
-    print(f"Resolving: {full_path}...", file=sys.stderr)
-    model_id = get_id(full_path)
+    # Get IDs, once per workspace and model
+    workspace_ids = {}
+    models = [resolve_model(path, workspace_ids) for path in args.paths]
+
+    cache = ResultCache() if args.cache and not args.paginate else None
+
+    if args.benchmark is not None:
+        named = queries or [{"name": "query", "query": args.query}]
+        variants = []
+        pairs = []
+        for q in named:
+            if args.compare_query:
+                pairs.append((len(variants), len(variants) + 1))
+                variants.append({"label": f"{q['name']} (A)", "model": models[0], "query": q["query"]})
+                variants.append({"label": f"{q['name']} (B)", "model": models[0], "query": args.compare_query})
+                continue
+            if len(models) == 2:
+                pairs.append((len(variants), len(variants) + 1))
+            for model in models:
+                label = q["name"] if len(models) == 1 else f"{q['name']} @ {model['path']}"
+                variants.append({"label": label, "model": model, "query": q["query"]})
+
+        print(f"Benchmarking {len(variants)} variant(s): {max(0, args.warmup)} warm-up + {args.benchmark} "
+              f"measured runs each...", file=sys.stderr)
+        result = run_benchmark(variants, pairs, args.benchmark, max(0, args.warmup), args.alpha,
+                               args.regression_threshold / 100)
+        print(format_benchmark(result), file=sys.stderr)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(result, f, indent=2)
+            print(f"\nResults saved to: {args.output}", file=sys.stderr)
+        else:
+            print(json.dumps(result, indent=2))
+        failed = any(v["error"] for v in result["variants"])
+        sys.exit(1 if failed or any(c["regression"] for c in result["comparisons"]) else 0)
+
+    if args.batch:
+        print(f"Running {len(queries)} queries against {len(models)} model(s), "
+              f"concurrency {max(1, args.concurrency)}...", file=sys.stderr)
+        result = run_batch(models, queries, max(1, args.concurrency), args.include_nulls, cache)
+        summary = result["summary"]
+        cached = f", {summary['cached']} from cache" if cache else ""
+        print(f"\n{summary['ok']} ok, {summary['failed']} failed{cached} in {result['elapsedSeconds']:.1f}s "
+              f"({summary['querySeconds']:.1f}s of query time)", file=sys.stderr)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(result, f, indent=2)
+            print(f"Results saved to: {args.output}", file=sys.stderr)
+        else:
+            print(json.dumps(result, indent=2))
+        sys.exit(1 if summary["failed"] else 0)
 
     # Execute query
+    model = models[0]
     print(f"Executing DAX query...", file=sys.stderr)
-    results = execute_dax_query(workspace_id, model_id, args.query, args.include_nulls)
+
+    if args.paginate:
+        # The first response is capped, so holding it is bounded; pages stream after it
+        include_nulls = args.include_nulls or args.format in ("csv", *COLUMNAR_FORMATS)
+        results = execute_dax_query(model["workspaceId"], model["datasetId"], args.query, include_nulls)
+        msg = query_error(results)
+        if msg:
+            print(f"\nDAX Error: {msg}", file=sys.stderr)
+            sys.exit(1)
+        rows = result_rows(results)
+        try:
+            if is_truncated(rows):
+                print(f"Result truncated at {len(rows)} rows; paging...", file=sys.stderr)
+                rows = iter_paged_rows(model["workspaceId"], model["datasetId"], args.query,
+                                       result_columns(rows), include_nulls, args.page_key,
+                                       max(1, args.concurrency))
+            if args.format in STREAM_FORMATS:
+                count = write_output(rows, args.format, Path(args.output) if args.output else None)
+                if args.output:
+                    print(f"\n{count} row(s) saved to: {args.output}", file=sys.stderr)
+                return
+            results = {"status_code": 200, "text": {"results": [{"tables": [{"rows": list(rows)}]}]}}
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"\nError: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    elif cache:
+        include_nulls = args.include_nulls or args.format in ("csv", *COLUMNAR_FORMATS)
+        results, cached = execute_dax_query_cached(model["workspaceId"], model["datasetId"], args.query,
+                                                   include_nulls, cache)
+        if cached:
+            print("Served from the result cache", file=sys.stderr)
+        if args.format in STREAM_FORMATS and not query_error(results):
+            try:
+                count = write_output(result_rows(results), args.format, Path(args.output) if args.output else None)
+            except (OSError, ValueError, RuntimeError) as e:
+                print(f"\nError: {e}", file=sys.stderr)
+                sys.exit(1)
+            if args.output:
+                print(f"\n{count} row(s) saved to: {args.output}", file=sys.stderr)
+            return
+
+    elif args.format in STREAM_FORMATS:
+        output = Path(args.output) if args.output else None
+        try:
+            count, results = export_dax_query(model["workspaceId"], model["datasetId"], args.query,
+                                              args.format, output, args.include_nulls)
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"\nError: {e}", file=sys.stderr)
+            sys.exit(1)
+        msg = query_error(results)
+        if msg:
+            print(f"\nDAX Error: {msg}", file=sys.stderr)
+            sys.exit(1)
+        if output:
+            print(f"\n{count} row(s) saved to: {output}", file=sys.stderr)
+        return
+
+    else:
+        results = execute_dax_query(model["workspaceId"], model["datasetId"], args.query, args.include_nulls)
 
     # Check for API errors
-    data = results.get("text", results)
-    if "error" in data or results.get("status_code", 200) >= 400:
-        err = data.get("error", {})
-        pbi_err = err.get("pbi.error", err)
-        details = pbi_err.get("details", [])
-        msg = err.get("message", "Unknown error")
-        for d in details:
-            if d.get("code") == "DetailsMessage":
-                msg = d.get("detail", {}).get("value", msg)
-                break
+    msg = query_error(results)
+    if msg:
         print(f"\nDAX Error: {msg}", file=sys.stderr)
         if args.format == "json":
             print(json.dumps(results, indent=2))
@@ -281,8 +1498,6 @@ DAX Requirements:
     # Format results
     if args.format == "json":
         formatted_output = json.dumps(results, indent=2)
-    elif args.format == "csv":
-        formatted_output = format_results_as_csv(results)
     else:
         formatted_output = format_results_as_table(results)
 
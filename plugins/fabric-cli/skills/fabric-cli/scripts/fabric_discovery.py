@@ -0,0 +1,255 @@
+"""
+Structured workspace discovery over the Fabric REST API.
+
+Replaces parsing the text output of `fab ls` (one CLI process per listing,
+fragile with dots and spaces in names) with direct, paginated JSON calls on
+the pooled session from http_session.py and a cached token from
+token_broker.py. A workspace with thousands of items lists in a few requests.
+
+Definitions are fetched with getDefinition, and the resulting long-running
+operations (LROs) are polled at a short interval instead of the 20s
+Retry-After the service advertises. Callers that fetch many definitions run
+get_definition() on their own worker pool (see download_workspace.py).
+
+Usage:
+    from fabric_discovery import get_definition, list_items, resolve_workspace_id
+
+    workspace_id = resolve_workspace_id("Sales")
+    items = list_items(workspace_id)
+    parts = get_definition(workspace_id, items[0])
+"""
+
+import base64
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import quote
+
+from http_session import CONNECTION_ERRORS, TIMEOUT_ERRORS, get_session
+from token_broker import FABRIC_RESOURCE, get_access_token
+
+
+#region Configuration
+
+FABRIC_API = "https://api.fabric.microsoft.com/v1"
+
+REQUEST_TIMEOUT = 30
+MAX_RETRIES = 4
+
+# getDefinition LROs usually finish in about a second; poll well inside the
+# advertised Retry-After, and give up after LRO_TIMEOUT
+LRO_POLL_INTERVAL = 0.5
+LRO_TIMEOUT = 300
+
+# Definition formats matching what `fab export` writes by default
+DEFINITION_FORMATS = {"Notebook": "ipynb"}
+
+#endregion
+
+
+class DiscoveryError(Exception):
+    """Raised when a REST call fails; the message is safe to print."""
+
+
+#region REST Client
+
+
+def fabric_request(method: str, url: str, body: Optional[dict] = None):
+    """
+    Call the Fabric REST API with retries.
+
+    Refreshes the token once on 401 and backs off on 429/5xx, timeouts and
+    connection errors, honouring Retry-After.
+
+    Args:
+        method: HTTP method
+        url: Absolute URL or path relative to FABRIC_API
+        body: JSON body
+
+    Returns:
+        Response with a status below 400
+
+    Raises:
+        DiscoveryError: on any other status or when retries are exhausted,
+            including when the API cannot be reached
+        TokenError: when no token can be obtained (see token_broker.py)
+    """
+    if not url.startswith("https://"):
+        url = f"{FABRIC_API}/{url.lstrip('/')}"
+    force_refresh = False
+    for attempt in range(MAX_RETRIES + 1):
+        headers = {"Authorization": f"Bearer {get_access_token(FABRIC_RESOURCE, force_refresh)}"}
+        try:
+            response = get_session().request(method, url, headers=headers, json=body, timeout=REQUEST_TIMEOUT)
+        except (*TIMEOUT_ERRORS, *CONNECTION_ERRORS) as e:
+            if attempt < MAX_RETRIES:
+                time.sleep(2 ** attempt)
+                continue
+            if isinstance(e, TIMEOUT_ERRORS):
+                raise DiscoveryError(f"{method} {url} timed out")
+            raise DiscoveryError(f"{method} {url} could not connect: {e}")
+        if response.status_code < 400:
+            return response
+        if response.status_code == 401 and not force_refresh:
+            force_refresh = True
+            continue
+        if response.status_code in (429, 500, 502, 503, 504) and attempt < MAX_RETRIES:
+            retry_after = response.headers.get("Retry-After", "")
+            time.sleep(min(int(retry_after) if retry_after.isdigit() else 2 ** attempt, 60))
+            continue
+        raise DiscoveryError(f"HTTP {response.status_code} on {method} {url}: {response.text[:300]}")
+    raise DiscoveryError(f"{method} {url} failed after {MAX_RETRIES} retries")
+
+
+def list_paged(path: str) -> Iterator[dict]:
+    """
+    Yield every entry of a paginated list endpoint, following continuationUri/continuationToken.
+
+    Raises:
+        DiscoveryError: if a request fails or a page is not JSON
+    """
+    url = path
+    while url:
+        try:
+            body = fabric_request("GET", url).json()
+        except ValueError:
+            raise DiscoveryError(f"GET {url} returned a response that is not JSON")
+        yield from body.get("value") or body.get("data") or []
+        if body.get("continuationUri"):
+            url = body["continuationUri"]
+        elif body.get("continuationToken"):
+            separator = "&" if "?" in path else "?"
+            url = f"{path}{separator}continuationToken={quote(body['continuationToken'])}"
+        else:
+            url = None
+
+
+#endregion
+
+
+#region Discovery
+
+
+def resolve_workspace_id(workspace_name: str) -> str:
+    """
+    Look up a workspace ID by display name (case-insensitive).
+
+    Raises:
+        DiscoveryError: if no accessible workspace has that name
+    """
+    for workspace in list_paged("workspaces"):
+        if workspace["displayName"].lower() == workspace_name.lower():
+            return workspace["id"]
+    raise DiscoveryError(f"Workspace not found: {workspace_name}")
+
+
+def list_items(workspace_id: str) -> List[Dict]:
+    """
+    List all items in a workspace.
+
+    Returns:
+        List of {"displayName", "type", "id"} dicts
+    """
+    return [
+        {"displayName": item["displayName"], "type": item["type"], "id": item["id"]}
+        for item in list_paged(f"workspaces/{workspace_id}/items")
+    ]
+
+
+def list_tables(workspace_id: str, lakehouse_id: str) -> List[str]:
+    """
+    List the table names in a lakehouse.
+
+    Raises:
+        DiscoveryError: for lakehouses with schemas enabled, which this API
+            does not support; callers fall back to another listing
+    """
+    return [
+        table["name"]
+        for table in list_paged(f"workspaces/{workspace_id}/lakehouses/{lakehouse_id}/tables?maxResults=100")
+    ]
+
+
+#endregion
+
+
+#region Definitions
+
+
+def wait_for_operation(response, poll_interval: float = LRO_POLL_INTERVAL, result: bool = True):
+    """
+    Drive a long-running operation to completion.
+
+    Responses other than 202 are returned unchanged. For a 202 the operation
+    state at its Location is polled every poll_interval seconds (not the
+    advertised Retry-After) until it succeeds.
+
+    Args:
+        response: Response to the request that may have started the operation
+        poll_interval: Seconds between status polls
+        result: Fetch the operation's result; pass False for operations
+            without one (updateDefinition)
+
+    Returns:
+        The original response, the operation's result response, or None when
+        result is False
+
+    Raises:
+        DiscoveryError: if the operation fails, is cancelled or times out
+    """
+    if response.status_code != 202:
+        return response
+    location = response.headers.get("Location")
+    if not location:
+        raise DiscoveryError("202 Accepted without a Location header")
+    deadline = time.monotonic() + LRO_TIMEOUT
+    while True:
+        time.sleep(poll_interval)
+        state = fabric_request("GET", location).json()
+        status = state.get("status")
+        if status == "Succeeded":
+            break
+        if status in ("Failed", "Cancelled"):
+            error = state.get("error") or {}
+            raise DiscoveryError(f"Operation {status}: {error.get('message', error)}")
+        if time.monotonic() >= deadline:
+            raise DiscoveryError(f"Operation did not finish within {LRO_TIMEOUT}s")
+    return fabric_request("GET", f"{location.rstrip('/')}/result") if result else None
+
+
+def get_definition(workspace_id: str, item: dict, poll_interval: float = LRO_POLL_INTERVAL) -> List[Dict]:
+    """
+    Fetch one item's definition, driving the getDefinition LRO if one is started.
+
+    Args:
+        workspace_id: Workspace GUID
+        item: Item dict with "id" and "type"
+        poll_interval: Seconds between LRO status polls
+
+    Returns:
+        Definition parts: [{"path", "payload", "payloadType"}]
+
+    Raises:
+        DiscoveryError: if the item has no retrievable definition or the LRO fails
+    """
+    url = f"workspaces/{workspace_id}/items/{item['id']}/getDefinition"
+    definition_format = DEFINITION_FORMATS.get(item["type"])
+    if definition_format:
+        url = f"{url}?format={definition_format}"
+
+    response = wait_for_operation(fabric_request("POST", url), poll_interval)
+    return response.json().get("definition", {}).get("parts", [])
+
+
+def write_definition(parts: List[Dict], target_dir: Path):
+    """Write definition parts under target_dir, decoding base64 payloads."""
+    for part in parts:
+        target = target_dir / part["path"]
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if part.get("payloadType", "InlineBase64") == "InlineBase64":
+            target.write_bytes(base64.b64decode(part["payload"]))
+        else:
+            target.write_text(part["payload"], encoding="utf-8")
+
+
+#endregion
@@ -0,0 +1,125 @@
+"""
+Shared pooled HTTP client for scripts that call REST APIs directly.
+
+One-shot `requests.get/post` calls open a new TCP + TLS connection per request.
+get_session() instead returns a requests.Session whose connections are kept
+alive and pooled per host, so repeated calls to the same API reuse a warm
+connection. Responses are negotiated with gzip/deflate and decoded transparently.
+
+Thread safety:
+    Worker threads each get their own Session (requests does not guarantee a
+    Session is safe to share), but every Session mounts the same HTTPAdapter,
+    so all threads draw from one connection pool per host. Size the pool to at
+    least the number of worker threads (pool_size) or extra connections are
+    opened and discarded. Asking for a larger pool_size than any earlier call
+    replaces the shared pool; each thread's Session switches to it on its next
+    get_session() call.
+
+HTTP/2:
+    Optional. With FABRIC_HTTP2=1 and `httpx[http2]` installed, get_session()
+    returns a shared httpx.Client with HTTP/2 enabled instead; its get/post
+    signatures and response attributes (status_code, json(), text, headers)
+    match what these scripts use. Catch TIMEOUT_ERRORS and CONNECTION_ERRORS
+    rather than requests' own exception types so both clients are handled.
+
+Usage:
+    from http_session import TIMEOUT_ERRORS, get_session
+
+    resp = get_session().get(url, headers=headers, timeout=30)
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import h2  # noqa: F401  (required by httpx for HTTP/2)
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+#region Configuration
+
+# Connections kept per host; match or exceed the caller's worker count
+DEFAULT_POOL_SIZE = 32
+
+# Distinct hosts with a cached pool (Power BI, Fabric, WABI clusters, OneLake)
+MAX_HOST_POOLS = 16
+
+HTTP2_ENABLED = os.environ.get("FABRIC_HTTP2") == "1" and HTTPX_AVAILABLE
+
+TIMEOUT_ERRORS = (requests.exceptions.Timeout,) + ((httpx.TimeoutException,) if HTTPX_AVAILABLE else ())
+
+# DNS failures, refused or reset connections and proxy errors
+CONNECTION_ERRORS = (requests.exceptions.ConnectionError,) + ((httpx.TransportError,) if HTTPX_AVAILABLE else ())
+
+_lock = threading.Lock()
+_local = threading.local()
+_adapter = None
+_adapter_size = 0
+_http2_client = None
+_http2_size = 0
+
+#endregion
+
+
+#region Session Factory
+
+
+def _shared_adapter(pool_size: int) -> HTTPAdapter:
+    global _adapter, _adapter_size
+    with _lock:
+        # Grow, never shrink; requests in flight finish on the old pool
+        if _adapter is None or pool_size > _adapter_size:
+            _adapter = HTTPAdapter(pool_connections=MAX_HOST_POOLS, pool_maxsize=pool_size)
+            _adapter_size = pool_size
+        return _adapter
+
+
+def _shared_http2_client(pool_size: int):
+    global _http2_client, _http2_size
+    with _lock:
+        if _http2_client is None or pool_size > _http2_size:
+            _http2_size = pool_size
+            _http2_client = httpx.Client(
+                http2=True,
+                # requests follows redirects by default; match it
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                headers={"Accept-Encoding": "gzip, deflate"},
+            )
+        return _http2_client
+
+
+def get_session(pool_size: int = DEFAULT_POOL_SIZE):
+    """
+    Return the calling thread's pooled HTTP session.
+
+    Args:
+        pool_size: Connections kept per host; a value above every earlier one
+            replaces the shared pool with a larger one
+
+    Returns:
+        requests.Session sharing the process-wide connection pool, or a shared
+        httpx.Client when HTTP/2 is enabled (FABRIC_HTTP2=1)
+    """
+    if HTTP2_ENABLED:
+        return _shared_http2_client(pool_size)
+
+    adapter = _shared_adapter(pool_size)
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = "gzip, deflate"
+        _local.session = session
+    if session.get_adapter("https://") is not adapter:
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    return session
+
+
+#endregion
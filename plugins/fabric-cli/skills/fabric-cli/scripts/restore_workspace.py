@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Restore (or promote) a download_workspace.py output tree into a Fabric workspace.
+
+Reads every <Type>/<Name>.<Type>/ folder, builds a dependency DAG and deploys
+it level by level: data stores (lakehouses, warehouses) first, then semantic
+models, then reports, then notebooks and pipelines. Items within a level are
+deployed concurrently, each create or updateDefinition LRO polled at a short
+interval (like deploy_notebook.py) instead of the advertised 20s Retry-After.
+
+Dependencies:
+    Beyond the type order, an item depends on every other item in the tree
+    whose ID (from backup_manifest.json) appears in its definition, and a
+    report depends on the model named by a byPath reference. As each level
+    finishes, source IDs are mapped to the IDs in the target workspace and
+    rewritten in later definitions, so reports bind to the restored models
+    (byPath references become byConnection) and notebooks to the restored
+    lakehouses. Items whose dependency failed are skipped.
+
+SQL endpoints:
+    Direct Lake and SQL models reach a lakehouse through its SQL analytics
+    endpoint, Sql.Database("<host>", "<endpoint id>"), and a warehouse through
+    its own ID. Endpoints are created by the service, so once a lakehouse or
+    warehouse is deployed its target endpoint is looked up (waiting for it to
+    be provisioned) and both host and ID are rewritten in later models. The
+    source endpoint of each lakehouse comes from backup_manifest.json or, when
+    the source workspace is still reachable, from its lakehouse listing.
+    References that cannot be remapped are reported as warnings.
+
+Usage:
+    python3 restore_workspace.py ./workspace_downloads/Sales "Sales-Test.Workspace"
+    python3 restore_workspace.py ./backup "Sales-Test.Workspace" --dry-run
+    python3 restore_workspace.py ./backup "Sales-Test.Workspace" --jobs 16 --lakehouse-files
+
+Existing items (same name and type) are updated in place; others are created.
+The target workspace must exist.
+
+Requirements:
+    - requests (REST calls via fabric_discovery.py)
+    - az CLI authenticated (tokens via token_broker.py)
+    - fab CLI, azure-storage-file-datalake, azure-identity for --lakehouse-files
+"""
+
+import argparse
+import base64
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from fabric_discovery import (
+    DiscoveryError, fabric_request, list_items, list_paged, resolve_workspace_id, wait_for_operation
+)
+from token_broker import TokenError
+
+
+#region Configuration
+
+DEFAULT_JOBS = 8
+
+# Same default as deploy_notebook.py; the service finishes most LROs in ~1s
+DEFAULT_POLL_INTERVAL = 0.3
+
+# Minimum DAG level per item type; unknown types deploy with notebooks
+TYPE_LEVELS = {
+    "Lakehouse": 0,
+    "Warehouse": 0,
+    "Eventhouse": 0,
+    "Environment": 0,
+    "KQLDatabase": 1,
+    "SemanticModel": 1,
+    "Report": 2,
+    "Notebook": 3,
+    "SparkJobDefinition": 3,
+    "DataPipeline": 4,
+}
+DEFAULT_LEVEL = 3
+
+# Created by the service alongside their parent item, or not definition-based
+SKIPPED_TYPES = {"SQLEndpoint", "Dashboard"}
+
+# download_workspace.py stores lakehouse data inside the lakehouse folder
+LAKEHOUSE_DATA_DIRS = {"Files", "Tables"}
+
+GUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+# Sql.Database("<host>", "<database id>") in TMDL, or with escaped quotes in model.bim
+SQL_DATABASE = re.compile(
+    r'(Sql\.Database\(\s*\\?")([^"\\]*)(\\?"\s*,\s*\\?")(' + GUID.pattern + r')(\\?")'
+)
+
+# Seconds to wait for a new lakehouse's SQL endpoint to be provisioned
+SQL_ENDPOINT_TIMEOUT = 120
+
+#endregion
+
+
+#region Source Tree
+
+
+def load_tree(source: Path) -> tuple:
+    """
+    Read item folders and their definition parts from a download tree.
+
+    Args:
+        source: download_workspace.py output directory
+
+    Returns:
+        (items, source_workspace_id): items are dicts with name, type, key
+        ("Name.Type"), sourceId (None without backup_manifest.json),
+        endpointIds (a lakehouse's source SQL endpoint IDs) and parts
+        (relative path -> bytes)
+    """
+    manifest = {}
+    manifest_file = source / "backup_manifest.json"
+    if manifest_file.exists():
+        manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+    source_ids = {
+        (entry["type"], entry["displayName"]): item_id
+        for item_id, entry in manifest.get("items", {}).items()
+        if not entry.get("deletedAt")
+    }
+    # A lakehouse's SQL endpoint shares its name
+    endpoint_ids = {name: item_id for (item_type, name), item_id in source_ids.items() if item_type == "SQLEndpoint"}
+
+    items = []
+    for type_dir in sorted(p for p in source.iterdir() if p.is_dir() and not p.name.startswith(".")):
+        item_type = type_dir.name
+        if item_type in SKIPPED_TYPES:
+            continue
+        for item_dir in sorted(type_dir.glob(f"*.{item_type}")):
+            name = item_dir.name[:-len(item_type) - 1]
+            parts = {}
+            for file in sorted(item_dir.rglob("*")):
+                relative = file.relative_to(item_dir)
+                if not file.is_file() or file.name.endswith((".tmp", ".part")):
+                    continue
+                if item_type == "Lakehouse" and relative.parts[0] in LAKEHOUSE_DATA_DIRS:
+                    continue
+                parts[relative.as_posix()] = file.read_bytes()
+            if parts:
+                items.append({
+                    "name": name,
+                    "type": item_type,
+                    "key": f"{name}.{item_type}",
+                    "dir": item_dir,
+                    "sourceId": source_ids.get((item_type, name)),
+                    "endpointIds": [endpoint_ids[name]] if item_type == "Lakehouse" and name in endpoint_ids else [],
+                    "parts": parts,
+                })
+    return items, manifest.get("workspaceId")
+
+
+def text_parts(item: dict):
+    """Yield (path, text) for the parts that decode as UTF-8."""
+    for path, data in item["parts"].items():
+        try:
+            yield path, data.decode("utf-8")
+        except UnicodeDecodeError:
+            continue
+
+
+def sql_sources(item: dict) -> set:
+    """(host, database ID) pairs of every Sql.Database source in the item's definition."""
+    return {(match.group(2), match.group(4).lower()) for _, text in text_parts(item)
+            for match in SQL_DATABASE.finditer(text)}
+
+
+def find_source_endpoints(source_workspace_id: str, items: list):
+    """
+    Add source SQL endpoint IDs to lakehouses from the source workspace's listing.
+
+    Best effort: the source workspace may be gone or out of reach, in which
+    case only the IDs recorded in backup_manifest.json are known.
+    """
+    lakehouses = {item["name"]: item for item in items if item["type"] == "Lakehouse"}
+    try:
+        for lakehouse in list_paged(f"workspaces/{source_workspace_id}/lakehouses"):
+            endpoint = ((lakehouse.get("properties") or {}).get("sqlEndpointProperties") or {}).get("id")
+            item = lakehouses.get(lakehouse.get("displayName"))
+            if endpoint and item and endpoint not in item["endpointIds"]:
+                item["endpointIds"].append(endpoint)
+    except (DiscoveryError, TokenError, OSError) as e:
+        print(f"Source workspace not readable ({e}); SQL endpoints known only from the manifest")
+
+
+def build_levels(items: list) -> list:
+    """
+    Group items into dependency levels; every item's dependencies are in earlier levels.
+
+    Sets item["dependsOn"] to the keys of the items it references.
+
+    Raises:
+        ValueError: if the references form a cycle
+    """
+    by_source_id = {item["sourceId"].lower(): item for item in items if item["sourceId"]}
+    by_source_id.update({endpoint.lower(): item for item in items for endpoint in item["endpointIds"]})
+    by_key = {item["key"]: item for item in items}
+
+    for item in items:
+        depends_on = set()
+        for path, text in text_parts(item):
+            for guid in set(GUID.findall(text)):
+                target = by_source_id.get(guid.lower())
+                if target and target is not item:
+                    depends_on.add(target["key"])
+            if item["type"] == "Report" and path == "definition.pbir":
+                by_path = json.loads(text).get("datasetReference", {}).get("byPath") or {}
+                model_key = by_path.get("path", "").replace("\\", "/").rsplit("/", 1)[-1]
+                if model_key in by_key:
+                    depends_on.add(model_key)
+        item["dependsOn"] = sorted(depends_on)
+
+    level_of = {}
+
+    def level(item, visiting=()):
+        if item["key"] in level_of:
+            return level_of[item["key"]]
+        if item["key"] in visiting:
+            raise ValueError(f"dependency cycle: {' -> '.join(visiting + (item['key'],))}")
+        value = TYPE_LEVELS.get(item["type"], DEFAULT_LEVEL)
+        for key in item["dependsOn"]:
+            value = max(value, level(by_key[key], visiting + (item["key"],)) + 1)
+        level_of[item["key"]] = value
+        return value
+
+    for item in items:
+        level(item)
+    return [
+        [item for item in items if level_of[item["key"]] == value]
+        for value in sorted(set(level_of.values()))
+    ]
+
+
+#endregion
+
+
+#region Deployment
+
+
+def rewrite_parts(item: dict, id_map: dict, target_ids: dict, target_workspace: str,
+                  sql_map: dict = None) -> dict:
+    """
+    Return the item's parts with source IDs replaced by target IDs.
+
+    Args:
+        item: Item from load_tree()
+        id_map: Source GUID (lowercase) -> target GUID, including the workspace
+        target_ids: Item key -> target GUID for items already deployed
+        target_workspace: Target workspace name, for report connection strings
+        sql_map: Source SQL database ID (lowercase) -> (target host, target ID)
+
+    Returns:
+        Relative path -> bytes
+    """
+    def replace(match):
+        return id_map.get(match.group(0).lower(), match.group(0))
+
+    def replace_sql(match):
+        target = sql_map.get(match.group(4).lower())
+        if not target:
+            return match.group(0)
+        return f"{match.group(1)}{target[0]}{match.group(3)}{target[1]}{match.group(5)}"
+
+    parts = dict(item["parts"])
+    for path, text in text_parts(item):
+        # Host and ID together first; the ID alone is not enough for a new endpoint
+        text = SQL_DATABASE.sub(replace_sql, text) if sql_map else text
+        text = GUID.sub(replace, text) if id_map else text
+
+        # Reports created over the API must reference their model byConnection
+        if item["type"] == "Report" and path == "definition.pbir":
+            pbir = json.loads(text)
+            reference = pbir.get("datasetReference", {})
+            model_key = (reference.get("byPath") or {}).get("path", "").replace("\\", "/").rsplit("/", 1)[-1]
+            if model_key in target_ids:
+                model_name = model_key.rsplit(".", 1)[0]
+                pbir["datasetReference"] = {"byConnection": {"connectionString": (
+                    f"Data Source=powerbi://api.powerbi.com/v1.0/myorg/{target_workspace};"
+                    f"Initial Catalog={model_name};Integrated Security=ClaimsToken;"
+                    f"semanticmodelid={target_ids[model_key]}"
+                )}}
+                text = json.dumps(pbir, indent=2)
+
+        parts[path] = text.encode("utf-8")
+    return parts
+
+
+def deploy_item(workspace_id: str, item: dict, parts: dict, existing_id: str = None,
+                poll_interval: float = DEFAULT_POLL_INTERVAL) -> str:
+    """
+    Create the item, or update its definition if it already exists.
+
+    Args:
+        workspace_id: Target workspace GUID
+        item: Item from load_tree()
+        parts: Definition parts to send (relative path -> bytes)
+        existing_id: GUID of the same-named item in the target, if any
+        poll_interval: Seconds between LRO status polls
+
+    Returns:
+        Target item GUID
+    """
+    definition = {"parts": [
+        {"path": path, "payload": base64.b64encode(data).decode("ascii"), "payloadType": "InlineBase64"}
+        for path, data in parts.items()
+    ]}
+    if any(path.endswith(".ipynb") for path in parts):
+        definition["format"] = "ipynb"
+
+    if existing_id:
+        url = f"workspaces/{workspace_id}/items/{existing_id}/updateDefinition"
+        if ".platform" in parts:
+            url += "?updateMetadata=True"
+        wait_for_operation(fabric_request("POST", url, {"definition": definition}), poll_interval, result=False)
+        return existing_id
+
+    body = {"displayName": item["name"], "type": item["type"], "definition": definition}
+    response = wait_for_operation(fabric_request("POST", f"workspaces/{workspace_id}/items", body), poll_interval)
+    return response.json()["id"]
+
+
+def target_endpoint(workspace_id: str, item: dict, item_id: str,
+                    poll_interval: float = DEFAULT_POLL_INTERVAL) -> tuple:
+    """
+    Look up the SQL endpoint of a deployed lakehouse or warehouse.
+
+    A new lakehouse's endpoint is provisioned asynchronously, so it is polled
+    for up to SQL_ENDPOINT_TIMEOUT seconds.
+
+    Returns:
+        (host, database ID), or None if it could not be found
+    """
+    kind = "lakehouses" if item["type"] == "Lakehouse" else "warehouses"
+    deadline = time.monotonic() + SQL_ENDPOINT_TIMEOUT
+    interval = max(poll_interval, 1.0)
+    while True:
+        try:
+            properties = fabric_request("GET", f"workspaces/{workspace_id}/{kind}/{item_id}").json().get("properties") or {}
+        except (DiscoveryError, TokenError, OSError, ValueError):
+            return None
+        if item["type"] == "Warehouse":
+            return (properties["connectionString"], item_id) if properties.get("connectionString") else None
+        endpoint = properties.get("sqlEndpointProperties") or {}
+        if endpoint.get("id") and endpoint.get("connectionString"):
+            return endpoint["connectionString"], endpoint["id"]
+        if time.monotonic() + interval > deadline:
+            return None
+        time.sleep(interval)
+        interval = min(interval * 2, 10)
+
+
+def upload_files(item: dict, target: str, jobs: int) -> bool:
+    """Upload a restored lakehouse's Files folder (see upload_lakehouse_files.py)."""
+    files_dir = item["dir"] / "Files"
+    if not files_dir.is_dir() or not any(files_dir.iterdir()):
+        return True
+    from upload_lakehouse_files import AZURE_AVAILABLE, upload_lakehouse_files
+    if not AZURE_AVAILABLE:
+        print(f"  Skipping files for {item['key']} (azure-storage-file-datalake not installed)")
+        return False
+    return upload_lakehouse_files(files_dir, f"{target}/{item['key']}", jobs=jobs) == 0
+
+
+def restore_workspace(source: Path, target: str, jobs: int = DEFAULT_JOBS,
+                      poll_interval: float = DEFAULT_POLL_INTERVAL, dry_run: bool = False,
+                      lakehouse_files: bool = False) -> int:
+    """
+    Deploy a download tree into a workspace, one dependency level at a time.
+
+    Args:
+        source: download_workspace.py output directory
+        target: Target workspace path (e.g., "Sales-Test.Workspace")
+        jobs: Concurrent deployments within a level
+        poll_interval: Seconds between LRO status polls
+        dry_run: Print the deployment plan without calling the API
+        lakehouse_files: Also upload each lakehouse's Files folder
+
+    Returns:
+        Number of items that failed or were skipped
+    """
+    items, source_workspace_id = load_tree(source)
+    if not items:
+        print(f"No item folders found in {source}")
+        return 0
+    if source_workspace_id and not dry_run:
+        find_source_endpoints(source_workspace_id, items)
+    levels = build_levels(items)
+
+    print(f"Restoring {len(items)} items from {source} to {target} in {len(levels)} levels:")
+    for n, level in enumerate(levels, 1):
+        print(f"  Level {n}: " + ", ".join(item["key"] for item in level))
+    print()
+    if dry_run:
+        for item in items:
+            if item["dependsOn"]:
+                print(f"  {item['key']} <- {', '.join(item['dependsOn'])}")
+        return 0
+
+    target_name = target.removesuffix(".Workspace")
+    workspace_id = resolve_workspace_id(target_name)
+    existing = {f"{i['displayName']}.{i['type']}": i["id"] for i in list_items(workspace_id)}
+
+    id_map = {source_workspace_id.lower(): workspace_id} if source_workspace_id else {}
+    sql_map = {}
+    target_ids = {}
+    failed = []
+    skipped = []
+    unmapped = []
+    start = time.time()
+
+    for n, level in enumerate(levels, 1):
+        ready = []
+        for item in level:
+            blocked = [key for key in item["dependsOn"] if key not in target_ids]
+            if blocked:
+                skipped.append(item["key"])
+                print(f"  Skipped: {item['key']} (dependency failed: {', '.join(blocked)})")
+            else:
+                ready.append(item)
+
+        print(f"Level {n}/{len(levels)}: deploying {len(ready)} items...")
+        level_start = time.time()
+
+        for item in ready:
+            for host, database in sorted(sql_sources(item)):
+                if database not in sql_map:
+                    unmapped.append(item["key"])
+                    print(f"  Warning: {item['key']} keeps SQL source {host} / {database}; rebind it after the restore")
+
+        def deploy(item):
+            parts = rewrite_parts(item, id_map, target_ids, target_name, sql_map)
+            new_id = deploy_item(workspace_id, item, parts, existing.get(item["key"]), poll_interval)
+            endpoint = None
+            if item["endpointIds"] or (item["type"] == "Warehouse" and item["sourceId"]):
+                endpoint = target_endpoint(workspace_id, item, new_id, poll_interval)
+            return new_id, endpoint
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = [(item, pool.submit(deploy, item)) for item in ready]
+            for item, future in futures:
+                try:
+                    new_id, endpoint = future.result()
+                except (DiscoveryError, TokenError, KeyError, ValueError, OSError) as e:
+                    failed.append(item["key"])
+                    print(f"  Failed: {item['key']}: {e}")
+                    continue
+                action = "Updated" if item["key"] in existing else "Created"
+                print(f"  {action}: {item['key']}")
+                target_ids[item["key"]] = new_id
+                if item["sourceId"]:
+                    id_map[item["sourceId"].lower()] = new_id
+                sources = item["endpointIds"] + ([item["sourceId"]] if item["type"] == "Warehouse" else [])
+                if endpoint:
+                    for source_endpoint in sources:
+                        sql_map[source_endpoint.lower()] = endpoint
+                        id_map[source_endpoint.lower()] = endpoint[1]
+                elif item["endpointIds"] or (item["type"] == "Warehouse" and item["sourceId"]):
+                    print(f"  Warning: SQL endpoint of {item['key']} not found; models using it keep the source one")
+
+        if lakehouse_files:
+            for item in ready:
+                if item["type"] == "Lakehouse" and item["key"] in target_ids:
+                    if not upload_files(item, target, jobs):
+                        failed.append(f"{item['key']}/Files")
+        print(f"  Level {n} done in {time.time() - level_start:.1f}s")
+        print()
+
+    print("=" * 60)
+    print("Restore Summary")
+    print("=" * 60)
+    print(f"Deployed: {len(target_ids)}")
+    print(f"Failed: {len(failed)}")
+    for key in failed:
+        print(f"  {key}")
+    if skipped:
+        print(f"Skipped (dependency failed): {len(skipped)}")
+    if unmapped:
+        print(f"SQL sources not remapped: {len(set(unmapped))}")
+        for key in sorted(set(unmapped)):
+            print(f"  {key}")
+    print(f"Elapsed: {time.time() - start:.1f}s with {jobs} jobs")
+
+    return len(failed) + len(skipped)
+
+
+#endregion
+
+
+#region Main
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Restore a download_workspace.py tree into a Fabric workspace in dependency order",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python3 restore_workspace.py ./workspace_downloads/Sales "Sales-Test.Workspace"
+    python3 restore_workspace.py ./backup "Sales-Test.Workspace" --dry-run
+    python3 restore_workspace.py ./backup "Sales-Test.Workspace" --jobs 16 --lakehouse-files
+        """
+    )
+
+    parser.add_argument("source", help="download_workspace.py output directory")
+    parser.add_argument("workspace", help="Target workspace path: Name.Workspace or just Name")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Concurrent deployments per level (default: {DEFAULT_JOBS})")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help=f"LRO poll interval in seconds (default: {DEFAULT_POLL_INTERVAL})")
+    parser.add_argument("--lakehouse-files", action="store_true",
+                        help="Also upload each lakehouse's Files folder")
+    parser.add_argument("--dry-run", action="store_true", help="Print the deployment plan and exit")
+
+    args = parser.parse_args()
+
+    source = Path(args.source)
+    if not source.is_dir():
+        parser.error(f"source is not a directory: {source}")
+    target = args.workspace if ".Workspace" in args.workspace else f"{args.workspace}.Workspace"
+
+    try:
+        problems = restore_workspace(source, target, jobs=max(1, args.jobs), poll_interval=args.poll_interval,
+                                     dry_run=args.dry_run, lakehouse_files=args.lakehouse_files)
+    except KeyboardInterrupt:
+        print("\n\nRestore interrupted by user")
+        sys.exit(1)
+    except (DiscoveryError, TokenError, ValueError) as e:
+        print(f"\nError: {e}")
+        sys.exit(1)
+
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
+
+
+#endregion
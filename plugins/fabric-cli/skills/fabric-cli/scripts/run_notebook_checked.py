@@ -50,9 +50,10 @@ import time
 import urllib.error
 import urllib.request
 
+from token_broker import FABRIC_RESOURCE, TokenError, get_access_token
+
 
 FABRIC_API = "https://api.fabric.microsoft.com/v1"
-FABRIC_RESOURCE = "https://api.fabric.microsoft.com"
 GUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
 TERMINAL = {"Completed", "Failed", "Cancelled", "Deduped"}
 
@@ -81,32 +82,13 @@ def get_id(path: str) -> str:
     return out
 
 
-def fabric_token() -> str:
-    """Get a Fabric-audience bearer token from the current az login. Never logged."""
+def current_token(force: bool = False) -> str:
+    """Return a Fabric token from the shared token broker; force=True fetches a new one (after a 401)."""
     try:
-        res = subprocess.run(
-            ["az", "account", "get-access-token", "--resource", FABRIC_RESOURCE],
-            capture_output=True, text=True, check=True,
-        )
-    except subprocess.CalledProcessError:
-        print("az could not get a token. Run 'az login' first.", file=sys.stderr)
-        sys.exit(1)
-    except FileNotFoundError:
-        print("Azure CLI (az) not found. Install it and run 'az login'.", file=sys.stderr)
+        return get_access_token(FABRIC_RESOURCE, force_refresh=force)
+    except TokenError as e:
+        print(str(e), file=sys.stderr)
         sys.exit(1)
-    return json.loads(res.stdout)["accessToken"]
-
-
-_TOKEN = {"value": None, "at": 0.0}
-
-
-def current_token(force: bool = False) -> str:
-    """Return a cached Fabric token, re-fetching after 40 min (well before ~60 min expiry)."""
-    now = time.monotonic()
-    if force or _TOKEN["value"] is None or now - _TOKEN["at"] > 2400:
-        _TOKEN["value"] = fabric_token()
-        _TOKEN["at"] = now
-    return _TOKEN["value"]
 
 
 def fabric_get(url: str, retries: int = 4) -> dict:
@@ -69,6 +69,25 @@ COMMON PATTERNS:
   # Sort by last visited (find stale items)
   python3 datahub_search.py --type Model --sort last-visited --sort-order asc
 
+  # Full inventory: one request returns at most 1000 items, so large tenants
+  # need --all-pages (pages are fetched concurrently, deduplicated by ID)
+  python3 datahub_search.py --type Model --all-pages --workers 8
+
+  # Large result sets: ndjson, csv and parquet are written as items are
+  # filtered (parquet needs pyarrow and --output-file; fixed column schema)
+  python3 datahub_search.py --type Model --all-pages --output ndjson > models.ndjson
+  python3 datahub_search.py --type Model --all-pages --output parquet --output-file models.parquet
+
+  # Multi-geo tenants: query every region concurrently, merged and deduplicated,
+  # with a per-region latency/status report on stderr
+  python3 datahub_search.py --type Model --all-regions
+
+  # Repeated queries: keep a local SQLite inventory per region and type.
+  # --cache refreshes it (incrementally) when older than --cache-max-age
+  # hours; --offline never calls the API; --refresh-cache forces a refresh.
+  python3 datahub_search.py --type Model --cache --not-visited-since 2024-06-01
+  python3 datahub_search.py --type Model --offline --storage-mode directlake
+
 DATE FILTERS:
   --visited-since / --not-visited-since    When user last opened item
   --refreshed-since / --not-refreshed-since When data was last refreshed (models)
@@ -92,15 +111,34 @@ Usage:
     python3 datahub_search.py --type Lakehouse --owner "data-team" --output json
     python3 datahub_search.py --list-types
     python3 datahub_search.py --list-regions
+    python3 datahub_search.py --benchmark 200000   # time the local filter engine
 """
 
 import argparse
+import csv
+import hashlib
 import json
-import subprocess
+import os
+import random
+import sqlite3
 import sys
-import requests
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from operator import attrgetter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Any
+
+from http_session import TIMEOUT_ERRORS, get_session
+from token_broker import POWERBI_RESOURCE, TokenError, get_access_token
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 
 #region Configuration
@@ -195,6 +233,27 @@ ITEM_TYPES = {
 
 DEFAULT_REGION = "west-europe"
 
+# DataHub rejects pageSize above this; --all-pages always requests full pages
+MAX_PAGE_SIZE = 1000
+
+# Concurrent page requests in --all-pages mode
+DEFAULT_PAGE_WORKERS = 4
+
+# Per-region deadline in --all-regions mode; slower regions are reported and skipped
+DEFAULT_REGION_TIMEOUT = 90
+
+# Timeout for a single DataHub request
+DEFAULT_REQUEST_TIMEOUT = 60
+
+# Local inventory store (--cache); override with --cache-path or DATAHUB_CACHE_PATH
+DEFAULT_CACHE_PATH = Path(
+    os.environ.get("DATAHUB_CACHE_PATH")
+    or Path.home() / ".cache" / "fabric-cli-scripts" / "datahub_inventory.sqlite"
+)
+
+# Cached inventories older than this are refreshed before querying
+DEFAULT_CACHE_MAX_AGE_HOURS = 24
+
 #endregion
 
 
@@ -202,7 +261,10 @@ DEFAULT_REGION = "west-europe"
 
 def get_fabric_token() -> Optional[str]:
     """
-    Get Fabric access token using Azure CLI.
+    Get Power BI access token through the shared token broker.
+
+    The broker reuses a cached token until shortly before expiry and only runs
+    `az account get-access-token` when needed (see token_broker.py).
 
     Returns:
         Access token string or None if failed
@@ -211,25 +273,9 @@ def get_fabric_token() -> Optional[str]:
         Azure CLI installed and logged in (az login)
     """
     try:
-        result = subprocess.run(
-            ["az", "account", "get-access-token", "--resource", "https://analysis.windows.net/powerbi/api"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return data.get("accessToken")
-
-        print("Error: Azure CLI not authenticated. Run 'az login' first.", file=sys.stderr)
-        return None
-
-    except subprocess.TimeoutExpired:
-        print("Error: Command timed out", file=sys.stderr)
-        return None
-    except FileNotFoundError:
-        print("Error: Azure CLI not installed. Install with 'brew install azure-cli'", file=sys.stderr)
+        return get_access_token(POWERBI_RESOURCE)
+    except TokenError as e:
+        print(f"Error: {e}", file=sys.stderr)
         return None
     except Exception as e:
         print(f"Error getting token: {e}", file=sys.stderr)
@@ -246,7 +292,8 @@ def search_datahub(
     region: str = DEFAULT_REGION,
     workspace_id: Optional[str] = None,
     page_size: int = 100,
-    page_number: int = 1
+    page_number: int = 1,
+    timeout: float = DEFAULT_REQUEST_TIMEOUT
 ) -> Dict[str, Any]:
     """
     Search DataHub V2 API for items across all workspaces.
@@ -258,6 +305,7 @@ def search_datahub(
         workspace_id: Optional workspace GUID to filter results
         page_size: Results per page, max 1000 (default: 100)
         page_number: Page to retrieve, 1-indexed (default: 1)
+        timeout: Request timeout in seconds (default: 60)
 
     Returns:
         Dict with keys:
@@ -294,7 +342,7 @@ def search_datahub(
         "orderBy": "Default",
         "orderDirection": "",
         "pageNumber": page_number,
-        "pageSize": min(page_size, 1000),
+        "pageSize": min(page_size, MAX_PAGE_SIZE),
         "supportedTypes": item_types,
         "tridentSupportedTypes": trident_types
     }
@@ -307,7 +355,7 @@ def search_datahub(
     url = f"https://{host}/metadata/datahub/V2/artifacts"
 
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
+        response = get_session().post(url, headers=headers, json=payload, timeout=timeout)
 
         if response.status_code == 200:
             items = response.json()
@@ -324,18 +372,495 @@ def search_datahub(
                 "error": f"HTTP {response.status_code}: {response.text[:200]}",
                 "region": region
             }
-    except requests.exceptions.Timeout:
-        return {"success": False, "error": "Request timed out (60s)", "region": region}
+    except TIMEOUT_ERRORS:
+        return {"success": False, "error": f"Request timed out ({timeout}s)", "region": region}
     except Exception as e:
         return {"success": False, "error": str(e), "region": region}
 
+
+def iter_datahub_pages(
+    token: str,
+    item_types: List[str],
+    region: str = DEFAULT_REGION,
+    workspace_id: Optional[str] = None,
+    page_size: int = MAX_PAGE_SIZE,
+    max_workers: int = DEFAULT_PAGE_WORKERS,
+    deadline: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Fetch every DataHub page for a search, yielding each page as it arrives.
+
+    The API does not return a total count, so the page count is discovered as
+    pages come back: page 1 is fetched first, and if it is full, pages 2..N are
+    requested concurrently over a bounded pool until a short page marks the end.
+    Pages are yielded in completion order, not page order. Items are
+    deduplicated across pages by artifactObjectId, since the listing can shift
+    while a tenant-wide scan is in flight.
+
+    Args:
+        token: Azure AD access token for Power BI API
+        item_types: List of item type names (e.g., ["Model", "PowerBIReport"])
+        region: Region key from REGIONS dict (default: west-europe)
+        workspace_id: Optional workspace GUID to filter results
+        page_size: Results per page, max 1000 (default: 1000)
+        max_workers: Maximum concurrent page requests (default: 4)
+        deadline: Optional time.monotonic() value by which the scan must end.
+            Each request's timeout is capped at the time remaining, and no page
+            is requested or awaited past it.
+
+    Yields:
+        search_datahub() result dicts with an added "page" key. A result with
+        success False ends the iteration; earlier pages have already been yielded.
+    """
+    page_size = min(page_size, MAX_PAGE_SIZE)
+    seen_ids = set()
+
+    def remaining() -> float:
+        if deadline is None:
+            return DEFAULT_REQUEST_TIMEOUT
+        return min(DEFAULT_REQUEST_TIMEOUT, deadline - time.monotonic())
+
+    def expired(page: int) -> Dict[str, Any]:
+        return {"success": False, "error": "deadline exceeded", "region": region, "page": page}
+
+    def dedupe(result: Dict[str, Any], page: int) -> Dict[str, Any]:
+        unique = []
+        for item in result["items"]:
+            key = item.get("artifactObjectId") or item.get("objectId")
+            if key:
+                if key in seen_ids:
+                    continue
+                seen_ids.add(key)
+            unique.append(item)
+        return {**result, "items": unique, "page": page}
+
+    if remaining() <= 0:
+        yield expired(1)
+        return
+    first = search_datahub(token, item_types, region, workspace_id, page_size, 1, timeout=remaining())
+    if not first["success"]:
+        yield {**first, "page": 1}
+        return
+    yield dedupe(first, 1)
+    if first["count"] < page_size:
+        return
+
+    next_page = 2
+    last_page = None  # First page that came back short; nothing exists past it
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {}
+
+        def fill():
+            nonlocal next_page
+            while len(pending) < max_workers and (last_page is None or next_page <= last_page):
+                timeout = remaining()
+                if timeout <= 0:
+                    return
+                future = pool.submit(search_datahub, token, item_types, region, workspace_id, page_size, next_page,
+                                     timeout=timeout)
+                pending[future] = next_page
+                next_page += 1
+
+        fill()
+        if not pending and remaining() <= 0:
+            yield expired(next_page)
+            return
+        while pending:
+            done, _ = wait(pending, timeout=None if deadline is None else max(0, deadline - time.monotonic()),
+                           return_when=FIRST_COMPLETED)
+            if not done:
+                for other in pending:
+                    other.cancel()
+                yield expired(min(pending.values()))
+                return
+            for future in done:
+                page = pending.pop(future)
+                result = future.result()
+                if not result["success"]:
+                    for other in pending:
+                        other.cancel()
+                    yield {**result, "page": page}
+                    return
+                if result["count"] < page_size and (last_page is None or page < last_page):
+                    last_page = page
+                yield dedupe(result, page)
+            fill()
+            if not pending and (last_page is None or next_page <= last_page):
+                yield expired(next_page)
+                return
+
+def search_all_regions(
+    token: str,
+    item_types: List[str],
+    workspace_id: Optional[str] = None,
+    page_size: int = 100,
+    all_pages: bool = False,
+    max_workers: int = DEFAULT_PAGE_WORKERS,
+    timeout: float = DEFAULT_REGION_TIMEOUT
+) -> Dict[str, Any]:
+    """
+    Search every host in REGIONS concurrently and merge the results.
+
+    Each region runs on its own daemon thread (with its own page pool when
+    all_pages is set), and every request is bounded by the time left before
+    the shared deadline. Regions that fail or miss the deadline are reported
+    and left out, so one slow cluster yields a partial result instead of a
+    hang; a straggling thread never delays the return or interpreter exit.
+    Items returned by more than one region are kept once, by artifactObjectId.
+
+    Args:
+        token: Azure AD access token for Power BI API
+        item_types: List of item type names (e.g., ["Model", "PowerBIReport"])
+        workspace_id: Optional workspace GUID to filter results
+        page_size: Results per page, max 1000 (default: 100)
+        all_pages: Fetch every page per region via iter_datahub_pages()
+        max_workers: Concurrent page requests per region with all_pages
+        timeout: Deadline in seconds for all regions (default: 90)
+
+    Returns:
+        Dict with keys:
+            success: bool (True if at least one region succeeded)
+            items: Merged, deduplicated item dicts
+            count: Number of items returned
+            regions: Dict of region -> {success, count, seconds, error}
+    """
+    deadline = time.monotonic() + timeout
+    results = {}
+
+    def fetch(region: str) -> None:
+        start = time.perf_counter()
+        if all_pages:
+            result = {"success": True, "items": []}
+            for page in iter_datahub_pages(token, item_types, region, workspace_id, page_size, max_workers,
+                                           deadline=deadline):
+                if not page["success"]:
+                    result = page
+                    break
+                result["items"].extend(page["items"])
+        else:
+            result = search_datahub(token, item_types, region, workspace_id, page_size, timeout=timeout)
+        result["seconds"] = time.perf_counter() - start
+        results[region] = result
+
+    threads = [threading.Thread(target=fetch, args=(region,), daemon=True) for region in REGIONS]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(max(0, deadline - time.monotonic()))
+    # Snapshot: a straggler finishing now must not change the merged result
+    finished = dict(results)
+
+    regions = {}
+    items = []
+    seen_ids = set()
+    for region in REGIONS:
+        result = finished.get(region)
+        if result is None:
+            regions[region] = {"success": False, "count": 0, "seconds": timeout,
+                               "error": f"timed out after {timeout}s"}
+            continue
+        if not result["success"]:
+            regions[region] = {"success": False, "count": 0, "seconds": result["seconds"],
+                               "error": result["error"]}
+            continue
+        regions[region] = {"success": True, "count": len(result["items"]), "seconds": result["seconds"],
+                           "error": None}
+        for item in result["items"]:
+            key = item.get("artifactObjectId") or item.get("objectId")
+            if key:
+                if key in seen_ids:
+                    continue
+                seen_ids.add(key)
+            items.append(item)
+
+    return {
+        "success": any(r["success"] for r in regions.values()),
+        "items": items,
+        "count": len(items),
+        "regions": regions,
+    }
+
+#endregion
+
+
+#region Inventory Cache
+
+def open_inventory(path: Path = DEFAULT_CACHE_PATH) -> sqlite3.Connection:
+    """
+    Open (and create if needed) the local DataHub inventory store.
+
+    One row per item, keyed by (region, item_type, object_id). The raw DataHub
+    payload is kept as JSON so apply_filters() and format_output() see exactly
+    what the API returned, and a SHA-256 of it (payload_hash) lets a refresh
+    tell which rows changed. Stores created before payload_hash existed gain
+    the column here; their rows are rewritten on the next refresh.
+
+    Args:
+        path: SQLite file path (default: ~/.cache/fabric-cli-scripts/datahub_inventory.sqlite)
+
+    Returns:
+        Open sqlite3 connection
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS items (
+            region TEXT NOT NULL,
+            item_type TEXT NOT NULL,
+            object_id TEXT NOT NULL,
+            workspace_id TEXT,
+            modified_date TEXT,
+            last_visited TEXT,
+            payload TEXT NOT NULL,
+            payload_hash TEXT,
+            PRIMARY KEY (region, item_type, object_id)
+        );
+        CREATE TABLE IF NOT EXISTS syncs (
+            region TEXT NOT NULL,
+            item_type TEXT NOT NULL,
+            synced_at REAL NOT NULL,
+            item_count INTEGER NOT NULL,
+            PRIMARY KEY (region, item_type)
+        );
+    """)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+    if "payload_hash" not in columns:
+        conn.execute("ALTER TABLE items ADD COLUMN payload_hash TEXT")
+    return conn
+
+
+def get_inventory_sync_time(conn: sqlite3.Connection, region: str, item_type: str) -> Optional[float]:
+    """Return the epoch time of the last complete sync for (region, item_type), or None."""
+    row = conn.execute(
+        "SELECT synced_at FROM syncs WHERE region = ? AND item_type = ?", (region, item_type)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def sync_inventory(
+    conn: sqlite3.Connection,
+    token: str,
+    region: str,
+    item_type: str,
+    max_workers: int = DEFAULT_PAGE_WORKERS
+) -> Dict[str, Any]:
+    """
+    Refresh the stored inventory for (region, item_type) from the DataHub API.
+
+    The API has no change feed, so every page is still listed, but only rows
+    whose payload differs from the stored one are rewritten, and items no
+    longer returned are deleted. The whole payload is compared because a data
+    refresh changes lastRefreshTime without touching modifiedDate, and owner,
+    capacity and workspace name can change on their own. The sync is applied in one transaction and
+    rolled back if any page fails, so a partial listing never replaces a good one.
+
+    Args:
+        conn: Connection from open_inventory()
+        token: Azure AD access token for Power BI API
+        region: Region key from REGIONS dict
+        item_type: Item type name (e.g., "Model")
+        max_workers: Maximum concurrent page requests
+
+    Returns:
+        Dict with keys:
+            success: bool
+            total: Items in the inventory after the sync
+            added, updated, unchanged, removed: Row counts by outcome
+            error: Error message (if not success)
+    """
+    stored = dict(conn.execute(
+        "SELECT object_id, payload_hash FROM items WHERE region = ? AND item_type = ?",
+        (region, item_type)
+    ))
+    seen = set()
+    stats = {"added": 0, "updated": 0, "unchanged": 0}
+
+    try:
+        with conn:
+            for page in iter_datahub_pages(token, [item_type], region, max_workers=max_workers):
+                if not page["success"]:
+                    raise RuntimeError(f"page {page['page']}: {page['error']}")
+                rows = []
+                for item in page["items"]:
+                    object_id = item.get("artifactObjectId") or item.get("objectId")
+                    if not object_id:
+                        continue
+                    seen.add(object_id)
+                    payload = json.dumps(item, sort_keys=True)
+                    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+                    if object_id not in stored:
+                        stats["added"] += 1
+                    elif stored[object_id] == digest:
+                        stats["unchanged"] += 1
+                        continue
+                    else:
+                        stats["updated"] += 1
+                    rows.append((region, item_type, object_id, item.get("workspaceObjectId"),
+                                 item.get("modifiedDate"), item.get("lastVisitedTimeUTC"), payload, digest))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO items (region, item_type, object_id, workspace_id, modified_date, "
+                    "last_visited, payload, payload_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+
+            removed = [(region, item_type, object_id) for object_id in stored.keys() - seen]
+            conn.executemany(
+                "DELETE FROM items WHERE region = ? AND item_type = ? AND object_id = ?", removed
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO syncs VALUES (?, ?, ?, ?)",
+                (region, item_type, time.time(), len(seen))
+            )
+    except RuntimeError as e:
+        return {"success": False, "error": str(e)}
+
+    return {"success": True, "total": len(seen), "removed": len(removed), **stats}
+
+
+def load_inventory(
+    conn: sqlite3.Connection,
+    region: str,
+    item_type: str,
+    workspace_id: Optional[str] = None
+) -> List[Dict]:
+    """
+    Load stored DataHub items for (region, item_type) as API-shaped dicts.
+
+    Args:
+        conn: Connection from open_inventory()
+        region: Region key from REGIONS dict
+        item_type: Item type name (e.g., "Model")
+        workspace_id: Optional workspace GUID to restrict results
+
+    Returns:
+        List of DataHub item dicts, ready for apply_filters() and sort_items()
+    """
+    return [item for batch in iter_inventory(conn, region, item_type, workspace_id) for item in batch]
+
+
+def iter_inventory(
+    conn: sqlite3.Connection,
+    region: str,
+    item_type: str,
+    workspace_id: Optional[str] = None,
+    batch_size: int = MAX_PAGE_SIZE
+) -> Iterator[List[Dict]]:
+    """
+    Stream stored DataHub items in batches, so large inventories are never fully decoded at once.
+
+    Args:
+        conn: Connection from open_inventory()
+        region: Region key from REGIONS dict
+        item_type: Item type name (e.g., "Model")
+        workspace_id: Optional workspace GUID to restrict results
+        batch_size: Items per yielded batch (default: 1000)
+
+    Yields:
+        Lists of DataHub item dicts
+    """
+    sql = "SELECT payload FROM items WHERE region = ? AND item_type = ?"
+    params = [region, item_type]
+    if workspace_id:
+        sql += " AND workspace_id = ?"
+        params.append(workspace_id)
+    cursor = conn.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield [json.loads(payload) for (payload,) in rows]
+
 #endregion
 
 
 #region Filtering
 
-def apply_filters(
-    items: List[Dict],
+class ItemRecord(NamedTuple):
+    """
+    One DataHub item normalised for filtering and sorting.
+
+    Built once per item by normalize_items(); strings are pre-lowered (SKU
+    pre-uppered) and dates are pre-parsed to epoch seconds, so compiled
+    predicates and sort keys never touch the raw payload again.
+    """
+    item: Dict
+    name: str
+    alt_name: str
+    workspace: str
+    owner_email: str
+    owner_given: str
+    owner_family: str
+    visited: Optional[float]
+    refreshed: Optional[float]
+    modified: Optional[float]
+    storage_mode: Optional[int]
+    direct_lake: bool
+    capacity_sku: str
+
+
+def _epoch(date_str: Optional[str]) -> Optional[float]:
+    """
+    Parse an OData /Date(ms)/ or ISO date string to epoch seconds.
+
+    ISO strings are read to whole seconds as naive local time, matching
+    _parse_odata_date() and the YYYY-MM-DD filter thresholds. fromisoformat()
+    is several times cheaper than strptime(), which dominated the old filters.
+    """
+    if not date_str:
+        return None
+    if date_str.startswith("/Date(") and date_str.endswith(")/"):
+        try:
+            return int(date_str[6:-2]) / 1000
+        except ValueError:
+            return None
+    try:
+        return datetime.fromisoformat(date_str[:19]).timestamp()
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(date_str[:10], "%Y-%m-%d").timestamp()
+    except ValueError:
+        return None
+
+
+def normalize_items(items: Iterable[Dict]) -> List[ItemRecord]:
+    """
+    Normalise DataHub items into ItemRecords, parsing every date exactly once.
+
+    Args:
+        items: DataHub item dicts
+
+    Returns:
+        List of ItemRecord, in input order
+    """
+    epoch = _epoch
+    records = []
+    append = records.append
+    for item in items:
+        artifact = item.get("artifact") or {}
+        owner = item.get("ownerUser") or {}
+        append(ItemRecord(
+            item,
+            (item.get("displayName") or "").lower(),
+            (item.get("name") or "").lower(),
+            (item.get("workspaceName") or "").lower(),
+            (owner.get("emailAddress") or "").lower(),
+            (owner.get("givenName") or "").lower(),
+            (owner.get("familyName") or "").lower(),
+            epoch(item.get("lastVisitedTimeUTC")),
+            epoch(_get_item_refresh_time(item)),
+            epoch(item.get("modifiedDate")),
+            artifact.get("storageMode"),
+            bool(artifact.get("directLakeMode")),
+            (artifact.get("sharedFromEnterpriseCapacitySku") or "").upper(),
+        ))
+    return records
+
+
+def compile_filters(
     name_filter: Optional[str] = None,
     workspace_filter: Optional[str] = None,
     owner_filter: Optional[str] = None,
@@ -347,175 +872,136 @@ def apply_filters(
     not_updated_since: Optional[str] = None,
     storage_mode: Optional[str] = None,
     capacity_sku: Optional[str] = None,
-) -> List[Dict]:
+) -> Callable[[ItemRecord], bool]:
     """
-    Apply multiple filters to items list.
+    Compile the active filter criteria into a single ItemRecord predicate.
 
-    Args:
-        items: List of DataHub item dicts
-        name_filter: Filter by item name (case-insensitive contains)
-        workspace_filter: Filter by workspace name (case-insensitive contains)
-        owner_filter: Filter by owner name/email (case-insensitive contains)
-        visited_since: Only items visited on or after this date (YYYY-MM-DD)
-        not_visited_since: Only items NOT visited since this date (stale items)
-        refreshed_since: Only items refreshed/updated on or after this date (data refresh)
-        not_refreshed_since: Only items NOT refreshed since this date (stale data)
-        updated_since: Only items modified on or after this date (definition change)
-        not_updated_since: Only items NOT modified since this date
-        storage_mode: Filter by storage mode (import, directquery, directlake)
-        capacity_sku: Filter by capacity SKU (F2, F64, PP, etc.)
+    Arguments are validated once here (an invalid date prints a warning and
+    that criterion is ignored), so the per-item work is only the comparisons.
+    See apply_filters() for the meaning of each criterion.
 
     Returns:
-        Filtered list of items
+        Callable returning True when a record passes every active criterion
     """
-    result = items
+    predicates = []
 
-    # Name filter
     if name_filter:
         name_lower = name_filter.lower()
-        result = [
-            item for item in result
-            if name_lower in item.get("displayName", "").lower()
-            or name_lower in item.get("name", "").lower()
-        ]
+        predicates.append(lambda r: name_lower in r.name or name_lower in r.alt_name)
 
-    # Workspace filter
     if workspace_filter:
         ws_lower = workspace_filter.lower()
-        result = [
-            item for item in result
-            if ws_lower in item.get("workspaceName", "").lower()
-        ]
+        predicates.append(lambda r: ws_lower in r.workspace)
 
-    # Owner filter
     if owner_filter:
         owner_lower = owner_filter.lower()
-        result = [
-            item for item in result
-            if owner_lower in item.get("ownerUser", {}).get("emailAddress", "").lower()
-            or owner_lower in item.get("ownerUser", {}).get("givenName", "").lower()
-            or owner_lower in item.get("ownerUser", {}).get("familyName", "").lower()
-        ]
-
-    # Visited since filter
-    if visited_since:
-        try:
-            since_date = datetime.strptime(visited_since, "%Y-%m-%d")
-            result = [
-                item for item in result
-                if item.get("lastVisitedTimeUTC") and
-                datetime.strptime(item["lastVisitedTimeUTC"][:10], "%Y-%m-%d") >= since_date
-            ]
-        except ValueError:
-            print(f"Warning: Invalid date format '{visited_since}', use YYYY-MM-DD", file=sys.stderr)
-
-    # Not visited since filter (stale items)
-    if not_visited_since:
-        try:
-            since_date = datetime.strptime(not_visited_since, "%Y-%m-%d")
-            result = [
-                item for item in result
-                if item.get("lastVisitedTimeUTC") and
-                datetime.strptime(item["lastVisitedTimeUTC"][:10], "%Y-%m-%d") < since_date
-            ]
-        except ValueError:
-            print(f"Warning: Invalid date format '{not_visited_since}', use YYYY-MM-DD", file=sys.stderr)
-
-    # Refreshed since filter (models: lastRefreshTime, notebooks: lastUpdatedDate)
-    if refreshed_since:
-        try:
-            since_date = datetime.strptime(refreshed_since, "%Y-%m-%d")
-            def get_refresh_datetime(item):
-                refresh_str = item.get("lastRefreshTime")
-                if refresh_str:
-                    return _parse_odata_date(refresh_str)
-                artifact = item.get("artifact", {})
-                refresh_str = artifact.get("LastRefreshTime") or artifact.get("lastRefreshTime")
-                if refresh_str:
-                    return _parse_odata_date(refresh_str)
-                updated = artifact.get("lastUpdatedDate")
-                if updated:
-                    return _parse_odata_date(updated)
-                return None
-            result = [
-                item for item in result
-                if get_refresh_datetime(item) and get_refresh_datetime(item) >= since_date
-            ]
-        except ValueError:
-            print(f"Warning: Invalid date format '{refreshed_since}', use YYYY-MM-DD", file=sys.stderr)
-
-    # Not refreshed since filter (stale data)
-    if not_refreshed_since:
-        try:
-            since_date = datetime.strptime(not_refreshed_since, "%Y-%m-%d")
-            def get_refresh_datetime(item):
-                refresh_str = item.get("lastRefreshTime")
-                if refresh_str:
-                    return _parse_odata_date(refresh_str)
-                artifact = item.get("artifact", {})
-                refresh_str = artifact.get("LastRefreshTime") or artifact.get("lastRefreshTime")
-                if refresh_str:
-                    return _parse_odata_date(refresh_str)
-                updated = artifact.get("lastUpdatedDate")
-                if updated:
-                    return _parse_odata_date(updated)
-                return None
-            result = [
-                item for item in result
-                if get_refresh_datetime(item) and get_refresh_datetime(item) < since_date
-            ]
-        except ValueError:
-            print(f"Warning: Invalid date format '{not_refreshed_since}', use YYYY-MM-DD", file=sys.stderr)
-
-    # Updated since filter (when item definition was modified)
-    if updated_since:
-        try:
-            since_date = datetime.strptime(updated_since, "%Y-%m-%d")
-            result = [
-                item for item in result
-                if _parse_odata_date(item.get("modifiedDate")) and
-                _parse_odata_date(item.get("modifiedDate")) >= since_date
-            ]
-        except ValueError:
-            print(f"Warning: Invalid date format '{updated_since}', use YYYY-MM-DD", file=sys.stderr)
+        predicates.append(
+            lambda r: owner_lower in r.owner_email or owner_lower in r.owner_given or owner_lower in r.owner_family
+        )
 
-    # Not updated since filter
-    if not_updated_since:
+    # (argument, record field, True for "on or after" / False for "before")
+    date_criteria = [
+        (visited_since, "visited", True),
+        (not_visited_since, "visited", False),
+        (refreshed_since, "refreshed", True),
+        (not_refreshed_since, "refreshed", False),
+        (updated_since, "modified", True),
+        (not_updated_since, "modified", False),
+    ]
+    for since, field, on_or_after in date_criteria:
+        if not since:
+            continue
         try:
-            since_date = datetime.strptime(not_updated_since, "%Y-%m-%d")
-            result = [
-                item for item in result
-                if _parse_odata_date(item.get("modifiedDate")) and
-                _parse_odata_date(item.get("modifiedDate")) < since_date
-            ]
+            threshold = datetime.strptime(since, "%Y-%m-%d").timestamp()
         except ValueError:
-            print(f"Warning: Invalid date format '{not_updated_since}', use YYYY-MM-DD", file=sys.stderr)
+            print(f"Warning: Invalid date format '{since}', use YYYY-MM-DD", file=sys.stderr)
+            continue
+        get = attrgetter(field)
+        if on_or_after:
+            predicates.append(lambda r, get=get, t=threshold: (v := get(r)) is not None and v >= t)
+        else:
+            predicates.append(lambda r, get=get, t=threshold: (v := get(r)) is not None and v < t)
 
-    # Storage mode filter
     if storage_mode:
         mode_lower = storage_mode.lower()
-        def matches_storage(item):
-            artifact = item.get("artifact", {})
-            sm = artifact.get("storageMode")
-            dl = artifact.get("directLakeMode", False)
-            if mode_lower == "import" and sm == 1:
-                return True
-            if mode_lower == "directquery" and sm == 2:
-                return True
-            if mode_lower == "directlake" and dl:
-                return True
-            return False
-        result = [item for item in result if matches_storage(item)]
+        if mode_lower == "import":
+            predicates.append(lambda r: r.storage_mode == 1)
+        elif mode_lower == "directquery":
+            predicates.append(lambda r: r.storage_mode == 2)
+        elif mode_lower == "directlake":
+            predicates.append(lambda r: r.direct_lake)
+        else:
+            predicates.append(lambda r: False)
 
-    # Capacity SKU filter
     if capacity_sku:
         sku_upper = capacity_sku.upper()
-        result = [
-            item for item in result
-            if sku_upper in item.get("artifact", {}).get("sharedFromEnterpriseCapacitySku", "").upper()
-        ]
+        predicates.append(lambda r: sku_upper in r.capacity_sku)
+
+    if not predicates:
+        return lambda r: True
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def matches(record: ItemRecord) -> bool:
+        for predicate in predicates:
+            if not predicate(record):
+                return False
+        return True
+
+    return matches
+
+
+def apply_filters(
+    items: List[Dict],
+    name_filter: Optional[str] = None,
+    workspace_filter: Optional[str] = None,
+    owner_filter: Optional[str] = None,
+    visited_since: Optional[str] = None,
+    not_visited_since: Optional[str] = None,
+    refreshed_since: Optional[str] = None,
+    not_refreshed_since: Optional[str] = None,
+    updated_since: Optional[str] = None,
+    not_updated_since: Optional[str] = None,
+    storage_mode: Optional[str] = None,
+    capacity_sku: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Apply multiple filters to items list in a single pass.
+
+    Convenience wrapper over normalize_items() and compile_filters(); callers
+    that also sort should keep the records instead (see sort_records()).
+
+    Args:
+        items: List of DataHub item dicts
+        name_filter: Filter by item name (case-insensitive contains)
+        workspace_filter: Filter by workspace name (case-insensitive contains)
+        owner_filter: Filter by owner name/email (case-insensitive contains)
+        visited_since: Only items visited on or after this date (YYYY-MM-DD)
+        not_visited_since: Only items NOT visited since this date (stale items)
+        refreshed_since: Only items refreshed/updated on or after this date (data refresh)
+        not_refreshed_since: Only items NOT refreshed since this date (stale data)
+        updated_since: Only items modified on or after this date (definition change)
+        not_updated_since: Only items NOT modified since this date
+        storage_mode: Filter by storage mode (import, directquery, directlake)
+        capacity_sku: Filter by capacity SKU (F2, F64, PP, etc.)
 
-    return result
+    Returns:
+        Filtered list of items
+    """
+    matches = compile_filters(
+        name_filter=name_filter,
+        workspace_filter=workspace_filter,
+        owner_filter=owner_filter,
+        visited_since=visited_since,
+        not_visited_since=not_visited_since,
+        refreshed_since=refreshed_since,
+        not_refreshed_since=not_refreshed_since,
+        updated_since=updated_since,
+        not_updated_since=not_updated_since,
+        storage_mode=storage_mode,
+        capacity_sku=capacity_sku,
+    )
+    return [r.item for r in normalize_items(items) if matches(r)]
 
 
 def _parse_odata_date(date_str: Optional[str]) -> Optional[datetime]:
@@ -541,7 +1027,7 @@ def _get_item_refresh_time(item: Dict) -> Optional[str]:
     refresh_time = item.get("lastRefreshTime")
     if refresh_time:
         return refresh_time
-    artifact = item.get("artifact", {})
+    artifact = item.get("artifact") or {}
     refresh_time = artifact.get("LastRefreshTime") or artifact.get("lastRefreshTime")
     if refresh_time:
         return refresh_time
@@ -557,10 +1043,42 @@ def _get_item_refresh_datetime(item: Dict) -> Optional[datetime]:
     return _parse_odata_date(refresh_str)
 
 
+# Sort keys over ItemRecord. Missing dates sort as the oldest value, matching
+# the previous empty-string keys.
+_SORT_KEYS = {
+    "name": attrgetter("name"),
+    "workspace": attrgetter("workspace"),
+    "last-visited": lambda r: (r.visited is not None, r.visited or 0.0),
+    "last-refreshed": lambda r: (r.refreshed is not None, r.refreshed or 0.0),
+    "last-modified": lambda r: (r.modified is not None, r.modified or 0.0),
+    "owner": attrgetter("owner_email"),
+}
+
+
+def sort_records(records: List[ItemRecord], sort_by: str, sort_order: str = "desc") -> List[ItemRecord]:
+    """
+    Sort normalised records using their pre-parsed keys.
+
+    Args:
+        records: ItemRecords from normalize_items()
+        sort_by: Field to sort by (name, workspace, last-visited, last-refreshed, last-modified, owner)
+        sort_order: "asc" or "desc" (default: desc)
+
+    Returns:
+        Sorted list (input returned unchanged for an unknown field)
+    """
+    key = _SORT_KEYS.get(sort_by)
+    if key is None:
+        return records
+    return sorted(records, key=key, reverse=sort_order.lower() != "asc")
+
+
 def sort_items(items: List[Dict], sort_by: str, sort_order: str = "desc") -> List[Dict]:
     """
     Sort items by specified field.
 
+    Dates are compared chronologically, so OData and ISO values sort together.
+
     Args:
         items: List of DataHub item dicts
         sort_by: Field to sort by (name, workspace, last-visited, last-refreshed, last-modified, owner)
@@ -569,68 +1087,188 @@ def sort_items(items: List[Dict], sort_by: str, sort_order: str = "desc") -> Lis
     Returns:
         Sorted list
     """
-    reverse = sort_order.lower() != "asc"
-
-    if sort_by == "name":
-        return sorted(items, key=lambda x: x.get("displayName", "").lower(), reverse=reverse)
-    elif sort_by == "workspace":
-        return sorted(items, key=lambda x: x.get("workspaceName", "").lower(), reverse=reverse)
-    elif sort_by == "last-visited":
-        return sorted(items, key=lambda x: x.get("lastVisitedTimeUTC", ""), reverse=reverse)
-    elif sort_by == "last-refreshed":
-        return sorted(items, key=lambda x: _get_item_refresh_time(x) or "", reverse=reverse)
-    elif sort_by == "last-modified":
-        return sorted(items, key=lambda x: x.get("modifiedDate", ""), reverse=reverse)
-    elif sort_by == "owner":
-        return sorted(items, key=lambda x: x.get("ownerUser", {}).get("emailAddress", "").lower(), reverse=reverse)
-    else:
-        return items
+    return [r.item for r in sort_records(normalize_items(items), sort_by, sort_order)]
 
 #endregion
 
 
 #region Output Formatting
 
+def clean_item(item: Dict) -> Dict[str, Any]:
+    """
+    Project a DataHub item onto the clean output record used by json, ndjson, csv and parquet.
+
+    Unique-to-DataHub-V2 fields lead; identifier fields that also exist in
+    `fab find` come at the end. The point of this script is the rich metadata
+    that `fab find` does not return, so the unique fields are visually
+    prominent in piped/grep'd output. Keys always appear in OUTPUT_SCHEMA order.
+    """
+    artifact = item.get("artifact") or {}
+    owner_user = item.get("ownerUser") or {}
+    return {
+        # Unique to DataHub V2 (not in `fab find`)
+        "lastVisited": item.get("lastVisitedTimeUTC"),
+        "lastRefreshed": _get_refresh_time(item),
+        "lastModified": _get_modified_time(item),
+        "owner": owner_user.get("emailAddress"),
+        "ownerName": f"{owner_user.get('givenName', '')} {owner_user.get('familyName', '')}".strip(),
+        "storageMode": _get_storage_mode(item),
+        "capacitySku": artifact.get("sharedFromEnterpriseCapacitySku"),
+        "naturalLanguageSupported": artifact.get("naturalLanguageSupported"),
+        "cachedModelEnabled": artifact.get("cachedModelEnabled"),
+        "isDiscoverable": item.get("isDiscoverable"),
+        # Identifier fields (also returned by `fab find -l`)
+        "name": item.get("displayName", item.get("name")),
+        "workspace": item.get("workspaceName"),
+        "workspaceId": item.get("workspaceObjectId"),
+        "id": item.get("objectId"),
+    }
+
+
+# Column types for the streaming writers. Timestamps stay ISO 8601 strings, as
+# in the JSON output, so every format carries identical values; cast in the
+# consumer (e.g. DuckDB: CAST(lastVisited AS TIMESTAMP)).
+OUTPUT_SCHEMA = {
+    "lastVisited": "string",
+    "lastRefreshed": "string",
+    "lastModified": "string",
+    "owner": "string",
+    "ownerName": "string",
+    "storageMode": "string",
+    "capacitySku": "string",
+    "naturalLanguageSupported": "bool",
+    "cachedModelEnabled": "bool",
+    "isDiscoverable": "bool",
+    "name": "string",
+    "workspace": "string",
+    "workspaceId": "string",
+    "id": "string",
+}
+
+# Formats written incrementally by StreamWriter rather than built by format_output()
+STREAM_FORMATS = ("ndjson", "csv", "parquet")
+
+# Rows buffered per Parquet row group
+PARQUET_BATCH_ROWS = 10000
+
+
+class StreamWriter:
+    """
+    Write clean output records one at a time as ndjson, csv or parquet.
+
+    Memory stays flat with inventory size: ndjson and csv rows go straight to
+    the stream, and parquet buffers at most PARQUET_BATCH_ROWS rows before
+    writing a row group with the fixed OUTPUT_SCHEMA.
+
+    A file is written under a hidden .part name and renamed into place by
+    close(); abort() deletes it instead, so a failed run never leaves a
+    truncated file or a parquet file without its footer, and never replaces
+    an earlier output.
+
+    Args:
+        output_format: "ndjson", "csv", or "parquet"
+        path: Output file; None writes ndjson/csv to stdout (required for parquet)
+    """
+
+    def __init__(self, output_format: str, path: Optional[Path] = None):
+        if output_format not in STREAM_FORMATS:
+            raise ValueError(f"Unsupported stream format: {output_format}")
+        if output_format == "parquet" and not path:
+            raise ValueError("parquet output requires --output-file")
+        if output_format == "parquet" and not PYARROW_AVAILABLE:
+            raise ValueError("parquet output requires pyarrow (uv pip install pyarrow)")
+
+        self.output_format = output_format
+        self.count = 0
+        self.closed = False
+        self._path = Path(path) if path else None
+        self._partial = self._path.with_name(f".{self._path.name}.part") if path else None
+        self._stream = None
+        self._owns_stream = False
+        self._csv = None
+        self._parquet = None
+        self._batch = {name: [] for name in OUTPUT_SCHEMA}
+
+        if output_format == "parquet":
+            self._arrow_schema = pa.schema([
+                (name, pa.bool_() if kind == "bool" else pa.string())
+                for name, kind in OUTPUT_SCHEMA.items()
+            ])
+            self._parquet = pq.ParquetWriter(str(self._partial), self._arrow_schema)
+            return
+
+        if path:
+            self._stream = open(self._partial, "w", newline="", encoding="utf-8")
+            self._owns_stream = True
+        else:
+            self._stream = sys.stdout
+        if output_format == "csv":
+            self._csv = csv.DictWriter(self._stream, fieldnames=list(OUTPUT_SCHEMA))
+            self._csv.writeheader()
+
+    def write(self, item: Dict) -> None:
+        """Write one DataHub item."""
+        row = clean_item(item)
+        self.count += 1
+        if self.output_format == "ndjson":
+            self._stream.write(json.dumps(row) + "\n")
+        elif self.output_format == "csv":
+            self._csv.writerow(row)
+        else:
+            for name, kind in OUTPUT_SCHEMA.items():
+                value = row[name]
+                if value is not None:
+                    value = bool(value) if kind == "bool" else str(value)
+                self._batch[name].append(value)
+            if len(self._batch["id"]) >= PARQUET_BATCH_ROWS:
+                self._flush_parquet()
+
+    def _flush_parquet(self) -> None:
+        if self._batch["id"]:
+            self._parquet.write_table(pa.table(self._batch, schema=self._arrow_schema))
+            self._batch = {name: [] for name in OUTPUT_SCHEMA}
+
+    def close(self) -> int:
+        """Flush and close the output, moving a file into place; returns the number of rows written."""
+        if self._parquet is not None:
+            self._flush_parquet()
+            self._parquet.close()
+        elif self._owns_stream:
+            self._stream.close()
+        else:
+            self._stream.flush()
+        if self._partial:
+            self._partial.replace(self._path)
+        self.closed = True
+        return self.count
+
+    def abort(self) -> None:
+        """Discard the output: close it and delete the partial file, leaving any earlier output intact."""
+        try:
+            if self._parquet is not None:
+                self._parquet.close()
+            elif self._owns_stream:
+                self._stream.close()
+        finally:
+            if self._partial:
+                self._partial.unlink(missing_ok=True)
+            self.closed = True
+
+
 def format_output(items: List[Dict], output_format: str = "table", show_fields: Optional[List[str]] = None) -> str:
     """
     Format items for display.
 
     Args:
         items: List of DataHub item dicts
-        output_format: "table", "json", "brief", or "detailed"
+        output_format: "table", "json", "brief", or "detailed" (see StreamWriter for ndjson/csv/parquet)
         show_fields: Optional list of fields to show in table format
 
     Returns:
         Formatted string for output
     """
     if output_format == "json":
-        # Clean JSON output. Unique-to-DataHub-V2 fields lead; identifier fields that
-        # also exist in `fab find` come at the end. The point of this script is the
-        # rich metadata that `fab find` does not return, so the unique fields are
-        # visually prominent in piped/grep'd output.
-        cleaned = []
-        for item in items:
-            artifact = item.get("artifact", {})
-            owner_user = item.get("ownerUser", {})
-            cleaned.append({
-                # Unique to DataHub V2 (not in `fab find`)
-                "lastVisited": item.get("lastVisitedTimeUTC"),
-                "lastRefreshed": _get_refresh_time(item),
-                "lastModified": _get_modified_time(item),
-                "owner": owner_user.get("emailAddress"),
-                "ownerName": f"{owner_user.get('givenName', '')} {owner_user.get('familyName', '')}".strip(),
-                "storageMode": _get_storage_mode(item),
-                "capacitySku": artifact.get("sharedFromEnterpriseCapacitySku"),
-                "naturalLanguageSupported": artifact.get("naturalLanguageSupported"),
-                "cachedModelEnabled": artifact.get("cachedModelEnabled"),
-                "isDiscoverable": item.get("isDiscoverable"),
-                # Identifier fields (also returned by `fab find -l`)
-                "name": item.get("displayName", item.get("name")),
-                "workspace": item.get("workspaceName"),
-                "workspaceId": item.get("workspaceObjectId"),
-                "id": item.get("objectId"),
-            })
-        return json.dumps(cleaned, indent=2)
+        return json.dumps([clean_item(item) for item in items], indent=2)
 
     if not items:
         return "No items found."
@@ -730,6 +1368,84 @@ def _get_modified_time(item: Dict) -> Optional[str]:
 #endregion
 
 
+#region Benchmark
+
+def _synthetic_inventory(count: int, seed: int = 0) -> List[Dict]:
+    """Generate DataHub-shaped model items with a realistic mix of date formats."""
+    rng = random.Random(seed)
+    base_ms = int(datetime(2023, 1, 1).timestamp() * 1000)
+    span_ms = 3 * 365 * 86400 * 1000
+    skus = ["F2", "F64", "PP", "P1", ""]
+    items = []
+    for i in range(count):
+        visited_ms = base_ms + rng.randrange(span_ms)
+        items.append({
+            "artifactObjectId": f"{i:08d}-0000-0000-0000-000000000000",
+            "displayName": f"Model {rng.randrange(count)}",
+            "workspaceName": f"Workspace {rng.randrange(2000)}",
+            "workspaceObjectId": f"ws-{rng.randrange(2000)}",
+            "ownerUser": {
+                "emailAddress": f"user{rng.randrange(5000)}@contoso.com",
+                "givenName": f"Given{rng.randrange(500)}",
+                "familyName": f"Family{rng.randrange(500)}",
+            },
+            "lastVisitedTimeUTC": datetime.fromtimestamp(visited_ms / 1000).strftime("%Y-%m-%dT%H:%M:%S.%f"),
+            "lastRefreshTime": f"/Date({base_ms + rng.randrange(span_ms)})/" if rng.random() < 0.8 else None,
+            "modifiedDate": datetime.fromtimestamp((base_ms + rng.randrange(span_ms)) / 1000).strftime("%Y-%m-%dT%H:%M:%S"),
+            "artifact": {
+                "storageMode": rng.choice([1, 1, 1, 2]),
+                "directLakeMode": rng.random() < 0.1,
+                "sharedFromEnterpriseCapacitySku": rng.choice(skus),
+            },
+        })
+    return items
+
+
+def run_filter_benchmark(count: int) -> None:
+    """
+    Time normalisation, filtering and sorting on a synthetic inventory.
+
+    Runs a typical stale-content sweep and an every-criterion query so changes
+    to the filter engine can be compared on the same data.
+    """
+    print(f"Generating {count} synthetic items...", file=sys.stderr)
+    items = _synthetic_inventory(count)
+
+    queries = {
+        "stale sweep": dict(not_visited_since="2025-01-01", not_refreshed_since="2025-06-01"),
+        "all criteria": dict(
+            name_filter="model 1", workspace_filter="workspace", owner_filter="contoso",
+            visited_since="2023-06-01", not_visited_since="2025-06-01",
+            refreshed_since="2023-03-01", not_refreshed_since="2025-09-01",
+            updated_since="2023-02-01", not_updated_since="2025-12-01",
+            storage_mode="import", capacity_sku="F",
+        ),
+    }
+
+    start = time.perf_counter()
+    records = normalize_items(items)
+    normalize_s = time.perf_counter() - start
+    print(f"{'normalize':<28} {normalize_s * 1000:>9.1f} ms  ({count} records)")
+
+    for label, criteria in queries.items():
+        start = time.perf_counter()
+        matches = compile_filters(**criteria)
+        kept = [r for r in records if matches(r)]
+        filter_s = time.perf_counter() - start
+        print(f"{'filter: ' + label:<28} {filter_s * 1000:>9.1f} ms  ({len(kept)} kept)")
+
+    for sort_by in ("last-visited", "last-refreshed", "name"):
+        start = time.perf_counter()
+        sort_records(records, sort_by)
+        print(f"{'sort: ' + sort_by:<28} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+    start = time.perf_counter()
+    apply_filters(items, **queries["stale sweep"])
+    print(f"{'apply_filters (end to end)':<28} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+#endregion
+
+
 #region Main
 
 def main():
@@ -783,6 +1499,19 @@ Examples:
 
   # Find items on F64 capacity
   %(prog)s --type Model --capacity-sku F64
+
+  # Full tenant inventory (all pages, fetched concurrently)
+  %(prog)s --type Model --all-pages --not-visited-since 2024-06-01
+
+  # Stream a large inventory to Parquet (or ndjson/csv) with flat memory
+  %(prog)s --type Model --all-pages --output parquet --output-file models.parquet
+
+  # Search every region at once (partial result if a region times out)
+  %(prog)s --type Model --all-regions --region-timeout 60
+
+  # Query a local inventory store (refreshed at most once per --cache-max-age)
+  %(prog)s --type Model --cache --not-visited-since 2024-06-01
+  %(prog)s --type Model --offline --owner "data-team"
         """
     )
 
@@ -833,9 +1562,12 @@ Examples:
     # Output
     output_group = parser.add_argument_group("Output")
     output_group.add_argument("--output", "-o",
-                              choices=["table", "json", "brief", "detailed"],
+                              choices=["table", "json", "brief", "detailed", "ndjson", "csv", "parquet"],
                               default="table",
-                              help="Output format: table (default), json (clean), brief (paths only), detailed (all fields)")
+                              help="Output format: table (default), json (clean), brief (paths only), detailed (all fields); "
+                                   "ndjson, csv and parquet are streamed as items are filtered")
+    output_group.add_argument("--output-file", type=Path,
+                              help="Write output to this file instead of stdout (required for parquet)")
     output_group.add_argument("--limit", type=int,
                               help="Limit number of results displayed")
 
@@ -843,8 +1575,31 @@ Examples:
     api_group = parser.add_argument_group("API Options")
     api_group.add_argument("--region", "-r", default=DEFAULT_REGION,
                            help=f"Fabric region (default: {DEFAULT_REGION}). Use --list-regions for options.")
-    api_group.add_argument("--page-size", type=int, default=200,
-                           help="Results per API call, max 1000 (default: 200)")
+    api_group.add_argument("--page-size", type=int,
+                           help="Results per API call, max 1000 (default: 200, or 1000 with --all-pages)")
+    api_group.add_argument("--all-pages", action="store_true",
+                           help="Fetch the full inventory across all pages instead of only the first page")
+    api_group.add_argument("--all-regions", action="store_true",
+                           help="Query every region in --list-regions concurrently and merge the results")
+    api_group.add_argument("--region-timeout", type=float, default=DEFAULT_REGION_TIMEOUT,
+                           help=f"Deadline in seconds for --all-regions; slower regions are skipped "
+                                f"(default: {DEFAULT_REGION_TIMEOUT})")
+    api_group.add_argument("--workers", type=int, default=DEFAULT_PAGE_WORKERS,
+                           help=f"Concurrent page requests with --all-pages (default: {DEFAULT_PAGE_WORKERS})")
+
+    # Local inventory cache
+    cache_group = parser.add_argument_group("Inventory Cache")
+    cache_group.add_argument("--cache", action="store_true",
+                             help="Query a local inventory store, refreshing it from the API (all pages) "
+                                  "only when older than --cache-max-age")
+    cache_group.add_argument("--refresh-cache", action="store_true",
+                             help="Force an incremental refresh of the local inventory before querying (implies --cache)")
+    cache_group.add_argument("--offline", action="store_true",
+                             help="Query the local inventory without contacting the API (implies --cache)")
+    cache_group.add_argument("--cache-max-age", type=float, default=DEFAULT_CACHE_MAX_AGE_HOURS,
+                             help=f"Hours before a cached inventory is refreshed (default: {DEFAULT_CACHE_MAX_AGE_HOURS})")
+    cache_group.add_argument("--cache-path", type=Path, default=DEFAULT_CACHE_PATH,
+                             help=f"SQLite inventory file (default: {DEFAULT_CACHE_PATH})")
 
     # Info
     info_group = parser.add_argument_group("Information")
@@ -852,6 +1607,8 @@ Examples:
                             help="List all available item types with descriptions")
     info_group.add_argument("--list-regions", action="store_true",
                             help="List all available regions")
+    info_group.add_argument("--benchmark", type=int, nargs="?", const=200000, metavar="N",
+                            help="Time filtering and sorting on N synthetic items (default: 200000) and exit")
 
     args = parser.parse_args()
 
@@ -881,6 +1638,11 @@ Examples:
             print(f"  {region:<20} {host}{default}")
         return 0
 
+    # Filter engine benchmark (no API calls)
+    if args.benchmark:
+        run_filter_benchmark(args.benchmark)
+        return 0
+
     # Require item type for search
     if not args.item_type:
         parser.error("--type is required for search (or use --list-types)")
@@ -890,32 +1652,15 @@ Examples:
         print(f"Warning: '{args.item_type}' not in known types. Trying anyway...", file=sys.stderr)
         print(f"Hint: Use --list-types to see available types", file=sys.stderr)
 
-    # Get token
-    print("Getting access token...", file=sys.stderr)
-    token = get_fabric_token()
-    if not token:
-        return 1
-
-    # Search
-    print(f"Searching for {args.item_type} in {args.region}...", file=sys.stderr)
-    result = search_datahub(
-        token=token,
-        item_types=[args.item_type],
-        region=args.region,
-        workspace_id=args.workspace_id,
-        page_size=args.page_size
-    )
-
-    if not result["success"]:
-        print(f"Error: {result['error']}", file=sys.stderr)
+    if args.all_regions and (args.cache or args.refresh_cache or args.offline):
+        parser.error("--all-regions cannot be combined with --cache, --refresh-cache or --offline")
+    if args.output == "parquet" and not args.output_file:
+        parser.error("--output parquet requires --output-file")
+    if args.output == "parquet" and not PYARROW_AVAILABLE:
+        print("Error: parquet output requires pyarrow. Install with: uv pip install pyarrow", file=sys.stderr)
         return 1
 
-    items = result["items"]
-    print(f"API returned {len(items)} items", file=sys.stderr)
-
-    # Apply filters
-    items = apply_filters(
-        items,
+    matches = compile_filters(
         name_filter=args.filter_text,
         workspace_filter=args.workspace_filter,
         owner_filter=args.owner,
@@ -929,19 +1674,194 @@ Examples:
         capacity_sku=args.capacity_sku,
     )
 
-    # Sort
-    if args.sort:
-        items = sort_items(items, args.sort, args.sort_order)
+    # Streaming formats write each match as soon as it is filtered, unless a sort
+    # needs the full result first; everything else collects records for the end.
+    # The writer opens on first use and is aborted on any error exit, so a failed
+    # run leaves no partial file and keeps the previous output.
+    streaming = args.output in STREAM_FORMATS and not args.sort
+    writer = None
+    records = []
+
+    def get_writer() -> StreamWriter:
+        nonlocal writer
+        if writer is None:
+            writer = StreamWriter(args.output, args.output_file)
+        return writer
+
+    def limit_reached() -> bool:
+        # Without a sort the first --limit matches are the answer, so no more
+        # need to be read
+        if not args.limit or args.sort:
+            return False
+        return (get_writer().count if streaming else len(records)) >= args.limit
 
-    # Limit
-    if args.limit:
-        items = items[:args.limit]
+    def collect(new_records: Iterable[ItemRecord]) -> None:
+        for record in new_records:
+            if limit_reached():
+                return
+            if streaming:
+                get_writer().write(record.item)
+            else:
+                records.append(record)
 
-    # Output
-    print(f"\nFound {len(items)} items after filtering:\n", file=sys.stderr)
-    print(format_output(items, args.output))
+    try:
+        # Search
+        if args.cache or args.refresh_cache or args.offline:
+            conn = open_inventory(args.cache_path)
+            synced_at = get_inventory_sync_time(conn, args.region, args.item_type)
+            stale = synced_at is None or time.time() - synced_at > args.cache_max_age * 3600
+
+            if args.offline:
+                if synced_at is None:
+                    print(f"Error: no cached inventory for {args.item_type} in {args.region}; "
+                          f"run once with --cache to build it", file=sys.stderr)
+                    return 1
+            elif args.refresh_cache or stale:
+                print("Getting access token...", file=sys.stderr)
+                token = get_fabric_token()
+                if not token:
+                    return 1
+                print(f"Refreshing cached {args.item_type} inventory for {args.region}...", file=sys.stderr)
+                sync = sync_inventory(conn, token, args.region, args.item_type, args.workers)
+                if not sync["success"]:
+                    print(f"Error: {sync['error']}", file=sys.stderr)
+                    return 1
+                print(f"Inventory: {sync['total']} items ({sync['added']} added, {sync['updated']} updated, "
+                      f"{sync['unchanged']} unchanged, {sync['removed']} removed)", file=sys.stderr)
+                synced_at = time.time()
+
+            age_hours = (time.time() - synced_at) / 3600
+            print(f"Reading cached inventory (synced {age_hours:.1f}h ago)", file=sys.stderr)
+            for batch in iter_inventory(conn, args.region, args.item_type, args.workspace_id):
+                collect(r for r in normalize_items(batch) if matches(r))
+                if limit_reached():
+                    break
+            conn.close()
+        elif args.all_regions:
+            print("Getting access token...", file=sys.stderr)
+            token = get_fabric_token()
+            if not token:
+                return 1
+
+            print(f"Searching for {args.item_type} in {len(REGIONS)} regions...", file=sys.stderr)
+            result = search_all_regions(
+                token=token,
+                item_types=[args.item_type],
+                workspace_id=args.workspace_id,
+                page_size=args.page_size or (MAX_PAGE_SIZE if args.all_pages else 200),
+                all_pages=args.all_pages,
+                max_workers=args.workers,
+                timeout=args.region_timeout
+            )
+
+            print(f"\n{'Region':<20} {'Items':>7} {'Seconds':>8}  Status", file=sys.stderr)
+            for region, info in sorted(result["regions"].items()):
+                status = "ok" if info["success"] else info["error"][:60]
+                print(f"{region:<20} {info['count']:>7} {info['seconds']:>8.2f}  {status}", file=sys.stderr)
+
+            if not result["success"]:
+                print("Error: every region failed", file=sys.stderr)
+                return 1
+            failed = [r for r, info in result["regions"].items() if not info["success"]]
+            if failed:
+                print(f"Warning: partial result; {len(failed)} region(s) failed: {', '.join(sorted(failed))}",
+                      file=sys.stderr)
+
+            items = result["items"]
+            print(f"API returned {len(items)} unique items", file=sys.stderr)
+            collect(r for r in normalize_items(items) if matches(r))
+        elif args.all_pages:
+            print("Getting access token...", file=sys.stderr)
+            token = get_fabric_token()
+            if not token:
+                return 1
+
+            # Filter each page as it lands so the full raw inventory is never held at once
+            print(f"Searching for {args.item_type} in {args.region} (all pages, {args.workers} workers)...", file=sys.stderr)
+            fetched = 0
+            pages = 0
+            for page in iter_datahub_pages(
+                token=token,
+                item_types=[args.item_type],
+                region=args.region,
+                workspace_id=args.workspace_id,
+                page_size=args.page_size or MAX_PAGE_SIZE,
+                max_workers=args.workers
+            ):
+                if not page["success"]:
+                    print(f"Error on page {page['page']}: {page['error']}", file=sys.stderr)
+                    return 1
+                pages += 1
+                fetched += len(page["items"])
+                collect(r for r in normalize_items(page["items"]) if matches(r))
+                if limit_reached():
+                    print(f"Reached --limit {args.limit}; not fetching further pages", file=sys.stderr)
+                    break
+            print(f"API returned {fetched} unique items across {pages} pages", file=sys.stderr)
+        else:
+            print("Getting access token...", file=sys.stderr)
+            token = get_fabric_token()
+            if not token:
+                return 1
+
+            print(f"Searching for {args.item_type} in {args.region}...", file=sys.stderr)
+            result = search_datahub(
+                token=token,
+                item_types=[args.item_type],
+                region=args.region,
+                workspace_id=args.workspace_id,
+                page_size=args.page_size or 200
+            )
+
+            if not result["success"]:
+                print(f"Error: {result['error']}", file=sys.stderr)
+                return 1
+
+            items = result["items"]
+            print(f"API returned {len(items)} items", file=sys.stderr)
+            if len(items) >= min(args.page_size or 200, MAX_PAGE_SIZE):
+                print("Note: result filled one page and may be truncated; use --all-pages for the full inventory",
+                      file=sys.stderr)
+
+            # Apply filters
+            collect(r for r in normalize_items(items) if matches(r))
+
+        if streaming:
+            count = get_writer().close()
+            destination = f" to {args.output_file}" if args.output_file else ""
+            print(f"\nWrote {count} items after filtering{destination}", file=sys.stderr)
+            return 0
+
+        # Sort (reuses the keys parsed during filtering)
+        if args.sort:
+            records = sort_records(records, args.sort, args.sort_order)
+        items = [r.item for r in records]
+
+        # Limit
+        if args.limit:
+            items = items[:args.limit]
+
+        # Output
+        if args.output in STREAM_FORMATS:
+            stream = get_writer()
+            for item in items:
+                stream.write(item)
+            stream.close()
+            destination = f" to {args.output_file}" if args.output_file else ""
+            print(f"\nWrote {len(items)} items after filtering{destination}", file=sys.stderr)
+            return 0
+
+        print(f"\nFound {len(items)} items after filtering:\n", file=sys.stderr)
+        if args.output_file:
+            args.output_file.write_text(format_output(items, args.output) + "\n", encoding="utf-8")
+            print(f"Results saved to: {args.output_file}", file=sys.stderr)
+        else:
+            print(format_output(items, args.output))
 
-    return 0
+        return 0
+    finally:
+        if writer is not None and not writer.closed:
+            writer.abort()
 
 #endregion
 
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Upload a local directory into a Fabric Lakehouse Files area via OneLake.
+
+The reverse of download_workspace.py's lakehouse file download, built on the
+same DataLakeServiceClient. Intended for seeding new lakehouses and restoring
+backups with tens of thousands of files.
+
+Usage:
+    python3 upload_lakehouse_files.py ./backup/Lakehouse/Raw.Lakehouse/Files "Sales.Workspace/Raw.Lakehouse"
+    python3 upload_lakehouse_files.py ./landing "Dev.Workspace/Raw.Lakehouse" --dest landing/2024
+    python3 upload_lakehouse_files.py ./landing "Dev.Workspace/Raw.Lakehouse" --jobs 32
+
+Files are uploaded on a bounded worker pool (--jobs). Files of 64 MiB or more
+are split into 8 MiB chunks appended in parallel at their offsets and
+committed with a single flush; smaller files go up in one request. --jobs caps
+the requests in flight across both levels: a large file only appends in
+parallel on slots other uploads are not using. Every
+upload sets Content-MD5, so a file already present with the same size and MD5
+is skipped and a rerun only sends what is missing or different.
+
+Requirements:
+    - fab CLI installed and authenticated
+    - azure-storage-file-datalake
+    - azure-identity
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from download_workspace import (
+    AZURE_AVAILABLE,
+    CHUNK_BYTES,
+    DEFAULT_JOBS,
+    LARGE_FILE_BYTES,
+    RANGE_CONCURRENCY,
+    TransferSlots,
+    list_lakehouse_paths,
+    onelake_file_system,
+    run_fab_command,
+)
+
+if AZURE_AVAILABLE:
+    from azure.storage.filedatalake import ContentSettings
+
+
+#region Helper Functions
+
+
+def file_md5(local_file: Path) -> bytes:
+    """Return the MD5 digest of a local file, read in CHUNK_BYTES pieces."""
+    digest = hashlib.md5()
+    with open(local_file, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def list_local_files(source: Path) -> list:
+    """
+    List files under source.
+
+    Returns:
+        List of (relative POSIX path, local Path, size) tuples
+    """
+    files = []
+    for root, _, names in os.walk(source):
+        for name in names:
+            local_file = Path(root) / name
+            # Leftovers from an interrupted download_workspace.py run
+            if name.startswith(".") and name.endswith(".part"):
+                continue
+            files.append((local_file.relative_to(source).as_posix(), local_file, local_file.stat().st_size))
+    return files
+
+
+def list_remote_files(fs_client, base_path: str, workers: int, slots: TransferSlots = None) -> dict:
+    """
+    Map relative path to size for every file already under base_path.
+
+    Returns an empty dict if base_path does not exist yet.
+    """
+    try:
+        paths, _ = list_lakehouse_paths(fs_client, base_path, workers, slots)
+    except Exception as e:
+        if "404" in str(e) or "PathNotFound" in str(e):
+            return {}
+        raise
+    return {p.name[len(base_path)+1:]: p.content_length for p in paths}
+
+
+#endregion
+
+
+#region Upload
+
+
+def upload_file(fs_client, remote_path: str, local_file: Path, size: int, remote_size=None,
+                slots: TransferSlots = None) -> bool:
+    """
+    Upload one file unless an identical copy is already in OneLake.
+
+    Args:
+        fs_client: OneLake file system client for the workspace
+        remote_path: Full path in the file system (<lakehouse id>/Files/...)
+        local_file: Local file to upload
+        size: Local file size in bytes
+        remote_size: Size of the existing remote file, or None if absent
+        slots: Request slots shared with the other uploads; a large file
+            appends up to RANGE_CONCURRENCY chunks at once, one per slot free
+
+    Returns:
+        True if the file was uploaded, False if it was skipped as identical
+    """
+    slots = slots or TransferSlots(RANGE_CONCURRENCY)
+    file_client = fs_client.get_file_client(remote_path)
+    md5 = file_md5(local_file)
+
+    # Size is known from the listing; MD5 needs one properties call per candidate
+    if remote_size == size:
+        with slots.hold():
+            remote_md5 = file_client.get_file_properties().content_settings.content_md5
+        if remote_md5 and bytes(remote_md5) == md5:
+            return False
+
+    content_settings = ContentSettings(content_md5=bytearray(md5))
+
+    if size < LARGE_FILE_BYTES:
+        with slots.hold(), open(local_file, "rb") as f:
+            file_client.upload_data(f, length=size, overwrite=True, content_settings=content_settings)
+        return True
+
+    # Large file: append fixed-size chunks at their offsets in parallel, each
+    # worker reading only its own chunk, then commit everything with one flush
+    def append_chunk(offset):
+        length = min(CHUNK_BYTES, size - offset)
+        with open(local_file, "rb") as f:
+            f.seek(offset)
+            file_client.append_data(f.read(length), offset=offset, length=length)
+
+    with slots.hold(RANGE_CONCURRENCY) as concurrency:
+        file_client.create_file(content_settings=content_settings)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in [pool.submit(append_chunk, offset) for offset in range(0, size, CHUNK_BYTES)]:
+                future.result()
+        file_client.flush_data(size, content_settings=content_settings)
+    return True
+
+
+def upload_lakehouse_files(source: Path, lakehouse_path: str, dest: str = "", jobs: int = DEFAULT_JOBS) -> int:
+    """
+    Upload a local directory tree into a lakehouse Files area.
+
+    Args:
+        source: Local directory to upload
+        lakehouse_path: Lakehouse path (e.g., "Sales.Workspace/Raw.Lakehouse")
+        dest: Folder under Files to upload into (default: Files root)
+        jobs: Concurrent requests, shared by file uploads, their chunk
+            appends and directory listings
+
+    Returns:
+        Number of files that failed to upload
+    """
+    workspace_path = lakehouse_path.split("/", 1)[0]
+
+    print("Resolving workspace and lakehouse IDs...")
+    workspace_id = run_fab_command(["get", workspace_path, "-q", "id"])
+    lakehouse_id = run_fab_command(["get", lakehouse_path, "-q", "id"])
+
+    base_path = f"{lakehouse_id}/Files"
+    if dest.strip("/"):
+        base_path = f"{base_path}/{dest.strip('/')}"
+
+    files = list_local_files(source)
+    total_bytes = sum(size for _, _, size in files)
+    print(f"Found {len(files)} local files ({total_bytes / 1048576:.1f} MiB) in {source}")
+    if not files:
+        return 0
+
+    fs_client = onelake_file_system(workspace_id)
+    slots = TransferSlots(jobs)
+
+    print("Listing existing files...")
+    remote = list_remote_files(fs_client, base_path, jobs, slots)
+    print(f"Found {len(remote)} existing files under {lakehouse_path}/Files/{dest.strip('/')}")
+    print()
+
+    start = time.monotonic()
+    uploaded = 0
+    uploaded_bytes = 0
+    skipped = 0
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(upload_file, fs_client, f"{base_path}/{relative_path}", local_file, size,
+                        remote.get(relative_path), slots): (relative_path, size)
+            for relative_path, local_file, size in files
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            relative_path, size = futures[future]
+            try:
+                if future.result():
+                    uploaded += 1
+                    uploaded_bytes += size
+                    print(f"  [{done}/{len(files)}] {relative_path}")
+                else:
+                    skipped += 1
+            except Exception as e:
+                print(f"  [{done}/{len(files)}] Failed: {relative_path}: {e}")
+                failed.append(relative_path)
+
+    elapsed = time.monotonic() - start
+    print()
+    print("=" * 60)
+    print("Upload Summary")
+    print("=" * 60)
+    print(f"Uploaded: {uploaded} files ({uploaded_bytes / 1048576:.1f} MiB)")
+    print(f"Skipped (identical): {skipped}")
+    print(f"Failed: {len(failed)}")
+    for relative_path in failed:
+        print(f"   {relative_path}")
+    print(f"Elapsed: {elapsed:.1f}s")
+
+    return len(failed)
+
+
+#endregion
+
+
+#region Main
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Upload a local directory into a Fabric Lakehouse Files area",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python3 upload_lakehouse_files.py ./data "Sales.Workspace/Raw.Lakehouse"
+    python3 upload_lakehouse_files.py ./data "Sales.Workspace/Raw.Lakehouse" --dest landing/2024
+    python3 upload_lakehouse_files.py ./data "Sales.Workspace/Raw.Lakehouse" --jobs 32
+        """
+    )
+
+    parser.add_argument("source", help="Local directory to upload")
+    parser.add_argument("lakehouse", help="Lakehouse path: Workspace.Workspace/Name.Lakehouse")
+    parser.add_argument("--dest", default="", help="Folder under Files to upload into (default: Files root)")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Concurrent requests across all uploads (default: {DEFAULT_JOBS})")
+
+    args = parser.parse_args()
+
+    if not AZURE_AVAILABLE:
+        print("Error: azure-storage-file-datalake and azure-identity are required")
+        print("Install with: pip install azure-storage-file-datalake azure-identity")
+        sys.exit(1)
+
+    source = Path(args.source)
+    if not source.is_dir():
+        parser.error(f"source is not a directory: {source}")
+    if ".Lakehouse" not in args.lakehouse or "/" not in args.lakehouse:
+        parser.error("lakehouse must be a path like Workspace.Workspace/Name.Lakehouse")
+
+    try:
+        failed = upload_lakehouse_files(source, args.lakehouse, dest=args.dest, jobs=max(1, args.jobs))
+    except KeyboardInterrupt:
+        print("\n\nUpload interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\nError: {e}")
+        sys.exit(1)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
+
+
+#endregion
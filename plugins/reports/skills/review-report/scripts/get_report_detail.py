@@ -27,8 +27,9 @@ PREREQUISITES:
   - Python packages: requests (uv pip install requests)
 
 TOKEN SECURITY:
-  Auth tokens obtained via `az account get-access-token` in a subprocess.
-  Tokens held in memory only -- never printed, logged, or written to disk.
+  Auth tokens come from `az account get-access-token` via the shared token broker
+  (token_broker.py), which caches them on disk with owner-only permissions until
+  shortly before expiry. Tokens are never printed or logged.
 
 OUTPUT:
   - Daily view counts over the reporting period
@@ -46,12 +47,16 @@ from collections import defaultdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from token_broker import POWERBI_RESOURCE, TokenError, get_access_token
+
 try:
-    import requests
+    import requests  # noqa: F401
 except ImportError:
     print("Error: 'requests' package required. Install with: uv pip install requests", file=sys.stderr)
     sys.exit(1)
 
+from http_session import get_session
+
 
 #region Variables
 
@@ -81,30 +86,17 @@ DEFAULT_REGION = "west-europe"
 
 def get_token() -> Optional[str]:
     """
-    Obtain a Power BI API access token via Azure CLI.
+    Obtain a Power BI API access token through the shared token broker.
 
     Returns the access token string, or None on failure.
-    Tokens are captured in-process and never printed or logged.
+    The broker reuses a cached token until shortly before expiry and only
+    runs `az account get-access-token` when needed (see token_broker.py).
+    Tokens are never printed or logged.
     """
     try:
-        result = subprocess.run(
-            ["az", "account", "get-access-token",
-             "--resource", "https://analysis.windows.net/powerbi/api"],
-            capture_output=True, text=True, timeout=30
-        )
-
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return data.get("accessToken")
-
-        print("Error: Azure CLI not authenticated. Run 'az login' first.", file=sys.stderr)
-        return None
-
-    except subprocess.TimeoutExpired:
-        print("Error: Token request timed out.", file=sys.stderr)
-        return None
-    except FileNotFoundError:
-        print("Error: Azure CLI not installed. Install with 'brew install azure-cli'.", file=sys.stderr)
+        return get_access_token(POWERBI_RESOURCE)
+    except TokenError as e:
+        print(f"Error: {e}", file=sys.stderr)
         return None
     except Exception as e:
         print(f"Error getting token: {type(e).__name__}", file=sys.stderr)
@@ -133,7 +125,7 @@ def wabi_get(token: str, region: str, workspace_id: str, endpoint: str) -> Optio
     headers = {"Authorization": f"Bearer {token}"}
 
     try:
-        resp = requests.get(url, headers=headers, timeout=30)
+        resp = get_session().get(url, headers=headers, timeout=30)
         if resp.status_code == 200:
             return resp.json()
         else:
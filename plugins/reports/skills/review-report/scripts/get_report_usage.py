@@ -16,8 +16,9 @@ It uses three tiers of data, each providing progressively richer information:
   Tier 3 (DataHub V2): Last visited timestamp across all workspaces
 
 TOKEN SECURITY:
-  The script obtains auth tokens via `az account get-access-token` in a subprocess.
-  Tokens are held in memory only and never printed, logged, or written to disk.
+  Auth tokens come from `az account get-access-token` via the shared token broker
+  (token_broker.py), which caches them on disk with owner-only permissions until
+  shortly before expiry. Tokens are never printed or logged.
   Ensure `az login` has been run before using this script.
 
 COMMON PATTERNS:
@@ -52,17 +53,20 @@ OUTPUT:
 
 import argparse
 import json
-import subprocess
 import sys
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from token_broker import POWERBI_RESOURCE, TokenError, get_access_token
+
 try:
-    import requests
+    import requests  # noqa: F401
 except ImportError:
     print("Error: 'requests' package required. Install with: uv pip install requests", file=sys.stderr)
     sys.exit(1)
 
+from http_session import get_session
+
 
 #region Variables
 
@@ -92,30 +96,17 @@ DEFAULT_REGION = "west-europe"
 
 def get_token() -> Optional[str]:
     """
-    Obtain a Power BI API access token via Azure CLI.
+    Obtain a Power BI API access token through the shared token broker.
 
     Returns the access token string, or None on failure.
-    Tokens are captured in-process and never printed or logged.
+    The broker reuses a cached token until shortly before expiry and only
+    runs `az account get-access-token` when needed (see token_broker.py).
+    Tokens are never printed or logged.
     """
     try:
-        result = subprocess.run(
-            ["az", "account", "get-access-token",
-             "--resource", "https://analysis.windows.net/powerbi/api"],
-            capture_output=True, text=True, timeout=30
-        )
-
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return data.get("accessToken")
-
-        print("Error: Azure CLI not authenticated. Run 'az login' first.", file=sys.stderr)
-        return None
-
-    except subprocess.TimeoutExpired:
-        print("Error: Token request timed out.", file=sys.stderr)
-        return None
-    except FileNotFoundError:
-        print("Error: Azure CLI not installed. Install with 'brew install azure-cli'.", file=sys.stderr)
+        return get_access_token(POWERBI_RESOURCE)
+    except TokenError as e:
+        print(f"Error: {e}", file=sys.stderr)
         return None
     except Exception as e:
         print(f"Error getting token: {type(e).__name__}", file=sys.stderr)
@@ -144,7 +135,7 @@ def wabi_get(token: str, region: str, workspace_id: str, endpoint: str) -> Optio
     headers = {"Authorization": f"Bearer {token}"}
 
     try:
-        resp = requests.get(url, headers=headers, timeout=30)
+        resp = get_session().get(url, headers=headers, timeout=30)
         if resp.status_code == 200:
             return resp.json()
         else:
@@ -223,7 +214,7 @@ def generate_usage_model(token: str, region: str, workspace_id: str) -> Optional
     headers = {"Authorization": f"Bearer {token}"}
 
     try:
-        resp = requests.get(url, headers=headers, timeout=60)
+        resp = get_session().get(url, headers=headers, timeout=60)
         if resp.status_code in (200, 202):
             data = resp.json()
             models = data.get("models", [])
@@ -261,7 +252,7 @@ def dax_query(token: str, workspace_id: str, dataset_id: str, query: str) -> Opt
     }
 
     try:
-        resp = requests.post(url, headers=headers, json=payload, timeout=30)
+        resp = get_session().post(url, headers=headers, json=payload, timeout=30)
         if resp.status_code == 200:
             data = resp.json()
             results = data.get("results", [])
@@ -350,7 +341,7 @@ def get_datahub_data(token: str, region: str, workspace_id: str, report_id: Opti
     }
 
     try:
-        resp = requests.post(url, headers=headers, json=payload, timeout=30)
+        resp = get_session().post(url, headers=headers, json=payload, timeout=30)
         if resp.status_code == 200:
             items = resp.json()
             if isinstance(items, list):
@@ -28,8 +28,9 @@ PREREQUISITES:
   - For --report-path: exported report definition (fab export)
 
 TOKEN SECURITY:
-  Auth tokens obtained via `az account get-access-token` in a subprocess.
-  Tokens held in memory only -- never printed, logged, or written to disk.
+  Auth tokens come from `az account get-access-token` via the shared token broker
+  (token_broker.py), which caches them on disk with owner-only permissions until
+  shortly before expiry. Tokens are never printed or logged.
 
 OUTPUT:
   - Load time percentiles (P10, P50, P90) with geographic/browser breakdown
@@ -49,12 +50,16 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from token_broker import POWERBI_RESOURCE, TokenError, get_access_token
+
 try:
-    import requests
+    import requests  # noqa: F401
 except ImportError:
     print("Error: 'requests' package required. Install with: uv pip install requests", file=sys.stderr)
     sys.exit(1)
 
+from http_session import get_session
+
 
 #region Variables
 
@@ -84,23 +89,19 @@ DEFAULT_REGION = "west-europe"
 
 def get_token() -> Optional[str]:
     """
-    Obtain a Power BI API access token via Azure CLI.
+    Obtain a Power BI API access token through the shared token broker.
 
     Returns the access token string, or None on failure.
-    Tokens are captured in-process and never printed or logged.
+    The broker reuses a cached token until shortly before expiry and only
+    runs `az account get-access-token` when needed (see token_broker.py).
+    Tokens are never printed or logged.
     """
     try:
-        result = subprocess.run(
-            ["az", "account", "get-access-token",
-             "--resource", "https://analysis.windows.net/powerbi/api"],
-            capture_output=True, text=True, timeout=30
-        )
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return data.get("accessToken")
-        print("Error: Azure CLI not authenticated. Run 'az login' first.", file=sys.stderr)
+        return get_access_token(POWERBI_RESOURCE)
+    except TokenError as e:
+        print(f"Error: {e}", file=sys.stderr)
         return None
-    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+    except Exception as e:
         print(f"Error getting token: {type(e).__name__}", file=sys.stderr)
         return None
 
@@ -127,7 +128,7 @@ def get_load_times(token: str, region: str, workspace_id: str, report_id: str) -
     headers = {"Authorization": f"Bearer {token}"}
 
     try:
-        resp = requests.get(url, headers=headers, timeout=30)
+        resp = get_session().get(url, headers=headers, timeout=30)
         if resp.status_code != 200:
             return []
         all_loads = resp.json()
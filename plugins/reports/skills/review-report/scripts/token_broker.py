@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Shared Azure CLI token broker with an expiry-aware on-disk cache.
+
+Every `az account get-access-token` call starts the Azure CLI's Python runtime
+(1-3s). Scripts in this folder call get_access_token() instead; it returns a
+token from an in-process or on-disk cache while the token has more than
+REFRESH_MARGIN seconds left, and only shells out to `az` when the cached token
+is missing, close to expiry, or was issued under a different `az login`.
+
+Concurrency:
+    Each resource audience has its own lock file. A process that needs a fresh
+    token takes the lock, re-reads the cache (another process may have just
+    refreshed it), and only then runs `az`. N scripts started at once cost one
+    `az` call, not N.
+
+Token security:
+    Tokens are never printed or logged. Cache files are written with 0600
+    permissions under ~/.cache/fabric-cli-scripts/tokens (override with
+    FABRIC_TOKEN_CACHE_DIR). They are invalidated when the az profile changes
+    (az login / az account set) and hold nothing that `az` does not already
+    keep in its own token cache. Set FABRIC_TOKEN_CACHE=0 to disable the disk
+    cache and keep tokens in memory only.
+
+Usage:
+    from token_broker import TokenError, get_access_token
+
+    token = get_access_token("https://analysis.windows.net/powerbi/api")
+
+    # CLI: print remaining lifetime of cached tokens (never the token itself)
+    python3 token_broker.py --status
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+#region Configuration
+
+POWERBI_RESOURCE = "https://analysis.windows.net/powerbi/api"
+FABRIC_RESOURCE = "https://api.fabric.microsoft.com"
+
+CACHE_DIR = Path(
+    os.environ.get("FABRIC_TOKEN_CACHE_DIR")
+    or Path.home() / ".cache" / "fabric-cli-scripts" / "tokens"
+)
+DISK_CACHE_ENABLED = os.environ.get("FABRIC_TOKEN_CACHE", "1") != "0"
+
+# Refresh tokens with less than this many seconds left, so a token handed out
+# is always good for at least one long request or LRO poll loop iteration
+REFRESH_MARGIN = 300
+
+AZ_TIMEOUT = 30
+
+# In-process memo: resource -> {"accessToken", "expiresAt", "profile"}
+_MEMO: Dict[str, Dict] = {}
+
+#endregion
+
+
+#region Helpers
+
+
+class TokenError(Exception):
+    """Raised when no token can be obtained; the message is safe to print."""
+
+
+def _az_profile_stamp() -> str:
+    """Fingerprint of the active az login; changes on az login / logout / account set."""
+    config_dir = Path(os.environ.get("AZURE_CONFIG_DIR") or Path.home() / ".azure")
+    try:
+        stat = (config_dir / "azureProfile.json").stat()
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+    except OSError:
+        return ""
+
+
+def _cache_path(resource: str) -> Path:
+    digest = hashlib.sha256(resource.encode()).hexdigest()[:16]
+    return CACHE_DIR / f"{digest}.json"
+
+
+def _is_fresh(entry: Optional[Dict], profile: str) -> bool:
+    return (
+        bool(entry)
+        and entry.get("profile") == profile
+        and entry.get("expiresAt", 0) - time.time() > REFRESH_MARGIN
+    )
+
+
+def _read_cache(path: Path) -> Optional[Dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path: Path, entry: Dict) -> None:
+    """Write atomically with owner-only permissions so readers never see a partial file."""
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Hold an exclusive cross-process lock on path for the duration of the block."""
+    with open(path, "a+b") as handle:
+        if os.name == "nt":
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _fetch_from_az(resource: str) -> Dict:
+    """Run `az account get-access-token` and return {"accessToken", "expiresAt"}."""
+    try:
+        result = subprocess.run(
+            ["az", "account", "get-access-token", "--resource", resource, "--output", "json"],
+            capture_output=True, text=True, timeout=AZ_TIMEOUT
+        )
+    except subprocess.TimeoutExpired:
+        raise TokenError("Token request timed out.")
+    except FileNotFoundError:
+        raise TokenError("Azure CLI (az) not installed. Install it and run 'az login'.")
+
+    if result.returncode != 0:
+        raise TokenError("Azure CLI not authenticated. Run 'az login' first.")
+
+    data = json.loads(result.stdout)
+    token = data.get("accessToken")
+    if not token:
+        raise TokenError("Azure CLI returned no access token. Run 'az login' first.")
+
+    # expires_on (epoch) is present in az >= 2.54; older versions only have
+    # expiresOn as local time without an offset
+    if data.get("expires_on"):
+        expires_at = float(data["expires_on"])
+    elif data.get("expiresOn"):
+        expires_at = datetime.fromisoformat(data["expiresOn"][:19]).timestamp()
+    else:
+        expires_at = time.time() + 3000
+    return {"accessToken": token, "expiresAt": expires_at}
+
+#endregion
+
+
+#region Public API
+
+
+def get_access_token(resource: str = POWERBI_RESOURCE, force_refresh: bool = False) -> str:
+    """
+    Return a bearer token for a resource audience, shelling out to `az` only when needed.
+
+    Args:
+        resource: Resource audience, e.g. POWERBI_RESOURCE or FABRIC_RESOURCE
+        force_refresh: Ignore cached tokens (e.g. after a 401) and fetch a new one
+
+    Returns:
+        Access token string
+
+    Raises:
+        TokenError: az is missing, not logged in, or timed out
+    """
+    profile = _az_profile_stamp()
+    if not force_refresh and _is_fresh(_MEMO.get(resource), profile):
+        return _MEMO[resource]["accessToken"]
+
+    if not DISK_CACHE_ENABLED:
+        entry = {**_fetch_from_az(resource), "profile": profile}
+        _MEMO[resource] = entry
+        return entry["accessToken"]
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True, mode=0o700)
+    path = _cache_path(resource)
+
+    with _locked(path.with_suffix(".lock")):
+        entry = _read_cache(path)
+        # Under the lock: a concurrent process may have refreshed while we waited.
+        # A forced refresh still accepts a token newer than the one that failed.
+        stale_token = _MEMO.get(resource, {}).get("accessToken") if force_refresh else None
+        if not _is_fresh(entry, profile) or (force_refresh and entry.get("accessToken") == stale_token):
+            entry = {**_fetch_from_az(resource), "profile": profile}
+            _write_cache(path, entry)
+
+    _MEMO[resource] = entry
+    return entry["accessToken"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the shared az token cache")
+    parser.add_argument("--status", action="store_true", help="Show remaining lifetime of cached tokens")
+    parser.add_argument("--clear", action="store_true", help="Delete all cached tokens")
+    args = parser.parse_args()
+
+    if args.clear:
+        for path in CACHE_DIR.glob("*.json"):
+            path.unlink()
+        print(f"Cleared token cache at {CACHE_DIR}")
+        return 0
+
+    profile = _az_profile_stamp()
+    for resource in (POWERBI_RESOURCE, FABRIC_RESOURCE):
+        entry = _read_cache(_cache_path(resource))
+        if not entry:
+            state = "not cached"
+        elif entry.get("profile") != profile:
+            state = "stale (az login changed)"
+        else:
+            remaining = entry.get("expiresAt", 0) - time.time()
+            state = f"{remaining / 60:.0f} min left" if remaining > 0 else "expired"
+        print(f"{resource:<45} {state}")
+    return 0
+
+
+#endregion
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,24 @@
 Find all reports connected to a semantic model across accessible workspaces.
 
 No tenant admin required -- uses workspace-level permissions only.
-Scans all workspaces the authenticated user has access to.
+Scans all workspaces the authenticated user has access to, one call per workspace.
+The scan runs on asyncio: concurrency starts at --workers and adapts AIMD-style
+(grows while responses succeed, halves on 429 and waits out Retry-After), and
+timeouts and 5xx are retried. Workspaces that still fail are listed on stderr
+and the script exits 2, so a throttled scan is never silently incomplete.
+--stream prints each match as a JSON line as soon as its workspace is read.
+
+With --admin, Fabric administrators instead page through
+admin/groups?$expand=reports (5000 workspaces per call) and filter on
+datasetId locally: a handful of calls instead of one per workspace, and
+full tenant coverage. Falls back to the per-workspace scan when the admin
+API is refused (not an admin) or throttled (50 calls/hour).
+
+With --index, lookups are answered from a local SQLite reverse index
+(datasetId -> reports) instead of a scan. The index is built from one full
+scan and then refreshed per workspace: only workspaces that are new or were
+indexed more than --index-max-age hours ago are rescanned. While the index
+is fresh, a lookup by --dataset-id makes no API calls at all.
 
 Usage:
     # By workspace/model name
@@ -15,24 +32,78 @@ Usage:
     # JSON output for piping
     python3 get-downstream-reports.py "ws" "model" --json
 
+    # Tenant admins: pull all workspaces + reports in a few paged calls
+    python3 get-downstream-reports.py --dataset-id <dataset-guid> --admin
+
+    # Stream matches as NDJSON while the scan runs
+    python3 get-downstream-reports.py --dataset-id <dataset-guid> --stream
+
+    # Several datasets at once, grouped per dataset
+    python3 get-downstream-reports.py --dataset-id <guid-a>,<guid-b>,<guid-c>
+    python3 get-downstream-reports.py --dataset-file dataset_ids.txt
+
+    # Answer from the local reverse-lineage index (built on first use,
+    # stale workspaces rescanned after --index-max-age hours)
+    python3 get-downstream-reports.py --dataset-file dataset_ids.txt --index
+    python3 get-downstream-reports.py --refresh-index --admin
+
 Requirements:
     pip install azure-identity requests
+    http_session.py from this folder (pooled keep-alive HTTP client)
+    Optional: pip install httpx (thousands of in-flight requests on one event
+    loop; without it the scan runs on up to 64 threads)
 """
 
 import argparse
+import asyncio
 import json
+import os
+import random
+import sqlite3
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from pathlib import Path
 
-import requests
 from azure.identity import DefaultAzureCredential
 
+from http_session import get_session
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
 
 # region Variables
 
 API = "https://api.powerbi.com/v1.0/myorg"
 
+# admin/groups caps $top at 5000
+ADMIN_PAGE_SIZE = 5000
+
+DEFAULT_INDEX_PATH = Path(
+    os.environ.get("LINEAGE_INDEX_PATH")
+    or Path.home() / ".cache" / "fabric-cli-scripts" / "lineage_index.sqlite"
+)
+DEFAULT_INDEX_MAX_AGE_HOURS = 24
+
+# Workspace scan: start at DEFAULT_WORKERS requests in flight and adapt up to
+# DEFAULT_MAX_CONCURRENCY. Without httpx the scan runs on threads, capped lower.
+DEFAULT_WORKERS = 8
+DEFAULT_MAX_CONCURRENCY = 512
+FALLBACK_MAX_THREADS = 64
+DEFAULT_RETRIES = 4
+MAX_THROTTLE_RETRIES = 10
+REQUEST_TIMEOUT = 30
+
+# Network failures worth retrying: requests' errors and timeouts are OSErrors,
+# a truncated body fails JSON decoding with a ValueError
+TRANSIENT_ERRORS = (OSError, ValueError) + ((httpx.TransportError,) if HTTPX_AVAILABLE else ())
+
 # endregion
 
 
@@ -52,7 +123,7 @@ def get_dataset_id(headers, workspace_name, model_name):
     Searches the named workspace for a matching dataset by displayName.
     Returns the dataset ID string or exits with error.
     """
-    resp = requests.get(f"{API}/groups", headers=headers, timeout=15)
+    resp = get_session().get(f"{API}/groups", headers=headers, timeout=15)
     resp.raise_for_status()
     workspaces = resp.json().get("value", [])
 
@@ -61,7 +132,7 @@ def get_dataset_id(headers, workspace_name, model_name):
         print(f"Workspace '{workspace_name}' not found", file=sys.stderr)
         sys.exit(1)
 
-    resp = requests.get(
+    resp = get_session().get(
         f"{API}/groups/{ws['id']}/datasets", headers=headers, timeout=15
     )
     resp.raise_for_status()
@@ -76,34 +147,475 @@ def get_dataset_id(headers, workspace_name, model_name):
     return ds["id"], ws["id"], ws["name"]
 
 
-def scan_workspace(ws_id, ws_name, dataset_id, headers):
+def match_reports(reports, ws_id, ws_name, dataset_ids):
+    """Return report dicts with workspace context for reports bound to any of dataset_ids."""
+    return [
+        {
+            "report": r["name"],
+            "reportId": r["id"],
+            "datasetId": r["datasetId"],
+            "workspace": ws_name,
+            "workspaceId": ws_id,
+            # Admin API has no format; reportType distinguishes paginated reports
+            "format": r.get("format") or r.get("reportType", "?"),
+            "webUrl": r.get("webUrl", ""),
+        }
+        for r in reports
+        if r.get("datasetId") in dataset_ids
+    ]
+
+
+def admin_workspaces(headers):
+    """
+    List every active workspace in the tenant with its reports, via the admin API.
+
+    Pages admin/groups?$expand=reports with $top/$skip, so the whole tenant
+    costs ceil(workspaces / 5000) calls. Deleted workspaces are skipped.
+
+    Returns the workspace dicts (each with a "reports" list), or None when the
+    admin API is refused or throttled and the caller should fall back to scanning.
     """
-    Scan a single workspace for reports bound to the target dataset.
+    workspaces = []
+    skip = 0
+    while True:
+        resp = get_session().get(
+            f"{API}/admin/groups",
+            headers=headers,
+            params={"$top": ADMIN_PAGE_SIZE, "$skip": skip, "$expand": "reports"},
+            timeout=120,
+        )
+        if resp.status_code in (401, 403):
+            print("Admin API refused (Fabric administrator role required); "
+                  "falling back to per-workspace scan", file=sys.stderr)
+            return None
+        if resp.status_code == 429:
+            print("Admin API throttled (50 calls/hour); "
+                  "falling back to per-workspace scan", file=sys.stderr)
+            return None
+        resp.raise_for_status()
+
+        page = resp.json().get("value", [])
+        workspaces.extend(ws for ws in page if ws.get("state", "Active") == "Active")
+
+        if len(page) < ADMIN_PAGE_SIZE:
+            return workspaces
+        skip += ADMIN_PAGE_SIZE
+
+
+def admin_scan(dataset_ids, headers):
+    """
+    Find reports bound to the target datasets across the tenant via the admin API.
+
+    Returns (matched report dicts, workspace count), or None when the admin
+    API is unavailable (see admin_workspaces()).
+    """
+    workspaces = admin_workspaces(headers)
+    if workspaces is None:
+        return None
+    matched = []
+    for ws in workspaces:
+        matched.extend(match_reports(ws.get("reports", []), ws["id"], ws["name"], dataset_ids))
+    return matched, len(workspaces)
+
+
+def read_dataset_ids(values, path):
+    """
+    Collect dataset GUIDs from comma-separated --dataset-id values and a --dataset-file.
+
+    The file holds one GUID per line; blank lines and lines starting with # are
+    ignored. Order is preserved and duplicates are dropped.
+    """
+    ids = [part.strip() for value in values or [] for part in value.split(",")]
+    if path:
+        with open(path, encoding="utf-8") as f:
+            ids.extend(line.strip() for line in f if not line.lstrip().startswith("#"))
+    return list(dict.fromkeys(i for i in ids if i))
+
+# endregion
 
-    Returns a list of matched report dicts with workspace context.
+
+# region Scan Engine
+
+class AdaptiveLimiter:
     """
+    AIMD concurrency limit for the per-workspace scan.
+
+    Until the first 429 every success raises the limit by one, doubling it per
+    round trip (slow start, as in TCP). After that, every `limit` successes
+    raise it by one (additive increase). Growth stops at ceiling. A 429 halves
+    the limit (multiplicative decrease, at most once per second so a burst of
+    429s from one window counts once) and holds back new requests until
+    Retry-After has elapsed.
+    """
+
+    def __init__(self, initial, ceiling):
+        self.limit = max(1, min(initial, ceiling))
+        self.ceiling = ceiling
+        self.peak = self.limit
+        self.throttled = 0
+        self._in_flight = 0
+        self._successes = 0
+        self._slow_start = True
+        self._last_decrease = 0.0
+        self._resume_at = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def release(self, outcome, retry_after=None):
+        """Return a slot; outcome is "ok", "throttled" or "error"."""
+        async with self._cond:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if outcome == "throttled":
+                self.throttled += 1
+                self._resume_at = max(self._resume_at, now + (retry_after or 1.0))
+                self._slow_start = False
+                if now - self._last_decrease >= 1.0:
+                    self.limit = max(1, self.limit // 2)
+                    self._last_decrease = now
+                    self._successes = 0
+            elif outcome == "ok":
+                self._successes += 1
+                if (self._slow_start or self._successes >= self.limit) and self.limit < self.ceiling:
+                    self.limit += 1
+                    self.peak = max(self.peak, self.limit)
+                    self._successes = 0
+            self._cond.notify_all()
+
+
+def retry_after_seconds(value):
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds, or None."""
+    if not value:
+        return None
     try:
-        resp = requests.get(
-            f"{API}/groups/{ws_id}/reports", headers=headers, timeout=10
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@asynccontextmanager
+async def report_fetcher(headers, ceiling):
+    """
+    Yield an async fetch(url) -> (status, Retry-After, JSON body or None).
+
+    Uses one httpx.AsyncClient when httpx is installed, so thousands of
+    requests can be in flight on a single event loop. Otherwise requests run
+    on a thread pool over the shared keep-alive session (http_session.py),
+    capped at FALLBACK_MAX_THREADS.
+    """
+    if HTTPX_AVAILABLE:
+        limits = httpx.Limits(max_connections=ceiling, max_keepalive_connections=ceiling)
+        async with httpx.AsyncClient(
+            headers={**headers, "Accept-Encoding": "gzip, deflate"},
+            limits=limits,
+            timeout=REQUEST_TIMEOUT,
+        ) as client:
+            async def fetch(url):
+                resp = await client.get(url)
+                body = resp.json() if resp.status_code == 200 else None
+                return resp.status_code, resp.headers.get("Retry-After"), body
+
+            yield fetch
+        return
+
+    loop = asyncio.get_running_loop()
+    # The /groups lookup already built the shared pool at its default size;
+    # grow it so every worker thread has a kept-alive connection
+    get_session(pool_size=ceiling)
+
+    def get(url):
+        resp = get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        body = resp.json() if resp.status_code == 200 else None
+        return resp.status_code, resp.headers.get("Retry-After"), body
+
+    with ThreadPoolExecutor(max_workers=ceiling) as pool:
+        async def fetch(url):
+            return await loop.run_in_executor(pool, get, url)
+
+        yield fetch
+
+
+async def fetch_workspace_reports(ws, fetch, limiter, retries):
+    """
+    List one workspace's reports, retrying 429s, 5xx and network errors.
+
+    Returns (ws, reports, None) on success or (ws, None, reason) once the
+    workspace has to be skipped.
+    """
+    url = f"{API}/groups/{ws['id']}/reports"
+    attempt = 0
+    throttled = 0
+    while True:
+        await limiter.acquire()
+        try:
+            status, retry_after, body = await fetch(url)
+        except TRANSIENT_ERRORS as e:
+            await limiter.release("error")
+            status, reason = None, f"{type(e).__name__}: {e}"
+        else:
+            if status == 200:
+                await limiter.release("ok")
+                return ws, body.get("value", []), None
+            if status == 429:
+                await limiter.release("throttled", retry_after_seconds(retry_after))
+                throttled += 1
+                if throttled > MAX_THROTTLE_RETRIES:
+                    return ws, None, f"HTTP 429 after {throttled} attempts"
+                continue
+            await limiter.release("error")
+            reason = f"HTTP {status}"
+
+        # Only timeouts, network errors and server errors are worth retrying
+        if status is not None and status != 408 and status < 500:
+            return ws, None, reason
+        attempt += 1
+        if attempt > retries:
+            return ws, None, f"{reason} after {attempt} attempts"
+        await asyncio.sleep(min(2 ** attempt, 30) * random.uniform(0.5, 1.0))
+
+
+async def _scan_async(workspaces, headers, on_reports, workers, max_concurrency, retries):
+    ceiling = max_concurrency if HTTPX_AVAILABLE else min(max_concurrency, FALLBACK_MAX_THREADS)
+    limiter = AdaptiveLimiter(workers, ceiling)
+    skipped = []
+    async with report_fetcher(headers, ceiling) as fetch:
+        tasks = [fetch_workspace_reports(ws, fetch, limiter, retries) for ws in workspaces]
+        for next_done in asyncio.as_completed(tasks):
+            ws, reports, reason = await next_done
+            if reports is None:
+                skipped.append({"workspace": ws["name"], "workspaceId": ws["id"], "error": reason})
+            else:
+                on_reports(ws, reports)
+    stats = {"peak_concurrency": limiter.peak, "final_concurrency": limiter.limit,
+             "throttled": limiter.throttled}
+    return skipped, stats
+
+
+def scan_workspaces(workspaces, headers, on_reports, workers=DEFAULT_WORKERS,
+                    max_concurrency=DEFAULT_MAX_CONCURRENCY, retries=DEFAULT_RETRIES):
+    """
+    List the reports of every workspace concurrently, with adaptive concurrency.
+
+    Starts at `workers` requests in flight and adapts AIMD-style up to
+    max_concurrency (see AdaptiveLimiter). 429s are retried after Retry-After;
+    timeouts, network errors and 5xx are retried with jittered backoff up to
+    `retries` times. Nothing is swallowed: a workspace that still fails is
+    reported in the skipped list.
+
+    Args:
+        workspaces: Workspace dicts with "id" and "name"
+        headers: Request headers including Authorization
+        on_reports: Called as on_reports(ws, reports) as each workspace
+            completes, so callers can stream matches
+        workers: Initial concurrency
+        max_concurrency: Concurrency ceiling
+        retries: Retries per workspace for transient failures
+
+    Returns:
+        (skipped, stats): skipped is a list of {workspace, workspaceId, error};
+        stats has peak_concurrency, final_concurrency and throttled (429 count)
+    """
+    return asyncio.run(
+        _scan_async(workspaces, headers, on_reports, workers, max_concurrency, retries)
+    )
+
+# endregion
+
+
+# region Lineage Index
+
+def open_index(path=DEFAULT_INDEX_PATH):
+    """
+    Open (and create if needed) the local reverse-lineage index.
+
+    Reports are keyed by reportId with an index on datasetId, so "which reports
+    bind to these datasets" is an indexed lookup instead of a tenant scan. Each
+    workspace carries its own synced_at, so a refresh only rescans workspaces
+    that are new, stale, or failed last time.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS reports (
+            report_id TEXT PRIMARY KEY,
+            dataset_id TEXT,
+            workspace_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            format TEXT,
+            web_url TEXT
+        );
+        CREATE INDEX IF NOT EXISTS reports_by_dataset ON reports (dataset_id);
+        CREATE INDEX IF NOT EXISTS reports_by_workspace ON reports (workspace_id);
+        CREATE TABLE IF NOT EXISTS workspaces (
+            workspace_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            synced_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value REAL NOT NULL
+        );
+    """)
+    return conn
+
+
+def index_age_hours(conn):
+    """Hours since the workspace listing was last refreshed, or None if never."""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+    return (time.time() - row[0]) / 3600 if row else None
+
+
+def index_workspace(conn, ws_id, ws_name, reports):
+    """Replace one workspace's reports in the index and stamp its sync time."""
+    with conn:
+        conn.execute("DELETE FROM reports WHERE workspace_id = ?", (ws_id,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (r["id"], r.get("datasetId"), ws_id, r["name"],
+                 r.get("format") or r.get("reportType"), r.get("webUrl", ""))
+                for r in reports
+            ],
         )
-        if resp.status_code != 200:
-            return []
-
-        reports = resp.json().get("value", [])
-        matched = []
-        for r in reports:
-            if r.get("datasetId") == dataset_id:
-                matched.append({
-                    "report": r["name"],
-                    "reportId": r["id"],
-                    "workspace": ws_name,
-                    "workspaceId": ws_id,
-                    "format": r.get("format", "?"),
-                    "webUrl": r.get("webUrl", ""),
-                })
-        return matched
-    except Exception:
-        return []
+        conn.execute(
+            "INSERT OR REPLACE INTO workspaces VALUES (?, ?, ?)", (ws_id, ws_name, time.time())
+        )
+
+
+def refresh_index(conn, headers, max_age_hours=DEFAULT_INDEX_MAX_AGE_HOURS,
+                  admin=False, full=False, **scan_options):
+    """
+    Bring the index up to date with the workspaces the caller can see.
+
+    With admin, one paged admin/groups pull re-indexes every workspace. Otherwise
+    the workspace list is fetched and only workspaces that are new or older than
+    max_age_hours (all of them with full) are rescanned with scan_workspaces()
+    (scan_options are passed through); each is committed as soon as it is read.
+    A skipped workspace keeps its previous rows and old sync time, so the next
+    refresh retries it. Workspaces no longer listed are dropped.
+
+    Returns:
+        Dict with keys: workspaces, rescanned, removed, skipped (list)
+    """
+    workspaces = admin_workspaces(headers) if admin else None
+    if workspaces is not None:
+        for ws in workspaces:
+            index_workspace(conn, ws["id"], ws["name"], ws.get("reports", []))
+        stale = workspaces
+        skipped = []
+    else:
+        resp = get_session().get(f"{API}/groups", headers=headers, timeout=15)
+        resp.raise_for_status()
+        workspaces = resp.json().get("value", [])
+
+        cutoff = time.time() - max_age_hours * 3600
+        synced = dict(conn.execute("SELECT workspace_id, synced_at FROM workspaces"))
+        stale = [ws for ws in workspaces if full or synced.get(ws["id"], 0) < cutoff]
+
+        skipped, _ = scan_workspaces(
+            stale,
+            headers,
+            lambda ws, reports: index_workspace(conn, ws["id"], ws["name"], reports),
+            **scan_options,
+        )
+
+    listed = {ws["id"] for ws in workspaces}
+    gone = [(ws_id,) for (ws_id,) in conn.execute("SELECT workspace_id FROM workspaces")
+            if ws_id not in listed]
+    with conn:
+        conn.executemany("DELETE FROM reports WHERE workspace_id = ?", gone)
+        conn.executemany("DELETE FROM workspaces WHERE workspace_id = ?", gone)
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('refreshed_at', ?)", (time.time(),))
+
+    return {
+        "workspaces": len(workspaces),
+        "rescanned": len(stale) - len(skipped),
+        "removed": len(gone),
+        "skipped": skipped,
+    }
+
+
+def lookup_index(conn, dataset_ids):
+    """Return report dicts for every indexed report bound to any of dataset_ids."""
+    dataset_ids = list(dataset_ids)
+    matched = []
+    # Stay under SQLite's bound-parameter limit for large ID files
+    for i in range(0, len(dataset_ids), 500):
+        chunk = dataset_ids[i:i + 500]
+        rows = conn.execute(
+            f"""
+            SELECT r.name, r.report_id, r.dataset_id, w.name, r.workspace_id, r.format, r.web_url
+            FROM reports r JOIN workspaces w USING (workspace_id)
+            WHERE r.dataset_id IN ({", ".join("?" * len(chunk))})
+            """,
+            chunk,
+        )
+        matched.extend(
+            {
+                "report": name,
+                "reportId": report_id,
+                "datasetId": dataset_id,
+                "workspace": ws_name,
+                "workspaceId": ws_id,
+                "format": fmt or "?",
+                "webUrl": web_url or "",
+            }
+            for name, report_id, dataset_id, ws_name, ws_id, fmt, web_url in rows
+        )
+    return matched
+
+# endregion
+
+
+# region Main
+
+def print_reports(reports):
+    """Print reports grouped by workspace."""
+    by_ws = {}
+    for r in reports:
+        by_ws.setdefault(r["workspace"], []).append(r)
+
+    for ws_name, ws_reports in by_ws.items():
+        print(f"  {ws_name}/")
+        for r in ws_reports:
+            print(f"    {r['report']}.Report  ({r['format']})")
+    return len(by_ws)
+
+
+def print_results(dataset_ids, all_matched, by_dataset, status, elapsed):
+    """Print the text report: one dataset as before, several grouped per dataset."""
+    print(f"{status} in {elapsed:.1f}s\n")
+
+    if len(dataset_ids) == 1:
+        if not all_matched:
+            print("No downstream reports found.")
+            return
+        print(f"Downstream reports ({len(all_matched)}):\n")
+        ws_count = print_reports(all_matched)
+        print(f"\n{len(all_matched)} reports across {ws_count} workspaces")
+        return
+
+    for dataset_id, reports in by_dataset.items():
+        print(f"{dataset_id} ({len(reports)} reports)")
+        if reports:
+            print_reports(reports)
+        print()
+
+    bound = sum(1 for reports in by_dataset.values() if reports)
+    print(f"{len(all_matched)} reports across {bound} of {len(dataset_ids)} datasets")
 
 
 def main():
@@ -112,80 +624,184 @@ def main():
     )
     parser.add_argument("workspace", nargs="?", help="Workspace name")
     parser.add_argument("model", nargs="?", help="Semantic model name")
-    parser.add_argument("--dataset-id", help="Dataset GUID (skip name lookup)")
+    parser.add_argument(
+        "--dataset-id",
+        action="append",
+        help="Dataset GUID(s), comma-separated or repeated (skip name lookup)",
+    )
+    parser.add_argument("--dataset-file", help="File with one dataset GUID per line")
     parser.add_argument("--json", action="store_true", help="JSON output")
     parser.add_argument(
-        "--workers", type=int, default=8, help="Parallel workers (default: 8)"
+        "--stream",
+        action="store_true",
+        help="Print each match as a JSON line as soon as its workspace is scanned",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Initial concurrent requests; adapts to throttling (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help=f"Ceiling for adaptive concurrency (default: {DEFAULT_MAX_CONCURRENCY}; "
+             f"{FALLBACK_MAX_THREADS} without httpx)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"Retries per workspace for timeouts and 5xx (default: {DEFAULT_RETRIES})",
+    )
+    parser.add_argument(
+        "--admin",
+        action="store_true",
+        help="Use the admin API (Fabric administrators; falls back to scanning otherwise)",
+    )
+
+    index_group = parser.add_argument_group("lineage index")
+    index_group.add_argument(
+        "--index",
+        action="store_true",
+        help="Answer from the local dataset -> reports index, refreshing it when stale",
+    )
+    index_group.add_argument(
+        "--refresh-index", action="store_true", help="Rescan every workspace into the index"
+    )
+    index_group.add_argument(
+        "--index-max-age",
+        type=float,
+        default=DEFAULT_INDEX_MAX_AGE_HOURS,
+        metavar="HOURS",
+        help=f"Rescan workspaces indexed longer ago than this (default: {DEFAULT_INDEX_MAX_AGE_HOURS})",
+    )
+    index_group.add_argument(
+        "--index-path",
+        default=str(DEFAULT_INDEX_PATH),
+        help="Index file (default: ~/.cache/fabric-cli-scripts/lineage_index.sqlite, or $LINEAGE_INDEX_PATH)",
     )
     args = parser.parse_args()
 
-    if not args.dataset_id and not (args.workspace and args.model):
-        parser.error("Provide workspace + model name, or --dataset-id")
+    if args.refresh_index:
+        args.index = True
 
-    token = get_token()
-    headers = {"Authorization": f"Bearer {token}"}
+    dataset_ids = read_dataset_ids(args.dataset_id, args.dataset_file)
+    if not dataset_ids and not (args.workspace and args.model):
+        parser.error("Provide workspace + model name, --dataset-id, or --dataset-file")
+
+    quiet = args.json or args.stream
+    scan_options = {
+        "workers": args.workers,
+        "max_concurrency": args.max_concurrency,
+        "retries": args.retries,
+    }
+    headers = None
+
+    def auth_headers():
+        nonlocal headers
+        if headers is None:
+            headers = {"Authorization": f"Bearer {get_token()}"}
+        return headers
 
     # Resolve dataset ID
-    if args.dataset_id:
-        dataset_id = args.dataset_id
-        source_ws = "?"
-    else:
+    source_ws = "?"
+    if not dataset_ids:
         dataset_id, source_ws_id, source_ws = get_dataset_id(
-            headers, args.workspace, args.model
+            auth_headers(), args.workspace, args.model
         )
+        dataset_ids = [dataset_id]
+    wanted = set(dataset_ids)
 
-    if not args.json:
-        print(f"Dataset: {dataset_id}")
-        print(f"Scanning workspaces...", end="", flush=True)
+    if not quiet:
+        if len(dataset_ids) == 1:
+            print(f"Dataset: {dataset_ids[0]}")
+        else:
+            print(f"Datasets: {len(dataset_ids)}")
 
-    # Get all accessible workspaces
-    resp = requests.get(f"{API}/groups", headers=headers, timeout=15)
-    resp.raise_for_status()
-    workspaces = resp.json().get("value", [])
-
-    # Scan in parallel
     start = time.time()
     all_matched = []
-
-    with ThreadPoolExecutor(max_workers=args.workers) as pool:
-        futures = {
-            pool.submit(scan_workspace, ws["id"], ws["name"], dataset_id, headers): ws
-            for ws in workspaces
-        }
-        for f in as_completed(futures):
-            all_matched.extend(f.result())
+    skipped = []
+
+    def emit(matches):
+        all_matched.extend(matches)
+        if args.stream:
+            for m in matches:
+                print(json.dumps(m), flush=True)
+
+    if args.index:
+        conn = open_index(args.index_path)
+        age = index_age_hours(conn)
+        if args.refresh_index or age is None or age > args.index_max_age:
+            if not quiet:
+                print("Refreshing lineage index...", end="", flush=True)
+            stats = refresh_index(conn, auth_headers(), args.index_max_age,
+                                  admin=args.admin, full=args.refresh_index, **scan_options)
+            skipped = stats["skipped"]
+            status = f" {stats['workspaces']} workspaces ({stats['rescanned']} rescanned)"
+        else:
+            if not quiet:
+                print(f"Reading lineage index ({age:.1f}h old)...", end="", flush=True)
+            workspace_count = conn.execute("SELECT COUNT(*) FROM workspaces").fetchone()[0]
+            status = f" {workspace_count} workspaces"
+        emit(lookup_index(conn, wanted))
+        conn.close()
+    else:
+        if not quiet:
+            print("Scanning workspaces...", end="", flush=True)
+
+        result = admin_scan(wanted, auth_headers()) if args.admin else None
+
+        if result is not None:
+            matched, workspace_count = result
+            emit(matched)
+            status = f" {workspace_count} workspaces"
+        else:
+            # Get all accessible workspaces
+            resp = get_session().get(f"{API}/groups", headers=auth_headers(), timeout=15)
+            resp.raise_for_status()
+            workspaces = resp.json().get("value", [])
+
+            skipped, scan_stats = scan_workspaces(
+                workspaces,
+                auth_headers(),
+                lambda ws, reports: emit(match_reports(reports, ws["id"], ws["name"], wanted)),
+                **scan_options,
+            )
+            status = (f" {len(workspaces)} workspaces (peak concurrency "
+                      f"{scan_stats['peak_concurrency']}, {scan_stats['throttled']} throttled)")
 
     elapsed = time.time() - start
 
     # Sort: source workspace first, then alphabetical
     all_matched.sort(key=lambda r: (r["workspace"] != source_ws, r["workspace"], r["report"]))
 
-    if args.json:
-        print(json.dumps(all_matched, indent=2))
-        return
-
-    print(f" {len(workspaces)} workspaces in {elapsed:.1f}s\n")
-
-    if not all_matched:
-        print("No downstream reports found.")
-        return
-
-    # Group by workspace
-    by_ws = {}
+    # Group by dataset, in the order the IDs were given
+    by_dataset = {dataset_id: [] for dataset_id in dataset_ids}
     for r in all_matched:
-        by_ws.setdefault(r["workspace"], []).append(r)
+        by_dataset[r["datasetId"]].append(r)
 
-    print(f"Downstream reports ({len(all_matched)}):\n")
-    for ws_name, reports in by_ws.items():
-        print(f"  {ws_name}/")
-        for r in reports:
-            print(f"    {r['report']}.Report  ({r['format']})")
+    if args.json and not args.stream:
+        # One dataset keeps the flat list; several are keyed by datasetId
+        print(json.dumps(all_matched if len(dataset_ids) == 1 else by_dataset, indent=2))
+    elif not args.stream:
+        print_results(dataset_ids, all_matched, by_dataset, status, elapsed)
+
+    if skipped:
+        note = ("they keep their previous index entries" if args.index
+                else "results are incomplete")
+        print(f"\nSkipped {len(skipped)} workspaces; {note}:", file=sys.stderr)
+        for entry in skipped:
+            print(f"  {entry['workspace']} ({entry['workspaceId']}): {entry['error']}", file=sys.stderr)
 
-    print(f"\n{len(all_matched)} reports across {len(by_ws)} workspaces")
+    # Exit 2 when workspaces were skipped, so callers cannot mistake a partial
+    # scan for a complete one
+    return 2 if skipped else 0
 
 
 # endregion
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
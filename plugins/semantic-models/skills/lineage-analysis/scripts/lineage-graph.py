@@ -0,0 +1,723 @@
+#!/usr/bin/env python3
+"""
+Multi-hop lineage graph: "what breaks if I change X" across the whole chain.
+
+get-downstream-reports.py answers one hop (semantic model -> reports). This
+script crawls the same Power BI REST sources once, per workspace, into a graph
+covering the full chain:
+
+    dataflow -> dataflow -> semantic model
+    lakehouse / warehouse (SQL endpoint) -> semantic model (Direct Lake / SQL)
+    semantic model -> composite or DirectQuery-chained semantic model
+    semantic model -> report -> app
+
+The graph is held in memory as compact adjacency arrays (CSR: one offsets
+array and one targets array per direction, indexed by node number) and saved
+to SQLite between runs. Transitive queries are a breadth-first walk over those
+arrays, so "everything downstream of this lakehouse" takes milliseconds even on
+a 100k-node tenant graph; see the benchmark command.
+
+Usage:
+    # Crawl all accessible workspaces and save the graph
+    python3 lineage-graph.py build
+
+    # Everything downstream of a node (GUID, or exact name; kind: prefix narrows)
+    python3 lineage-graph.py impact "SpaceParts"
+    python3 lineage-graph.py impact lakehouse:<guid> --max-depth 2 --json
+
+    # Everything upstream of a report
+    python3 lineage-graph.py upstream report:<guid>
+
+    # Node / edge counts and age of the saved graph
+    python3 lineage-graph.py stats
+
+    # Build and query a synthetic 100k-node graph (no API calls)
+    python3 lineage-graph.py benchmark --nodes 100000
+
+Sources (per workspace unless noted):
+    groups/{ws}/reports                     report -> semantic model (datasetId)
+    groups/{ws}/datasets                    semantic models
+    groups/{ws}/datasets/upstreamDataflows  dataflow -> semantic model
+    groups/{ws}/dataflows[/{id}/upstreamDataflows]  dataflow -> dataflow
+    groups/{ws}/datasets/{id}/datasources   powerbi:// sources (chained models),
+                                            Fabric SQL endpoints (lakehouse, warehouse)
+    Fabric workspaces/{ws}/lakehouses       SQL endpoint -> lakehouse
+    apps, apps/{id}/reports (tenant-wide)   report -> app (originalReportId)
+
+Requirements:
+    pip install azure-identity requests
+    http_session.py from this folder (pooled keep-alive HTTP client)
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import unquote
+
+from http_session import get_session
+
+
+# region Variables
+
+API = "https://api.powerbi.com/v1.0/myorg"
+FABRIC_API = "https://api.fabric.microsoft.com/v1"
+
+DEFAULT_GRAPH_PATH = Path(
+    os.environ.get("LINEAGE_GRAPH_PATH")
+    or Path.home() / ".cache" / "fabric-cli-scripts" / "lineage_graph.sqlite"
+)
+
+KINDS = ("dataflow", "lakehouse", "warehouse", "sqlendpoint", "dataset", "report", "app")
+
+DEFAULT_WORKERS = 8
+DEFAULT_RETRIES = 4
+REQUEST_TIMEOUT = 30
+
+# endregion
+
+
+# region Graph
+
+class LineageGraph:
+    """
+    Immutable lineage graph over compact adjacency arrays.
+
+    Nodes are numbered 0..n-1; per-node attributes live in parallel lists
+    (kinds, ids, names, workspaces). Edges point downstream (source ->
+    consumer). Each direction is stored CSR-style: the neighbours of node i
+    are targets[offsets[i]:offsets[i + 1]], held in array('i') so 100k nodes
+    and their edges cost a few MB and no per-edge Python objects.
+    """
+
+    def __init__(self, kinds, ids, names, workspaces, down, up):
+        self.kinds = kinds
+        self.ids = ids
+        self.names = names
+        self.workspaces = workspaces
+        self.down = down
+        self.up = up
+        self._by_id = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def edge_count(self):
+        return len(self.down[1])
+
+    @classmethod
+    def from_edges(cls, nodes, edges):
+        """
+        Build from node attributes and (source, target) key pairs.
+
+        Args:
+            nodes: Dict of (kind, id) -> {"name", "workspace"}
+            edges: Iterable of ((kind, id), (kind, id)) downstream edges; edges
+                touching unknown nodes are dropped, duplicates are collapsed
+
+        Returns:
+            LineageGraph
+        """
+        keys = sorted(nodes)
+        index = {key: i for i, key in enumerate(keys)}
+        pairs = {
+            (index[src], index[dst])
+            for src, dst in edges
+            if src in index and dst in index and src != dst
+        }
+        n = len(keys)
+        return cls(
+            [k for k, _ in keys],
+            [i for _, i in keys],
+            [nodes[key].get("name", "") for key in keys],
+            [nodes[key].get("workspace", "") for key in keys],
+            _csr(n, pairs, reverse=False),
+            _csr(n, pairs, reverse=True),
+        )
+
+    def find(self, spec):
+        """
+        Resolve a node spec to node numbers.
+
+        Accepts "<guid>", "<kind>:<guid>", "<name>" or "<kind>:<name>" (names
+        match case-insensitively). Returns every matching node number.
+        """
+        kind = None
+        if ":" in spec and spec.split(":", 1)[0] in KINDS:
+            kind, spec = spec.split(":", 1)
+        if self._by_id is None:
+            self._by_id = {}
+            for i, object_id in enumerate(self.ids):
+                self._by_id.setdefault(object_id.lower(), []).append(i)
+        matches = self._by_id.get(spec.lower())
+        if matches is None:
+            wanted = spec.lower()
+            matches = [i for i, name in enumerate(self.names) if name.lower() == wanted]
+        return [i for i in matches if kind is None or self.kinds[i] == kind]
+
+    def traverse(self, start, direction="down", max_depth=None):
+        """
+        Breadth-first walk from start over the chosen direction.
+
+        Args:
+            start: Node number, or list of node numbers
+            direction: "down" (what depends on it) or "up" (what it depends on)
+            max_depth: Stop after this many hops (default: unlimited)
+
+        Returns:
+            List of (node, depth, via) for every reachable node except the
+            start nodes, in BFS order; via is the node it was reached from
+        """
+        offsets, targets = self.down if direction == "down" else self.up
+        starts = [start] if isinstance(start, int) else list(start)
+        seen = bytearray(len(self.ids))
+        for node in starts:
+            seen[node] = 1
+        frontier = starts
+        reached = []
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for target in targets[offsets[node]:offsets[node + 1]]:
+                    if not seen[target]:
+                        seen[target] = 1
+                        next_frontier.append(target)
+                        reached.append((target, depth, node))
+            frontier = next_frontier
+        return reached
+
+    def describe(self, node):
+        return {
+            "kind": self.kinds[node],
+            "id": self.ids[node],
+            "name": self.names[node],
+            "workspace": self.workspaces[node],
+        }
+
+    def save(self, path=DEFAULT_GRAPH_PATH, failures=()):
+        """Persist nodes and both adjacency arrays to SQLite, replacing any saved graph."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path))
+        try:
+            with conn:
+                conn.executescript("""
+                    DROP TABLE IF EXISTS nodes;
+                    DROP TABLE IF EXISTS adjacency;
+                    DROP TABLE IF EXISTS meta;
+                    CREATE TABLE nodes (
+                        node INTEGER PRIMARY KEY,
+                        kind TEXT NOT NULL,
+                        object_id TEXT NOT NULL,
+                        name TEXT,
+                        workspace TEXT
+                    );
+                    CREATE TABLE adjacency (
+                        direction TEXT PRIMARY KEY,
+                        offsets BLOB NOT NULL,
+                        targets BLOB NOT NULL
+                    );
+                    CREATE TABLE meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL
+                    );
+                """)
+                conn.executemany(
+                    "INSERT INTO nodes VALUES (?, ?, ?, ?, ?)",
+                    zip(range(len(self.ids)), self.kinds, self.ids, self.names, self.workspaces),
+                )
+                conn.executemany(
+                    "INSERT INTO adjacency VALUES (?, ?, ?)",
+                    [
+                        ("down", self.down[0].tobytes(), self.down[1].tobytes()),
+                        ("up", self.up[0].tobytes(), self.up[1].tobytes()),
+                    ],
+                )
+                conn.executemany(
+                    "INSERT INTO meta VALUES (?, ?)",
+                    [("built_at", str(time.time())), ("failures", json.dumps(list(failures)))],
+                )
+        finally:
+            conn.close()
+
+    @classmethod
+    def load(cls, path=DEFAULT_GRAPH_PATH):
+        """Load a graph saved by save(); returns (graph, meta dict) or (None, None) if absent."""
+        path = Path(path)
+        if not path.exists():
+            return None, None
+        conn = sqlite3.connect(str(path))
+        try:
+            rows = conn.execute(
+                "SELECT kind, object_id, name, workspace FROM nodes ORDER BY node"
+            ).fetchall()
+            arrays = {}
+            for direction, offsets, targets in conn.execute("SELECT * FROM adjacency"):
+                arrays[direction] = (_from_bytes(offsets), _from_bytes(targets))
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.OperationalError:
+            return None, None
+        finally:
+            conn.close()
+        kinds, ids, names, workspaces = (list(column) for column in zip(*rows)) if rows else ([], [], [], [])
+        return cls(kinds, ids, names, workspaces, arrays["down"], arrays["up"]), meta
+
+
+def _csr(n, pairs, reverse):
+    """Counting-sort (source, target) pairs into CSR (offsets, targets) arrays."""
+    offsets = array("i", [0]) * (n + 1)
+    for src, dst in pairs:
+        offsets[(dst if reverse else src) + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    targets = array("i", [0]) * len(pairs)
+    cursor = offsets[:-1]
+    for src, dst in pairs:
+        if reverse:
+            src, dst = dst, src
+        targets[cursor[src]] = dst
+        cursor[src] += 1
+    return offsets, targets
+
+
+def _from_bytes(blob):
+    values = array("i")
+    values.frombytes(blob)
+    return values
+
+# endregion
+
+
+# region Crawl
+
+def get_tokens():
+    """Acquire Power BI and Fabric API bearer tokens via DefaultAzureCredential."""
+    # Imported here so the benchmark runs without azure-identity installed
+    from azure.identity import DefaultAzureCredential
+
+    cred = DefaultAzureCredential()
+    return (
+        cred.get_token("https://analysis.windows.net/powerbi/api/.default").token,
+        cred.get_token("https://api.fabric.microsoft.com/.default").token,
+    )
+
+
+def get_json(url, headers, failures, retries=DEFAULT_RETRIES):
+    """
+    GET a JSON body, retrying 429 (after Retry-After), 5xx, network errors and
+    200 responses whose body is not valid JSON (truncated or an HTML page).
+
+    Returns the decoded body, or None after recording the URL and reason in
+    failures. 403/404 are not retried: the caller lacks access to that item,
+    so the entry is marked inaccessible rather than counted as a failure.
+    """
+    inaccessible = False
+    for attempt in range(retries + 1):
+        try:
+            resp = get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            if resp.status_code == 200:
+                return resp.json()
+        except (OSError, ValueError) as e:
+            reason = f"{type(e).__name__}: {e}"
+        else:
+            reason = f"HTTP {resp.status_code}"
+            inaccessible = resp.status_code in (403, 404)
+            if resp.status_code == 429:
+                ra = resp.headers.get("Retry-After")
+                time.sleep(min(float(ra) if ra and ra.isdigit() else 2 ** attempt, 60))
+                continue
+            if resp.status_code < 500:
+                break
+        time.sleep(min(2 ** attempt, 30) * random.uniform(0.5, 1.0))
+    failures.append({"url": url, "error": reason, "inaccessible": inaccessible})
+    return None
+
+
+def crawl_workspace(ws, headers, fabric_headers, failures):
+    """
+    Collect one workspace's nodes, edges and unresolved chained-model sources.
+
+    Returns (nodes, edges, pending): pending holds (server, database, dataset
+    key) for powerbi:// datasources, resolved once every workspace is known.
+    """
+    ws_id, ws_name = ws["id"], ws["name"]
+    base = f"{API}/groups/{ws_id}"
+    nodes = {}
+    edges = []
+    pending = []
+
+    def node(kind, object_id, name=""):
+        key = (kind, object_id.lower())
+        if name or key not in nodes:
+            nodes[key] = {"name": name, "workspace": ws_name}
+        return key
+
+    body = get_json(f"{base}/datasets", headers, failures) or {}
+    datasets = body.get("value", [])
+    for ds in datasets:
+        node("dataset", ds["id"], ds.get("name", ""))
+
+    body = get_json(f"{base}/reports", headers, failures) or {}
+    for r in body.get("value", []):
+        report = node("report", r["id"], r.get("name", ""))
+        if r.get("datasetId"):
+            edges.append((("dataset", r["datasetId"].lower()), report))
+
+    body = get_json(f"{base}/datasets/upstreamDataflows", headers, failures) or {}
+    for link in body.get("value", []):
+        edges.append((
+            ("dataflow", link["dataflowObjectId"].lower()),
+            ("dataset", link["datasetObjectId"].lower()),
+        ))
+
+    body = get_json(f"{base}/dataflows", headers, failures) or {}
+    for df in body.get("value", []):
+        dataflow = node("dataflow", df["objectId"], df.get("name", ""))
+        upstream = get_json(f"{base}/dataflows/{df['objectId']}/upstreamDataflows", headers, failures)
+        for link in (upstream or {}).get("value", []):
+            edges.append((("dataflow", link["targetDataflowId"].lower()), dataflow))
+
+    for ds in datasets:
+        dataset = ("dataset", ds["id"].lower())
+        body = get_json(f"{base}/datasets/{ds['id']}/datasources", headers, failures) or {}
+        for source in body.get("value", []):
+            details = source.get("connectionDetails", {})
+            server = (details.get("server") or "").strip()
+            database = (details.get("database") or "").strip()
+            if server.lower().startswith("powerbi://"):
+                pending.append((server, database, dataset))
+            elif ".fabric.microsoft.com" in server.lower() and database:
+                # Direct Lake / SQL over a lakehouse or warehouse SQL endpoint
+                # Named later by the lakehouse / warehouse that owns the endpoint
+                endpoint = ("sqlendpoint", database.lower())
+                nodes.setdefault(endpoint, {"name": "", "workspace": ""})
+                edges.append((endpoint, dataset))
+
+    body = get_json(f"{FABRIC_API}/workspaces/{ws_id}/lakehouses", fabric_headers, failures) or {}
+    for lh in body.get("value", []):
+        lakehouse = node("lakehouse", lh["id"], lh.get("displayName", ""))
+        endpoint = ((lh.get("properties") or {}).get("sqlEndpointProperties") or {}).get("id")
+        if endpoint:
+            edges.append((lakehouse, node("sqlendpoint", endpoint, lh.get("displayName", ""))))
+
+    body = get_json(f"{FABRIC_API}/workspaces/{ws_id}/warehouses", fabric_headers, failures) or {}
+    for wh in body.get("value", []):
+        warehouse = node("warehouse", wh["id"], wh.get("displayName", ""))
+        # A warehouse is its own SQL endpoint; Direct Lake sources name it by id
+        edges.append((warehouse, node("sqlendpoint", wh["id"], wh.get("displayName", ""))))
+
+    return nodes, edges, pending
+
+
+def crawl_apps(headers, failures):
+    """Collect app nodes and report -> app edges (apps are listed tenant-wide, not per workspace)."""
+    nodes = {}
+    edges = []
+    body = get_json(f"{API}/apps", headers, failures) or {}
+    for app in body.get("value", []):
+        key = ("app", app["id"].lower())
+        nodes[key] = {"name": app.get("name", ""), "workspace": ""}
+        reports = get_json(f"{API}/apps/{app['id']}/reports", headers, failures) or {}
+        for r in reports.get("value", []):
+            original = r.get("originalReportObjectId") or r.get("originalReportId")
+            if original:
+                edges.append((("report", original.lower()), key))
+    return nodes, edges
+
+
+def build_graph(headers, fabric_headers, workers=DEFAULT_WORKERS):
+    """
+    Crawl every accessible workspace (plus apps) into a LineageGraph.
+
+    Workspaces are crawled in parallel over the shared keep-alive session.
+    powerbi:// datasources are resolved to semantic model nodes by workspace
+    and model name after the crawl, since the source may live in any workspace.
+
+    Returns:
+        (graph, failures): failures lists {url, error, inaccessible} for calls
+        that failed; inaccessible ones were refused with 403/404
+    """
+    get_session(pool_size=workers)
+    failures = []
+    body = get_json(f"{API}/groups", headers, failures)
+    if body is None:
+        raise RuntimeError(f"Could not list workspaces: {failures[-1]['error']}")
+    workspaces = body.get("value", [])
+
+    nodes = {}
+    edges = []
+    pending = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(crawl_workspace, ws, headers, fabric_headers, failures)
+            for ws in workspaces
+        ]
+        for f in as_completed(futures):
+            ws_nodes, ws_edges, ws_pending = f.result()
+            for key, attrs in ws_nodes.items():
+                if attrs["name"] or key not in nodes:
+                    nodes[key] = attrs
+            edges.extend(ws_edges)
+            pending.extend(ws_pending)
+
+    app_nodes, app_edges = crawl_apps(headers, failures)
+    nodes.update(app_nodes)
+    edges.extend(app_edges)
+
+    # Chained models: powerbi://api.powerbi.com/v1.0/myorg/<workspace> + model name
+    by_name = {
+        (attrs["workspace"].lower(), attrs["name"].lower()): key
+        for key, attrs in nodes.items()
+        if key[0] == "dataset"
+    }
+    for server, database, dataset in pending:
+        ws_name = unquote(server.rstrip("/").rsplit("/", 1)[-1]).lower()
+        upstream = by_name.get((ws_name, database.lower()))
+        if upstream:
+            edges.append((upstream, dataset))
+
+    return LineageGraph.from_edges(nodes, edges), failures
+
+# endregion
+
+
+# region Benchmark
+
+def synthetic_graph(node_count=100_000, seed=42):
+    """
+    Generate a tenant-shaped graph: sources feed models, models chain into
+    composite models, reports bind to models with a long-tailed fan-out, and
+    a fraction of reports are published in apps.
+    """
+    rng = random.Random(seed)
+    sources = max(1, node_count // 50)
+    datasets = max(1, node_count // 12)
+    apps = max(1, node_count // 100)
+    reports = max(1, node_count - sources - datasets - apps)
+
+    nodes = {}
+    edges = []
+    for i in range(sources):
+        kind = ("dataflow", "lakehouse")[i % 2]
+        nodes[(kind, f"{kind[0]}{i:08d}")] = {"name": f"{kind} {i}", "workspace": f"ws{i % 500}"}
+    source_keys = list(nodes)
+    dataset_keys = []
+    for i in range(datasets):
+        key = ("dataset", f"d{i:08d}")
+        nodes[key] = {"name": f"model {i}", "workspace": f"ws{i % 500}"}
+        for _ in range(rng.randint(1, 3)):
+            edges.append((rng.choice(source_keys), key))
+        # ~10% composite models chained onto an earlier model
+        if dataset_keys and rng.random() < 0.1:
+            edges.append((rng.choice(dataset_keys), key))
+        dataset_keys.append(key)
+    app_keys = [("app", f"a{i:08d}") for i in range(apps)]
+    for key in app_keys:
+        nodes[key] = {"name": f"app {key[1]}", "workspace": ""}
+    for i in range(reports):
+        key = ("report", f"r{i:08d}")
+        nodes[key] = {"name": f"report {i}", "workspace": f"ws{i % 500}"}
+        # Long tail: a few shared models carry most reports
+        model = dataset_keys[min(int(rng.paretovariate(1.2)) - 1, len(dataset_keys) - 1)] \
+            if rng.random() < 0.5 else rng.choice(dataset_keys)
+        edges.append((model, key))
+        if rng.random() < 0.2:
+            edges.append((key, rng.choice(app_keys)))
+    return nodes, edges
+
+
+def run_benchmark(node_count=100_000, queries=1000, seed=42):
+    """Time build, save, load and transitive queries on a synthetic graph."""
+    import tempfile
+
+    t = time.perf_counter()
+    nodes, edges = synthetic_graph(node_count, seed)
+    generate_s = time.perf_counter() - t
+
+    t = time.perf_counter()
+    graph = LineageGraph.from_edges(nodes, edges)
+    build_s = time.perf_counter() - t
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "graph.sqlite"
+        t = time.perf_counter()
+        graph.save(path)
+        save_s = time.perf_counter() - t
+        t = time.perf_counter()
+        graph, _ = LineageGraph.load(path)
+        load_s = time.perf_counter() - t
+
+    rng = random.Random(seed)
+    sources = [i for i, kind in enumerate(graph.kinds) if kind in ("dataflow", "lakehouse")]
+    timings = []
+    reached = []
+    for node in (rng.choice(sources) for _ in range(queries)):
+        t = time.perf_counter()
+        reached.append(len(graph.traverse(node)))
+        timings.append(time.perf_counter() - t)
+    timings.sort()
+
+    print(f"Synthetic graph: {len(graph):,} nodes, {graph.edge_count:,} edges")
+    print(f"  generate        {generate_s * 1000:8.1f} ms")
+    print(f"  build (CSR)     {build_s * 1000:8.1f} ms")
+    print(f"  save (SQLite)   {save_s * 1000:8.1f} ms")
+    print(f"  load (SQLite)   {load_s * 1000:8.1f} ms")
+    print(f"Impact queries from {queries} random sources "
+          f"(median {sorted(reached)[len(reached) // 2]:,} nodes reached, max {max(reached):,}):")
+    print(f"  p50             {timings[len(timings) // 2] * 1000:8.2f} ms")
+    print(f"  p99             {timings[int(len(timings) * 0.99)] * 1000:8.2f} ms")
+    print(f"  max             {timings[-1] * 1000:8.2f} ms")
+
+# endregion
+
+
+# region Main
+
+def load_or_exit(path):
+    graph, meta = LineageGraph.load(path)
+    if graph is None:
+        print(f"No lineage graph at {path}. Run: python3 lineage-graph.py build", file=sys.stderr)
+        sys.exit(1)
+    return graph, meta
+
+
+def print_walk(graph, starts, reached, direction, as_json):
+    """Print the nodes reached from starts, grouped by hop count."""
+    if as_json:
+        print(json.dumps({
+            "start": [graph.describe(node) for node in starts],
+            "direction": "downstream" if direction == "down" else "upstream",
+            "nodes": [
+                {**graph.describe(node), "depth": depth, "via": graph.ids[via]}
+                for node, depth, via in reached
+            ],
+        }, indent=2))
+        return
+
+    for node in starts:
+        d = graph.describe(node)
+        print(f"{d['kind']}: {d['name'] or d['id']}  [{d['workspace'] or '-'}]")
+    label = "Downstream" if direction == "down" else "Upstream"
+    if not reached:
+        print(f"\nNo {label.lower()} dependencies found.")
+        return
+
+    print(f"\n{label} ({len(reached)}):\n")
+    for node, depth, via in reached:
+        d = graph.describe(node)
+        print(f"  {'  ' * (depth - 1)}{depth}. {d['kind']}: {d['name'] or d['id']}"
+              f"  [{d['workspace'] or '-'}]  via {graph.names[via] or graph.ids[via]}")
+
+    by_kind = {}
+    for node, _, _ in reached:
+        by_kind[graph.kinds[node]] = by_kind.get(graph.kinds[node], 0) + 1
+    print("\n" + ", ".join(f"{count} {kind}" for kind, count in sorted(by_kind.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-hop lineage graph for impact analysis")
+    parser.add_argument("--graph-path", default=str(DEFAULT_GRAPH_PATH),
+                        help="Graph file (default: ~/.cache/fabric-cli-scripts/lineage_graph.sqlite, "
+                             "or $LINEAGE_GRAPH_PATH)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Crawl accessible workspaces and save the graph")
+    build.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                       help=f"Workspaces crawled in parallel (default: {DEFAULT_WORKERS})")
+
+    for name, help_text in (("impact", "Everything downstream of a node"),
+                            ("upstream", "Everything a node depends on")):
+        query = sub.add_parser(name, help=help_text)
+        query.add_argument("node", help="GUID or exact name, optionally prefixed kind: "
+                                        f"({', '.join(KINDS)})")
+        query.add_argument("--max-depth", type=int, help="Stop after N hops")
+        query.add_argument("--json", action="store_true", help="JSON output")
+
+    sub.add_parser("stats", help="Show node and edge counts of the saved graph")
+
+    bench = sub.add_parser("benchmark", help="Time build/load/queries on a synthetic graph")
+    bench.add_argument("--nodes", type=int, default=100_000, help="Node count (default: 100000)")
+    bench.add_argument("--queries", type=int, default=1000, help="Queries to time (default: 1000)")
+
+    args = parser.parse_args()
+
+    if args.command == "benchmark":
+        run_benchmark(args.nodes, args.queries)
+        return 0
+
+    if args.command == "build":
+        token, fabric_token = get_tokens()
+        start = time.time()
+        print("Crawling workspaces...", end="", flush=True)
+        graph, failures = build_graph(
+            {"Authorization": f"Bearer {token}"},
+            {"Authorization": f"Bearer {fabric_token}"},
+            args.workers,
+        )
+        graph.save(args.graph_path, failures)
+        print(f" {len(graph)} nodes, {graph.edge_count} edges in {time.time() - start:.1f}s")
+        print(f"Saved to {args.graph_path}")
+        errors = [f for f in failures if not f["inaccessible"]]
+        skipped = len(failures) - len(errors)
+        if skipped:
+            print(f"{skipped} items were not accessible (403/404) and are left out of the graph")
+        if errors:
+            print(f"\n{len(errors)} calls failed; the graph is missing their edges:", file=sys.stderr)
+            for failure in errors:
+                print(f"  {failure['error']}: {failure['url']}", file=sys.stderr)
+            return 2
+        return 0
+
+    graph, meta = load_or_exit(args.graph_path)
+
+    if args.command == "stats":
+        age_h = (time.time() - float(meta.get("built_at", 0))) / 3600
+        by_kind = {}
+        for kind in graph.kinds:
+            by_kind[kind] = by_kind.get(kind, 0) + 1
+        print(f"{len(graph)} nodes, {graph.edge_count} edges, built {age_h:.1f}h ago")
+        for kind in KINDS:
+            if kind in by_kind:
+                print(f"  {kind:<12} {by_kind[kind]}")
+        failures = json.loads(meta.get("failures", "[]"))
+        errors = sum(1 for f in failures if not f.get("inaccessible"))
+        if errors:
+            print(f"{errors} calls failed during the last build")
+        if len(failures) > errors:
+            print(f"{len(failures) - errors} items were not accessible (403/404)")
+        return 0
+
+    starts = graph.find(args.node)
+    if not starts:
+        print(f"No node matches '{args.node}'", file=sys.stderr)
+        return 1
+    if len(starts) > 1:
+        print(f"'{args.node}' is ambiguous; pass one of these:", file=sys.stderr)
+        for node in starts:
+            print(f"  {graph.kinds[node]}:{graph.ids[node]}  {graph.names[node]}", file=sys.stderr)
+        return 1
+
+    direction = "down" if args.command == "impact" else "up"
+    start = time.perf_counter()
+    reached = graph.traverse(starts, direction, args.max_depth)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print_walk(graph, starts, reached, direction, args.json)
+    if not args.json:
+        print(f"({elapsed_ms:.1f} ms)")
+    return 0
+
+
+# endregion
+
+
+if __name__ == "__main__":
+    sys.exit(main())